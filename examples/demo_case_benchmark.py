@@ -0,0 +1,48 @@
+import os
+from Chamaeleo.methods.default import BaseCodingAlgorithm
+from Chamaeleo.methods.ecc import Hamming, ReedSolomon
+from Chamaeleo.methods.fixed import Church, Goldman, Grass, Blawat
+from Chamaeleo.methods.flowed import DNAFountain, YinYangCode
+from Chamaeleo.utils.pipelines import BenchmarkPipeline
+
+
+if __name__ == "__main__":
+    current_path = os.path.dirname(os.path.realpath(__file__))
+    generated_file_path = os.path.join(current_path, "generated_files")
+    result_path = os.path.join(generated_file_path, "benchmark.json")
+    baseline_path = os.path.join(generated_file_path, "benchmark_baseline.json")
+
+    coding_schemes = {
+        "Base": BaseCodingAlgorithm(),
+        "Church et al.": Church(), "Goldman et al.": Goldman(), "Grass et al.": Grass(), "Blawat et al.": Blawat(),
+        "DNA Fountain": DNAFountain(redundancy=0.5), "Yin-Yang Code": YinYangCode()
+    }
+
+    error_corrections = {
+        "None": None, "Hamming": Hamming(), "ReedSolomon": ReedSolomon()
+    }
+
+    needed_indices = [
+        True,
+        True, True, True, True,
+        False, True
+    ]
+
+    pipeline = BenchmarkPipeline(
+        coding_schemes=coding_schemes,
+        error_corrections=error_corrections,
+        needed_indices=needed_indices,
+        data_sizes=[4096, 16384],
+        entropies=[4.0, 8.0],
+        repeats=3,
+        segment_length=120,
+        index_length=16,
+        need_logs=True
+    )
+
+    pipeline.evaluate()
+
+    if os.path.exists(baseline_path):
+        pipeline.compare(baseline_path)
+    pipeline.output_records(type="string")
+    pipeline.output_records(type="path", path=result_path)
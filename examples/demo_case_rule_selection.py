@@ -0,0 +1,36 @@
+import os
+import Chamaeleo
+from Chamaeleo.methods.flowed import YinYangCode
+from Chamaeleo.utils.pipelines import RuleSelectionPipeline, TranscodePipeline
+
+
+if __name__ == "__main__":
+    root_path = os.path.dirname(Chamaeleo.__file__)
+    current_path = os.path.dirname(os.path.realpath(__file__))
+    generated_file_path = os.path.join(current_path, "generated_files")
+
+    read_file_path = os.path.join(root_path, "data", "pictures", "Mona Lisa.jpg")
+    dna_path = os.path.join(generated_file_path, "target.dna")
+
+    pipeline = RuleSelectionPipeline(
+        coding_scheme=YinYangCode(),
+        file_path=read_file_path,
+        rule_indices=list(range(0, 6144, 64)),
+        sample_count=500,
+        processes=4,
+        segment_length=120,
+        index=True,
+        need_logs=True
+    )
+
+    best_choice = pipeline.search()
+    pipeline.output_records(type="string", top=10)
+
+    [support_base, yang_rule, yin_rule] = best_choice["rule"]
+    coding_scheme = YinYangCode(yang_rule=yang_rule, yin_rule=yin_rule, virtual_nucleotide=support_base)
+
+    pipeline = TranscodePipeline(coding_scheme=coding_scheme, error_correction=None, need_logs=True)
+    pipeline.transcode(direction="t_c", input_path=read_file_path, output_path=dna_path,
+                       segment_length=120, index=True)
+    print()
+    pipeline.output_records(type="string")
@@ -1,4 +1,6 @@
+import math
 from datetime import datetime
+from multiprocessing import Pool
 from Chamaeleo.methods.inherent import index_base, base_index
 from Chamaeleo.utils.monitor import Monitor
 
@@ -10,6 +12,8 @@ class AbstractCodingAlgorithm(object):
         self.need_logs = need_logs
         self.monitor = Monitor()
         self.segment_length = None
+        # number of bits carried by each nucleotide position, if the bits are placed position by position.
+        self.nucleotide_bits = None
 
     def __init_check__(self):
         raise NotImplementedError("\"init_check\" interface needs to be implemented!")
@@ -42,7 +46,7 @@ class AbstractCodingAlgorithm(object):
 
         return {"dna": dna_sequences, "i": information_density, "t": encoding_runtime}
 
-    def carbon_to_silicon(self, dna_sequences):
+    def carbon_to_silicon(self, dna_sequences, need_erasures=False):
         if self.bit_size is None:
             raise ValueError("The parameter \"bit_size\" is needed, "
                              + "which guides the number of bits reserved at the end of the digital file!")
@@ -58,6 +62,10 @@ class AbstractCodingAlgorithm(object):
 
         start_time = datetime.now()
 
+        erasures = None
+        if need_erasures and getattr(self, "nucleotide_bits", None) is not None:
+            dna_sequences, erasures = self.mark_suspects(dna_sequences)
+
         if self.need_logs:
             print("Decode DNA sequences to bit segments by coding scheme.")
         bit_segments = self.decode(dna_sequences)
@@ -68,7 +76,39 @@ class AbstractCodingAlgorithm(object):
 
         decoding_runtime = (datetime.now() - start_time).total_seconds()
 
-        return {"bit": bit_segments, "s": self.bit_size, "t": decoding_runtime}
+        return {"bit": bit_segments, "s": self.bit_size, "t": decoding_runtime, "e": erasures}
+
+    def mark_suspects(self, dna_sequences):
+        """
+        introduction: Find the suspect positions of DNA sequences for the coding scheme placing bits position by
+                      position, which are the nucleotides outside "A", "C", "G" and "T"
+                      and the missing tail of the sequence shortened by deletions.
+
+        :param dna_sequences: DNA sequences.
+                              Type: Two-dimensional list(str)
+
+        :return cleaned_dna_sequences: DNA sequences of the expected length, the suspect nucleotides are filled by "A".
+                                       Type: Two-dimensional list(str)
+
+        :return erasures: Suspect bit positions of the bit segment decoded from each DNA sequence.
+                          Type: Two-dimensional list(int)
+        """
+        sequence_length = math.ceil(self.segment_length / self.nucleotide_bits)
+
+        cleaned_dna_sequences, erasures = [], []
+        for dna_sequence in dna_sequences:
+            suspect_positions = [position for position, nucleotide in enumerate(dna_sequence[:sequence_length])
+                                 if nucleotide not in base_index]
+            suspect_positions += list(range(len(dna_sequence), sequence_length))
+
+            cleaned_dna_sequences.append([nucleotide if nucleotide in base_index else "A"
+                                          for nucleotide in dna_sequence]
+                                         + ["A"] * (sequence_length - len(dna_sequence)))
+            erasures.append([position * self.nucleotide_bits + offset
+                             for position in suspect_positions for offset in range(self.nucleotide_bits)
+                             if position * self.nucleotide_bits + offset < self.segment_length])
+
+        return cleaned_dna_sequences, erasures
 
     def encode(self, bit_segments):
         raise NotImplementedError("\"decode\" interface needs to be implemented!")
@@ -82,6 +122,7 @@ class BaseCodingAlgorithm(AbstractCodingAlgorithm):
     def __init__(self, need_logs=False):
         super().__init__(need_logs)
         self.mapping_rules = [[0, 0], [0, 1], [1, 0], [1, 1]]
+        self.nucleotide_bits = 2
 
     def __init_check__(self):
         pass
@@ -123,8 +164,9 @@ class BaseCodingAlgorithm(AbstractCodingAlgorithm):
 
 class AbstractErrorCorrectionCode(object):
 
-    def __init__(self, need_logs):
+    def __init__(self, need_logs, processes=1):
         self.need_logs = need_logs
+        self.processes = processes
         self.segment_length = None
         self.monitor = Monitor()
 
@@ -134,10 +176,7 @@ class AbstractErrorCorrectionCode(object):
         verified_bit_segments = []
         if type(bit_segments) == list and type(bit_segments[0]) == list:
             self.segment_length = len(bit_segments[0])
-            for index, bit_segment in enumerate(bit_segments):
-                verified_bit_segments.append(self.insert_one(bit_segment))
-                if self.need_logs:
-                    self.monitor.output(index + 1, len(bit_segments))
+            verified_bit_segments = self._run_batches("insert_batch", bit_segments)
         elif type(bit_segments) == list and type(bit_segments[0]) == int:
             self.segment_length = len(bit_segments)
             verified_bit_segments = self.insert_one(bit_segments)
@@ -152,7 +191,7 @@ class AbstractErrorCorrectionCode(object):
 
         return verified_bit_segments, len(verified_bit_segments[0]) - len(bit_segments[0])
 
-    def remove(self, verified_bit_segments):
+    def remove(self, verified_bit_segments, erasures=None):
         if self.need_logs:
             print("Check and remove the error-correction code from the bit segments.")
         bit_segments = []
@@ -161,11 +200,20 @@ class AbstractErrorCorrectionCode(object):
         error_indices = []
 
         if type(verified_bit_segments) == list and type(verified_bit_segments[0]) == list:
+            available_indices = [index for index, verified_bit_segment in enumerate(verified_bit_segments)
+                                 if verified_bit_segment is not None]
+            if erasures is not None:
+                erasures = [erasures[index] for index in available_indices]
+            output = self._run_batches("remove_batch", [verified_bit_segments[index] for index in available_indices],
+                                       erasures)
+            outputs = [None] * len(verified_bit_segments)
+            for index, data, data_type in zip(available_indices, output.get("data"), output.get("type")):
+                outputs[index] = (data, data_type)
+
             error_rate = 0
-            for index, verified_bit_segment in enumerate(verified_bit_segments):
-                if verified_bit_segment is not None:
-                    output = self.remove_one(verified_bit_segment)
-                    data, data_type = output.get("data"), output.get("type")
+            for index, output in enumerate(outputs):
+                if output is not None:
+                    data, data_type = output
                     if data_type:
                         if self.segment_length is not None:
                             bit_segments.append(data[len(data) - self.segment_length:])
@@ -180,9 +228,6 @@ class AbstractErrorCorrectionCode(object):
                     error_indices.append(index)
                     error_bit_segments.append(None)
 
-                if self.need_logs:
-                    self.monitor.output(index + 1, len(verified_bit_segments))
-
             error_rate /= len(verified_bit_segments)
 
         elif type(verified_bit_segments) == list and type(verified_bit_segments[0]) == int:
@@ -203,8 +248,85 @@ class AbstractErrorCorrectionCode(object):
 
         return {"bit": bit_segments, "e_r": error_rate, "e_i": error_indices, "e_bit": error_bit_segments}
 
+    def insert_batch(self, bit_segments):
+        """
+        introduction: Insert the error-correction code to a batch of bit segments.
+                      Subclasses can override it with a vectorized implementation.
+
+        :param bit_segments: Bit segments, containing only 0,1.
+                             Type: Two-dimensional list(int) or numpy.ndarray
+
+        :return verified_bit_segments: Bit segments with the error-correction code.
+                                       Type: Two-dimensional list(int)
+        """
+        return [self.insert_one(list(bit_segment)) for bit_segment in bit_segments]
+
+    def remove_batch(self, verified_bit_segments, erasures=None):
+        """
+        introduction: Check and remove the error-correction code from a batch of bit segments.
+                      Subclasses can override it with a vectorized implementation.
+
+        :param verified_bit_segments: Bit segments with the error-correction code.
+                                      Type: Two-dimensional list(int) or numpy.ndarray
+
+        :param erasures: Known suspect bit positions of each bit segment, which can be used by the code supporting
+                         erasure decoding (ignored by the others).
+                         Type: Two-dimensional list(int)
+
+        :return output: "data" is the corrected bit segments (or the inputted ones if they cannot be corrected)
+                        and "type" is whether each of them is corrected.
+                        Type: dict
+        """
+        data, data_types = [], []
+        for verified_bit_segment in verified_bit_segments:
+            output = self.remove_one(list(verified_bit_segment))
+            data.append(output.get("data"))
+            data_types.append(output.get("type"))
+
+        return {"data": data, "type": data_types}
+
+    def _run_batches(self, batch_name, segments, erasures=None):
+        # shard the segments in order, the shards are handled by the worker pool if "processes" is greater than 1.
+        shard_size = max(1, math.ceil(len(segments) / (max(self.processes, 1) * 8)))
+        tasks = [(self, batch_name, segments[start: start + shard_size],
+                  erasures[start: start + shard_size] if erasures is not None else None)
+                 for start in range(0, len(segments), shard_size)]
+
+        if len(tasks) == 0:
+            return getattr(self, batch_name)([])
+
+        if self.processes > 1 and len(tasks) > 1:
+            with Pool(self.processes) as pool:
+                return self._merge_batches(tasks, pool.imap(_run_batch, tasks), len(segments))
+        else:
+            return self._merge_batches(tasks, map(_run_batch, tasks), len(segments))
+
+    def _merge_batches(self, tasks, shard_outputs, total_count):
+        outputs, finished_count = None, 0
+        for (_, _, shard, _), shard_output in zip(tasks, shard_outputs):
+            if outputs is None:
+                outputs = shard_output
+            elif type(shard_output) == dict:
+                for key, value in shard_output.items():
+                    outputs[key] += value
+            else:
+                outputs += shard_output
+
+            finished_count += len(shard)
+            if self.need_logs:
+                self.monitor.output(finished_count, total_count)
+
+        return outputs
+
     def insert_one(self, input_list):
         raise NotImplementedError("\"insert_one\" interface needs to be implemented!")
 
     def remove_one(self, input_list):
         raise NotImplementedError("\"remove_one\" interface needs to be implemented!")
+
+
+def _run_batch(task):
+    error_correction, batch_name, segments, erasures = task
+    if erasures is not None:
+        return getattr(error_correction, batch_name)(segments, erasures)
+    return getattr(error_correction, batch_name)(segments)
@@ -1,12 +1,15 @@
 import copy
+import numpy
+from functools import lru_cache
 from reedsolo import RSCodec, ReedSolomonError
 from Chamaeleo.methods.default import AbstractErrorCorrectionCode
+from Chamaeleo.utils.monitor import Monitor
 
 
 class Hamming(AbstractErrorCorrectionCode):
 
-    def __init__(self, need_logs=False):
-        super().__init__(need_logs)
+    def __init__(self, need_logs=False, processes=1):
+        super().__init__(need_logs, processes)
 
     def insert_one(self, input_list):
         # calculate the length needed for detection site.
@@ -100,53 +103,347 @@ class Hamming(AbstractErrorCorrectionCode):
 
         return {"data": output_list, "type": True}
 
+    def insert_batch(self, bit_segments):
+        verified_bit_segments = [None] * len(bit_segments)
+        for indices, bit_matrix in _length_groups(bit_segments):
+            segment_length = bit_matrix.shape[1]
+
+            # calculate the length needed for detection site.
+            detect_site_length = 0
+            while (segment_length + detect_site_length + 1) > (pow(2, detect_site_length)):
+                detect_site_length += 1
+
+            data_positions, parity_masks = _hamming_masks(segment_length + detect_site_length)
+
+            # same as "insert_one", the positions are counted from the end of the segment.
+            reversed_matrix = numpy.zeros(shape=(len(bit_matrix), segment_length + detect_site_length),
+                                          dtype=numpy.uint8)
+            reversed_matrix[:, data_positions] = bit_matrix[:, ::-1]
+            for detect_site, parity_mask in enumerate(parity_masks):
+                reversed_matrix[:, pow(2, detect_site) - 1] = numpy.bitwise_xor.reduce(
+                    reversed_matrix[:, parity_mask], axis=1)
+
+            for index, verified_bit_segment in zip(indices, reversed_matrix[:, ::-1].tolist()):
+                verified_bit_segments[index] = verified_bit_segment
+
+        return verified_bit_segments
+
+    def remove_batch(self, verified_bit_segments, erasures=None):
+        # a single error can be located by the syndrome, so the known suspect positions are not used.
+        data, data_types = [None] * len(verified_bit_segments), [None] * len(verified_bit_segments)
+        for indices, verified_bit_matrix in _length_groups(verified_bit_segments):
+            total_length = verified_bit_matrix.shape[1]
+            data_positions, parity_masks = _hamming_masks(total_length)
+
+            reversed_matrix = verified_bit_matrix[:, ::-1].copy()
+            errors = numpy.zeros(shape=len(reversed_matrix), dtype=numpy.int64)
+            for detect_site, parity_mask in enumerate(parity_masks):
+                syndrome = numpy.bitwise_xor.reduce(reversed_matrix[:, parity_mask], axis=1)
+                errors += syndrome.astype(numpy.int64) << detect_site
+
+            data_type = errors < total_length
+            corrected_rows = numpy.nonzero(data_type & (errors > 0))[0]
+            reversed_matrix[corrected_rows, errors[corrected_rows] - 1] ^= 1
+
+            output_matrix = reversed_matrix[:, data_positions][:, ::-1].tolist()
+            for position, index in enumerate(indices):
+                if data_type[position]:
+                    data[index], data_types[index] = output_matrix[position], True
+                else:
+                    data[index], data_types[index] = list(verified_bit_segments[index]), False
+
+        return {"data": data, "type": data_types}
+
 
 class ReedSolomon(AbstractErrorCorrectionCode):
 
-    def __init__(self, check_size=3, need_logs=False):
+    def __init__(self, check_size=3, need_logs=False, processes=1):
         self.check_size = check_size
         self.tool = RSCodec(check_size)
-        super().__init__(need_logs)
+        super().__init__(need_logs, processes)
 
     def insert_one(self, input_list):
-        if len(input_list) % 8 != 0:
-            raise ValueError("The length of inputted binary segment must be divided by 8!")
-
-        byte_list = []
-        for index in range(0, len(input_list), 8):
-            byte_list.append(int(str("".join(list(map(str, input_list[index: index + 8])))), 2))
+        return self.insert_batch([input_list])[0]
+
+    def remove_one(self, input_list, erasures=None):
+        output = self.remove_batch([input_list], [erasures] if erasures is not None else None)
+        return {"data": output["data"][0], "type": output["type"][0]}
+
+    def insert_batch(self, bit_segments):
+        verified_bit_segments = [None] * len(bit_segments)
+        for indices, bit_matrix in _length_groups(bit_segments):
+            if bit_matrix.shape[1] % 8 != 0:
+                raise ValueError("The length of inputted binary segment must be divided by 8!")
+
+            byte_matrix = numpy.packbits(bit_matrix, axis=1)
+            encoded_bytes = b"".join([bytes(self.tool.encode(bytearray(byte_row.tobytes())))
+                                      for byte_row in byte_matrix])
+            encoded_matrix = numpy.frombuffer(encoded_bytes, dtype=numpy.uint8).reshape(len(indices), -1)
+
+            for index, verified_bit_segment in zip(indices, numpy.unpackbits(encoded_matrix, axis=1).tolist()):
+                verified_bit_segments[index] = verified_bit_segment
+
+        return verified_bit_segments
+
+    def remove_batch(self, verified_bit_segments, erasures=None):
+        data, data_types = [None] * len(verified_bit_segments), [None] * len(verified_bit_segments)
+        for indices, verified_bit_matrix in _length_groups(verified_bit_segments):
+            # the last incomplete byte is read as a number, just like the complete ones.
+            remainder = verified_bit_matrix.shape[1] % 8
+            if remainder > 0:
+                verified_bit_matrix = numpy.insert(verified_bit_matrix, [verified_bit_matrix.shape[1] - remainder],
+                                                   numpy.zeros(shape=8 - remainder, dtype=numpy.uint8), axis=1)
+            byte_matrix = numpy.packbits(verified_bit_matrix, axis=1)
+
+            decoded_indices, decoded_bytes = [], []
+            for index, byte_row in zip(indices, byte_matrix):
+                erase_positions = None
+                if erasures is not None and erasures[index]:
+                    # an erased byte costs one check symbol, while an unknown error costs two.
+                    erase_positions = sorted(set([position // 8 for position in erasures[index]
+                                                  if 0 <= position < verified_bit_matrix.shape[1]]))
+
+                try:
+                    decoded_data = self._decode(bytearray(byte_row.tobytes()), erase_positions)
+                    decoded_indices.append(index)
+                    decoded_bytes.append(bytes(decoded_data))
+                except ReedSolomonError:
+                    # Irreparable
+                    data[index], data_types[index] = list(verified_bit_segments[index]), False
+                except IndexError:
+                    # No data acquisition
+                    data[index], data_types[index] = list(verified_bit_segments[index]), False
+
+            if len(decoded_indices) > 0:
+                decoded_matrix = numpy.frombuffer(b"".join(decoded_bytes), dtype=numpy.uint8)
+                decoded_matrix = numpy.unpackbits(decoded_matrix.reshape(len(decoded_indices), -1), axis=1)
+                for index, bit_segment in zip(decoded_indices, decoded_matrix.tolist()):
+                    data[index], data_types[index] = bit_segment, True
+
+        return {"data": data, "type": data_types}
+
+    def _decode(self, byte_list, erase_positions=None):
+        if erase_positions:
+            try:
+                decoded_data = self.tool.decode(byte_list, erase_pos=erase_positions)
+            except ReedSolomonError:
+                # the suspect positions may be misleading, try the blind decoding.
+                decoded_data = self.tool.decode(byte_list)
+        else:
+            decoded_data = self.tool.decode(byte_list)
+
+        # "reedsolo" (>= 1.0) returns the message with the verified message and the error positions.
+        if type(decoded_data) is tuple:
+            decoded_data = decoded_data[0]
+
+        return decoded_data
+
+
+class OuterReedSolomon(object):
+
+    def __init__(self, block_size=64, check_size=4, need_logs=False):
+        self.block_size = block_size
+        self.check_size = check_size
+        self.need_logs = need_logs
+        self.segment_count = None
+        self.monitor = Monitor()
+
+        self.__init_check__()
+
+    def __init_check__(self):
+        if self.block_size < 1 or self.check_size < 1:
+            raise ValueError("The parameter \"block_size\" and \"check_size\" need to be greater than 0!")
+        if self.block_size + self.check_size > 256:
+            raise ValueError("The sum of \"block_size\" and \"check_size\" cannot be greater than 256!")
+
+    def insert(self, bit_segments):
+        """
+        introduction: Add the parity segments computed across the columns of every block of bit segments,
+                      which is done before adding the indices.
+
+        :param bit_segments: Bit segments, the length of which can be divided by 8.
+                             Type: Two-dimensional list(int)
+
+        :return bit_segments: Bit segments followed by the parity segments of each block.
+                              Type: Two-dimensional list(int)
+
+        :return parity_count: Number of the parity segments.
+        """
+        if self.need_logs:
+            print("Insert the outer error-correction code (parity segments) to the bit segments.")
+
+        data_matrix = self._to_bytes(bit_segments)
+        self.segment_count = len(data_matrix)
+
+        blocks = self._to_blocks(data_matrix)
+        parity_matrix = _cauchy_encode(blocks, self._parity_matrix()).reshape(-1, data_matrix.shape[1])
+
+        if self.need_logs:
+            print("There are " + str(len(parity_matrix)) + " parity segments for "
+                  + str(len(blocks)) + " block(s) of " + str(self.block_size) + " segments.")
+
+        return list(bit_segments) + numpy.unpackbits(parity_matrix, axis=1).tolist(), len(parity_matrix)
+
+    def remove(self, bit_segments, missing_indices):
+        """
+        introduction: Recover the missing bit segments by the parity segments and remove the parity segments.
+
+        :param bit_segments: Bit segments (with the parity segments) sorted by their indices,
+                             the missing ones can be anything (generally filled by 0).
+                             Type: Two-dimensional list(int)
+
+        :param missing_indices: Indices of the missing bit segments, obtained by the index-reassembly step.
+                                The bit segments after the inputted ones are regarded as missing.
+                                Type: One-dimensional list(int)
+
+        :return output: "bit" is the recovered bit segments (without the parity segments),
+                        "e_r" is the rate of unrecoverable segments and "e_i" is their indices.
+                        Type: dict
+        """
+        if self.segment_count is None:
+            raise ValueError("The parameter \"segment_count\" is needed, "
+                             + "which records the number of bit segments before adding the parity segments.")
+
+        if self.need_logs:
+            print("Recover the missing bit segments by the outer error-correction code.")
+
+        block_count = -(-self.segment_count // self.block_size)
+        total_count = self.segment_count + block_count * self.check_size
+        segment_length = len(bit_segments[0])
+
+        # the segments after the last available index are missing too.
+        bit_segments = list(bit_segments[:total_count])
+        missing = numpy.zeros(shape=total_count, dtype=bool)
+        missing[len(bit_segments):] = True
+        bit_segments += [[0] * segment_length for _ in range(total_count - len(bit_segments))]
+        for index in missing_indices:
+            if 0 <= index < total_count:
+                missing[index] = True
+
+        byte_matrix = self._to_bytes(bit_segments)
+        data_matrix, parity_matrix = byte_matrix[:self.segment_count], byte_matrix[self.segment_count:]
+        data_matrix[missing[:self.segment_count]] = 0
+
+        blocks = self._to_blocks(data_matrix)
+        parity_blocks = parity_matrix.reshape(block_count, self.check_size, -1)
+        data_missing = numpy.zeros(shape=(block_count, self.block_size), dtype=bool)
+        data_missing.reshape(-1)[:self.segment_count] = missing[:self.segment_count]
+        parity_missing = missing[self.segment_count:].reshape(block_count, self.check_size)
+
+        # contribution of the missing data bytes to the parity bytes, by removing the known ones.
+        parity_matrix = self._parity_matrix()
+        remainders = parity_blocks ^ _cauchy_encode(blocks, parity_matrix)
+
+        error_indices = []
+        for block_index in numpy.nonzero(numpy.any(data_missing, axis=1))[0]:
+            rows = numpy.nonzero(data_missing[block_index])[0]
+            columns = numpy.nonzero(~parity_missing[block_index])[0][:len(rows)]
+            if len(columns) < len(rows):
+                error_indices += (block_index * self.block_size + rows).tolist()
+            else:
+                # any square sub-matrix of the Cauchy matrix is invertible.
+                inverse = _galois_inverse(parity_matrix[rows][:, columns].T)
+                recovered = _galois_dot(inverse, remainders[block_index, columns])
+                blocks[block_index, rows] = recovered
 
-        output_list = []
-        for one_byte in list(self.tool.encode(byte_list)):
-            temp_bits = list(map(int, list(bin(one_byte))[2:]))
-            temp_bits = [0 for _ in range(8 - len(temp_bits))] + temp_bits
-            output_list += temp_bits
+            if self.need_logs:
+                self.monitor.output(block_index + 1, block_count)
 
-        return output_list
+        data_matrix = blocks.reshape(-1, blocks.shape[2])[:self.segment_count]
+        bit_segments = numpy.unpackbits(data_matrix, axis=1)[:, :segment_length].tolist()
 
-    def remove_one(self, input_list):
-        original_input_list = copy.deepcopy(input_list)
+        return {"bit": bit_segments, "e_r": len(error_indices) / self.segment_count, "e_i": error_indices}
 
-        byte_list = []
-        for index in range(0, len(input_list), 8):
-            byte_list.append(int(str("".join(list(map(str, input_list[index: index + 8])))), 2))
-
-        try:
-            decode_byte_list = list(self.tool.decode(byte_list))
-            # fix error in Linux or Mac OS, TypeError: 'bytearray' object cannot be interpreted as an integer
-            if type(decode_byte_list[0]) is not int:
-                decode_byte_list = list(decode_byte_list[0])
-
-            output_list = []
-            for one_byte in list(decode_byte_list):
-                temp_bits = list(map(int, list(bin(one_byte))[2:]))
-                temp_bits = [0 for _ in range(8 - len(temp_bits))] + temp_bits
-                output_list += temp_bits
-        except ReedSolomonError:
-            # Irreparable
-            return {"data": original_input_list, "type": False}
-        except IndexError:
-            # No data acquisition
-            return {"data": original_input_list, "type": False}
-
-        return {"data": output_list, "type": True}
+    def _to_bytes(self, bit_segments):
+        bit_matrix = numpy.array(bit_segments, dtype=numpy.uint8)
+        if bit_matrix.ndim != 2 or bit_matrix.shape[1] % 8 != 0:
+            raise ValueError("The length of inputted binary segment must be divided by 8!")
+        return numpy.packbits(bit_matrix, axis=1)
+
+    def _to_blocks(self, data_matrix):
+        # the last block is filled by the virtual segments of zeros.
+        block_count = -(-len(data_matrix) // self.block_size)
+        blocks = numpy.zeros(shape=(block_count * self.block_size, data_matrix.shape[1]), dtype=numpy.uint8)
+        blocks[:len(data_matrix)] = data_matrix
+        return blocks.reshape(block_count, self.block_size, data_matrix.shape[1])
+
+    def _parity_matrix(self):
+        return _cauchy_matrix(self.block_size, self.check_size)
+
+
+@lru_cache(maxsize=None)
+def _galois_tables():
+    # GF(256) with the primitive polynomial x^8 + x^4 + x^3 + x^2 + 1.
+    exp_table, log_table = numpy.zeros(shape=512, dtype=numpy.int64), numpy.zeros(shape=256, dtype=numpy.int64)
+    value = 1
+    for power in range(255):
+        exp_table[power], log_table[value] = value, power
+        value <<= 1
+        if value & 0x100:
+            value ^= 0x11d
+    exp_table[255:510] = exp_table[:255]
+
+    multiply_table = numpy.zeros(shape=(256, 256), dtype=numpy.uint8)
+    multiply_table[1:, 1:] = exp_table[log_table[1:, None] + log_table[None, 1:]]
+    return exp_table, log_table, multiply_table
+
+
+@lru_cache(maxsize=None)
+def _cauchy_matrix(block_size, check_size):
+    # element (i, j) is 1 / (x_i + y_j), where x_i = i and y_j = block_size + j are distinct.
+    exp_table, log_table, _ = _galois_tables()
+    sums = numpy.arange(block_size)[:, None] ^ (block_size + numpy.arange(check_size))[None, :]
+    return exp_table[(255 - log_table[sums]) % 255].astype(numpy.uint8)
+
+
+def _cauchy_encode(blocks, parity_matrix):
+    multiply_table = _galois_tables()[2]
+    parity_blocks = numpy.zeros(shape=(blocks.shape[0], parity_matrix.shape[1], blocks.shape[2]), dtype=numpy.uint8)
+    for row in range(parity_matrix.shape[0]):
+        # (check size, blocks, bytes) -> (blocks, check size, bytes)
+        parity_blocks ^= multiply_table[parity_matrix[row]][:, blocks[:, row]].transpose(1, 0, 2)
+    return parity_blocks
+
+
+def _galois_dot(matrix, vectors):
+    multiply_table = _galois_tables()[2]
+    results = numpy.zeros(shape=(matrix.shape[0], vectors.shape[1]), dtype=numpy.uint8)
+    for row in range(matrix.shape[0]):
+        for column in range(matrix.shape[1]):
+            results[row] ^= multiply_table[matrix[row, column]][vectors[column]]
+    return results
+
+
+def _galois_inverse(matrix):
+    exp_table, log_table, multiply_table = _galois_tables()
+    size = len(matrix)
+    augmented = numpy.concatenate((matrix.astype(numpy.uint8), numpy.eye(size, dtype=numpy.uint8)), axis=1)
+    for column in range(size):
+        pivot = column + int(numpy.nonzero(augmented[column:, column])[0][0])
+        augmented[[column, pivot]] = augmented[[pivot, column]]
+        augmented[column] = multiply_table[exp_table[255 - log_table[augmented[column, column]]]][augmented[column]]
+        for row in range(size):
+            if row != column and augmented[row, column] != 0:
+                augmented[row] ^= multiply_table[augmented[row, column]][augmented[column]]
+    return augmented[:, size:]
+
+
+@lru_cache(maxsize=None)
+def _hamming_masks(total_length):
+    positions = numpy.arange(1, total_length + 1)
+    # the k-th detection site checks the positions whose k-th bit is 1 (including itself).
+    parity_masks = [numpy.nonzero(positions & pow(2, detect_site))[0]
+                    for detect_site in range(int(total_length).bit_length())]
+    data_positions = numpy.nonzero(positions & (positions - 1))[0]
+    return data_positions, parity_masks
+
+
+def _length_groups(bit_segments):
+    # group the segments by their length, so that each group can be handled as a matrix.
+    groups = {}
+    for index, bit_segment in enumerate(bit_segments):
+        groups.setdefault(len(bit_segment), []).append(index)
+
+    for indices in groups.values():
+        bit_matrix = numpy.array([bit_segments[index] for index in indices], dtype=numpy.uint8)
+        yield indices, bit_matrix.reshape(len(indices), -1)
@@ -6,9 +6,12 @@ from Chamaeleo.methods.default import AbstractCodingAlgorithm
 
 class Church(AbstractCodingAlgorithm):
 
-    def __init__(self, need_logs=False):
+    def __init__(self, need_logs=False, constraint=None, max_iterations=100):
         super().__init__(need_logs)
         self.carbon_options = [["A", "C"], ["G", "T"]]
+        self.nucleotide_bits = 1
+        self.constraint = constraint
+        self.max_iterations = max_iterations
 
         if self.need_logs:
             print("create Church et al. successfully")
@@ -23,16 +26,16 @@ class Church(AbstractCodingAlgorithm):
         dna_sequences = []
 
         for segment_index, bit_segment in enumerate(bit_segments):
-            dna_sequence = []
-            for bit in bit_segment:
-                options, window = self.carbon_options[bit], dna_sequence[-3:]
-                if len(window) == 3 and len(set(window)) == 1:
-                    for option in options:
-                        if option != window[0]:
-                            dna_sequence.append(option)
-                            break
-                else:
-                    dna_sequence.append(random.choice(options))
+            dna_sequence = self._bits_to_sequence(bit_segment)
+
+            # the degenerate options are re-selected until the sequence satisfies the constraint.
+            iteration = 1
+            while self.constraint is not None and not self.constraint.check("".join(dna_sequence)):
+                if iteration >= self.max_iterations:
+                    raise ValueError("No DNA sequence satisfying the constraint is found for bit segment "
+                                     + str(segment_index) + "!")
+                dna_sequence = self._bits_to_sequence(bit_segment)
+                iteration += 1
 
             dna_sequences.append(dna_sequence)
 
@@ -41,6 +44,20 @@ class Church(AbstractCodingAlgorithm):
 
         return dna_sequences
 
+    def _bits_to_sequence(self, bit_segment):
+        dna_sequence = []
+        for bit in bit_segment:
+            options, window = self.carbon_options[bit], dna_sequence[-3:]
+            if len(window) == 3 and len(set(window)) == 1:
+                for option in options:
+                    if option != window[0]:
+                        dna_sequence.append(option)
+                        break
+            else:
+                dna_sequence.append(random.choice(options))
+
+        return dna_sequence
+
     def decode(self, dna_sequences):
         bit_segments = []
 
@@ -5,7 +5,7 @@ import math
 import numpy
 from collections import defaultdict
 from Chamaeleo.methods.default import AbstractCodingAlgorithm
-from Chamaeleo.methods.inherent import base_index, index_base
+from Chamaeleo.methods.inherent import base_index, index_base, to_nucleotide_codes
 from Chamaeleo.utils import screen
 
 
@@ -13,7 +13,7 @@ class DNAFountain(AbstractCodingAlgorithm):
 
     def __init__(self, homopolymer=4, gc_bias=0.2, redundancy=0.07, header_size=4,
                  c_dist=0.1, delta=0.05, recursion_depth=10000000, decode_packets=None, need_pre_check=False,
-                 need_logs=False):
+                 constraint=None, need_logs=False):
         super().__init__(need_logs)
         self.homopolymer = homopolymer
         self.gc_bias = gc_bias
@@ -23,6 +23,7 @@ class DNAFountain(AbstractCodingAlgorithm):
         self.delta = delta
         self.recursion_depth = recursion_depth
         self.need_pre_check = need_pre_check
+        self.constraint = constraint
         self.prng = None
         self.decode_packets = decode_packets
         # adjust the maximum recursion depth to "self.recursion_depth" in Python.
@@ -74,7 +75,8 @@ class DNAFountain(AbstractCodingAlgorithm):
 
             # check validity.
             if screen.check("".join(dna_sequence),
-                            max_homopolymer=self.homopolymer, max_content=0.5 + self.gc_bias):
+                            max_homopolymer=self.homopolymer, max_content=0.5 + self.gc_bias,
+                            constraint=self.constraint):
                 dna_sequences.append(dna_sequence)
                 chuck_recorder.append(droplet.chuck_indices)
 
@@ -288,7 +290,7 @@ class DNAFountain(AbstractCodingAlgorithm):
 class YinYangCode(AbstractCodingAlgorithm):
 
     def __init__(self, yang_rule=None, yin_rule=None, virtual_nucleotide="A", max_iterations=100,
-                 max_ratio=0.8, faster=False, max_homopolymer=4, max_content=0.6, need_logs=False):
+                 max_ratio=0.8, faster=False, max_homopolymer=4, max_content=0.6, constraint=None, need_logs=False):
         super().__init__(need_logs)
 
         if not yang_rule:
@@ -302,6 +304,7 @@ class YinYangCode(AbstractCodingAlgorithm):
         self.max_iterations = max_iterations
         self.max_homopolymer = max_homopolymer
         self.max_content = max_content
+        self.constraint = constraint
         self.max_ratio = max_ratio
         self.faster = faster
         self.index_length = 0
@@ -441,7 +444,8 @@ class YinYangCode(AbstractCodingAlgorithm):
                     support_nucleotide_2 = current_nucleotide_2
 
                 if screen.check("".join(dna_sequence[0]),
-                                max_homopolymer=self.max_homopolymer, max_content=self.max_content):
+                                max_homopolymer=self.max_homopolymer, max_content=self.max_content,
+                                constraint=self.constraint):
                     is_finish = True
                     dna_sequences.append(dna_sequence[0])
                     if state:
@@ -450,7 +454,8 @@ class YinYangCode(AbstractCodingAlgorithm):
                         del good_data[selected_index]
                     break
                 elif screen.check("".join(dna_sequence[1]),
-                                  max_homopolymer=self.max_homopolymer, max_content=self.max_content):
+                                  max_homopolymer=self.max_homopolymer, max_content=self.max_content,
+                                  constraint=self.constraint):
                     is_finish = True
                     dna_sequences.append(dna_sequence[1])
                     if state:
@@ -494,13 +499,15 @@ class YinYangCode(AbstractCodingAlgorithm):
                         support_nucleotide_2 = current_nucleotide_2
 
                     if screen.check("".join(dna_sequence[0]),
-                                    max_homopolymer=self.max_homopolymer, max_content=self.max_content):
+                                    max_homopolymer=self.max_homopolymer, max_content=self.max_content,
+                                    constraint=self.constraint):
                         is_finish = True
                         dna_sequences.append(dna_sequence[0])
                         del bit_segments[selected_index]
                         break
                     elif screen.check("".join(dna_sequence[1]),
-                                      max_homopolymer=self.max_homopolymer, max_content=self.max_content):
+                                      max_homopolymer=self.max_homopolymer, max_content=self.max_content,
+                                      constraint=self.constraint):
                         is_finish = True
                         dna_sequences.append(dna_sequence[1])
                         del bit_segments[selected_index]
@@ -523,6 +530,19 @@ class YinYangCode(AbstractCodingAlgorithm):
             raise ValueError("The parameter \"total_count\" is needed, "
                              + "which is used to eliminate additional random binary segments.")
 
+        try:
+            nucleotide_codes = to_nucleotide_codes(dna_sequences)
+        except ValueError:
+            nucleotide_codes = None
+
+        if nucleotide_codes is not None:
+            bit_segments = self.batch_decode(nucleotide_codes).tolist()
+
+            if self.need_logs:
+                self.monitor.output(len(dna_sequences), len(dna_sequences))
+
+            return bit_segments
+
         bit_segments = []
 
         for sequence_index, dna_sequence in enumerate(dna_sequences):
@@ -550,8 +570,44 @@ class YinYangCode(AbstractCodingAlgorithm):
 
         return remain_bit_segments
 
+    def batch_decode(self, nucleotide_codes):
+        """
+        introduction: Decode the nucleotide-code matrix to the bit matrix through the 4 x 4 lookup table.
+
+        :param nucleotide_codes: Nucleotide-code matrix of equal-length DNA sequences (by "base_index").
+                                 Type: Two-dimensional numpy.ndarray(int)
+
+        :return bit_segments: Bit matrix without the additional random segments,
+                              in which the upper and lower segments of each sequence are adjacent rows.
+                              Type: Two-dimensional numpy.ndarray(uint8)
+        """
+        nucleotide_codes = numpy.asarray(nucleotide_codes, dtype=numpy.uint8)
+        sequence_count, sequence_length = nucleotide_codes.shape
+
+        upper_table = numpy.array(self.yang_rule, dtype=numpy.uint8)
+        lower_table = numpy.array(self.yin_rule, dtype=numpy.uint8)
+
+        support_codes = numpy.empty(shape=(sequence_count, sequence_length), dtype=numpy.uint8)
+        support_codes[:, 0] = base_index[self.virtual_nucleotide]
+        support_codes[:, 1:] = nucleotide_codes[:, :-1]
+
+        bit_segments = numpy.empty(shape=(sequence_count, 2, sequence_length), dtype=numpy.uint8)
+        bit_segments[:, 0] = upper_table[nucleotide_codes]
+        bit_segments[:, 1] = lower_table[support_codes, nucleotide_codes]
+        bit_segments = bit_segments.reshape(sequence_count * 2, sequence_length)
+
+        # the additional random segments are marked by the index that exceeds the total count.
+        index_length = min(self.index_length, sequence_length)
+        if index_length > 0:
+            weights = numpy.left_shift(numpy.uint64(1), numpy.arange(index_length - 1, -1, -1, dtype=numpy.uint64))
+            segment_indices = bit_segments[:, :index_length].astype(numpy.uint64) @ weights
+            bit_segments = bit_segments[segment_indices < self.total_count]
+
+        return bit_segments
+
     def addition(self, fixed_bit_segment, total_count):
-        while True:
+        # the random segments are re-selected until the sequence satisfies the constraint.
+        for _ in range(self.max_iterations):
             # insert at least 2 interval.
             random_index = random.randint(total_count + 3, math.pow(2, self.index_length) - 1)
             random_segment = list(map(int, list(str(bin(random_index))[2:].zfill(self.index_length))))
@@ -576,13 +632,15 @@ class YinYangCode(AbstractCodingAlgorithm):
                         current_nucleotide_1 = self._bits_to_nucleotide(fixed_bit, bit, support_nucleotide_1)
                         if not screen.check("".join(dna_sequence[0]) + current_nucleotide_1,
                                             max_homopolymer=self.max_homopolymer,
-                                            max_content=self.max_content):
+                                            max_content=self.max_content,
+                                            constraint=self.constraint):
                             current_nucleotide_1 = None
                     if work_flags[1] and current_nucleotide_2 is None:
                         current_nucleotide_2 = self._bits_to_nucleotide(bit, fixed_bit, support_nucleotide_2)
                         if not screen.check("".join(dna_sequence[1]) + current_nucleotide_2,
                                             max_homopolymer=self.max_homopolymer,
-                                            max_content=self.max_content):
+                                            max_content=self.max_content,
+                                            constraint=self.constraint):
                             current_nucleotide_2 = None
 
                 if current_nucleotide_1 is None:
@@ -602,9 +660,13 @@ class YinYangCode(AbstractCodingAlgorithm):
             for potential_dna_sequence in dna_sequence:
                 if potential_dna_sequence is not None and screen.check("".join(potential_dna_sequence),
                                                                        max_homopolymer=self.max_homopolymer,
-                                                                       max_content=self.max_content):
+                                                                       max_content=self.max_content,
+                                                                       constraint=self.constraint):
                     return potential_dna_sequence
 
+        raise ValueError("No DNA sequence satisfying the constraint is found by the additional random segments "
+                         "in " + str(self.max_iterations) + " iterations!")
+
     def _bits_to_nucleotide(self, upper_bit, lower_bit, support_nucleotide):
         current_options = []
         for index in range(len(self.yang_rule)):
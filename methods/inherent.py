@@ -1,6 +1,5 @@
-import itertools
+import os
 import numpy
-import Chamaeleo.utils.monitor as monitor
 
 """
 Conversing base to actual index, where index 0 <-> A, index 1 <-> T, index 2 <-> C, index 3 <-> G.
@@ -52,63 +51,167 @@ gc_codes = ['AAC', 'AAG', 'AAT', 'ACA', 'ACG', 'ACT', 'AGA', 'AGC', 'AGT', 'ATA'
             'TAC', 'TAG', 'TAT', 'TCA', 'TCG', 'TCT', 'TGA', 'TGC', 'TGT', 'TTA', 'TTC', 'TTG']
 
 
-def get_yyc_rule_by_index(index, need_logs=False):
-    rules = []
-    temp_rule1 = ["".join(x) for x in itertools.product("01", repeat=4)]
-    temp_rule2 = ["".join(x) for x in itertools.product("01", repeat=16)]
+_code_table = numpy.full(shape=256, fill_value=255, dtype=numpy.uint8)
+for _nucleotide, _code in base_index.items():
+    _code_table[ord(_nucleotide)] = _code
 
-    m = monitor.Monitor()
 
-    if need_logs:
-        print("Find all the available Yin-Yang rules.")
+def to_nucleotide_codes(dna_sequences):
+    """
+    introduction: Convert DNA sequences of equal length into a nucleotide-code matrix (by "base_index").
+
+    :param dna_sequences: DNA sequences, containing only "A", "C", "G" and "T".
+                          Type: Two-dimensional list(str) or one-dimensional list(str)
+
+    :return nucleotide_codes: Nucleotide-code matrix.
+                              Type: Two-dimensional numpy.ndarray(uint8)
+    """
+    if len(dna_sequences) == 0:
+        return numpy.zeros(shape=(0, 0), dtype=numpy.uint8)
+
+    sequence_length = len(dna_sequences[0])
+    for dna_sequence in dna_sequences:
+        if len(dna_sequence) != sequence_length:
+            raise ValueError("The DNA sequences need to be of equal length!")
+
+    string = "".join(["".join(dna_sequence) for dna_sequence in dna_sequences])
+    if len(string) != sequence_length * len(dna_sequences):
+        raise ValueError("Only the single nucleotide can be included in the DNA sequence!")
+
+    nucleotide_codes = _code_table[numpy.frombuffer(string.encode("latin-1", errors="replace"), dtype=numpy.uint8)]
+    if numpy.any(nucleotide_codes > 3):
+        raise ValueError("Only \"A\", \"C\", \"G\" and \"T\" can be included in the DNA sequence!")
+
+    return nucleotide_codes.reshape(len(dna_sequences), sequence_length)
+
+
+yyc_support_bases = ["A", "T", "C", "G"]
+
+_yyc_rules = None
+_yyc_identities = None
+
+
+def load_yyc_rules(cache_path=None, need_logs=False):
+    """
+    introduction: Obtain the table of all the available Yin-Yang rules, which is built once and kept in memory.
+
+    :param cache_path: Path of the ".npz" file to read the table from (if it exists) or to write the table to.
+
+    :param need_logs: Show the process.
+
+    :return support_bases: Support (virtual) nucleotide index (in "yyc_support_bases") of each rule.
+                           Type: One-dimensional numpy.ndarray(uint8)
+
+    :return yang_rules: Yang rule (rule 1) of each rule.
+                        Type: Two-dimensional numpy.ndarray(uint8)
+
+    :return yin_rules: Yin rule (rule 2) of each rule.
+                       Type: Three-dimensional numpy.ndarray(uint8)
+    """
+    global _yyc_rules, _yyc_identities
+
+    if _yyc_rules is None:
+        if cache_path is not None and os.path.exists(cache_path):
+            if need_logs:
+                print("Load the available Yin-Yang rules from file: " + cache_path)
+
+            with numpy.load(cache_path) as data:
+                rules = (data["support_bases"], data["yang_rules"], data["yin_rules"])
+        else:
+            if need_logs:
+                print("Find all the available Yin-Yang rules.")
+
+            rules = _enumerate_yyc_rules()
+
+        identities = {}
+        for index, key in enumerate(_yyc_rule_keys(*rules).tolist()):
+            identities[key] = index
+
+        _yyc_rules, _yyc_identities = rules, identities
+
+    # the table in memory is also saved if the requested cache file does not exist.
+    if cache_path is not None and not os.path.exists(cache_path):
+        if need_logs:
+            print("Save the available Yin-Yang rules to file: " + cache_path)
 
-    count = 0
-    step = 0
-    for base in ["A", "T", "C", "G"]:
-        for rule1index in range(len(temp_rule1)):
-            for rule2index in range(len(temp_rule2)):
-                rule1 = list(map(int, list(temp_rule1[rule1index])))
-                rule2 = numpy.array(list(map(int, list(temp_rule2[rule2index])))).reshape(4, 4).tolist()
-                if _check(rule1, rule2):
-                    rules.append(YYCRule(rule1, rule2, base, count))
-                    count += 1
+        with open(cache_path, "wb") as file:
+            numpy.savez(file, support_bases=_yyc_rules[0], yang_rules=_yyc_rules[1], yin_rules=_yyc_rules[2])
 
-                step += 1
+    return _yyc_rules
 
-                if need_logs:
-                    m.output(step, len(temp_rule1) * len(temp_rule2) * 4)
 
-    if index < 0 or index >= len(rules):
-        raise ValueError("We have " + str(len(rules)) + " rules, index " + str(index) + " is wrong!")
+def get_yyc_rule_by_index(index, need_logs=False, cache_path=None):
+    support_bases, yang_rules, yin_rules = load_yyc_rules(cache_path, need_logs)
+
+    if index < 0 or index >= len(support_bases):
+        raise ValueError("We have " + str(len(support_bases)) + " rules, index " + str(index) + " is wrong!")
+
+    rule = YYCRule(yang_rules[index].tolist(), yin_rules[index].tolist(),
+                   yyc_support_bases[support_bases[index]], index)
 
     if need_logs:
-        print("Current Rule is " + str(rules[index].get_info()) + ".")
+        print("Current Rule is " + str(rule.get_info()) + ".")
+
+    return rule.get_info()
+
+
+def get_yyc_index_by_rule(support_base, yang_rule, yin_rule, need_logs=False, cache_path=None):
+    load_yyc_rules(cache_path, need_logs)
+
+    if support_base not in yyc_support_bases:
+        raise ValueError("Support nucleotide needs to be one of \"A\", \"C\", \"G\", or \"T\"!")
+
+    yang_rule, yin_rule = numpy.array(yang_rule), numpy.array(yin_rule)
+    if yang_rule.shape != (4,) or yin_rule.shape != (4, 4) \
+            or numpy.any((yang_rule != 0) & (yang_rule != 1)) or numpy.any((yin_rule != 0) & (yin_rule != 1)):
+        raise ValueError("Only 0 and 1 can be included in the 4-length yang rule and the 4 x 4 yin rule!")
+
+    key = _yyc_rule_keys(numpy.array([yyc_support_bases.index(support_base)]),
+                         yang_rule[None, :], yin_rule[None, :, :])[0]
+    index = _yyc_identities.get(int(key))
+
+    if index is None:
+        raise ValueError("The rule [" + support_base + ", " + str(yang_rule.tolist()) + ", " + str(yin_rule.tolist())
+                         + "] is not an available Yin-Yang rule!")
+
+    return index
+
+
+def _enumerate_yyc_rules():
+    # every candidate is a binary number, whose bits are read from the most significant one.
+    yang_candidates = (numpy.arange(16)[:, None] >> numpy.arange(3, -1, -1)) & 1
+    yin_candidates = ((numpy.arange(65536)[:, None] >> numpy.arange(15, -1, -1)) & 1).reshape(-1, 4, 4)
+
+    yang_rules, yin_rules = [], []
+    for yang_rule in yang_candidates[numpy.sum(yang_candidates, axis=1) == 2]:
+        if yang_rule[0] == yang_rule[1]:
+            same = [0, 1, 2, 3]
+        elif yang_rule[0] == yang_rule[2]:
+            same = [0, 2, 1, 3]
+        else:
+            same = [0, 3, 1, 2]
 
-    return rules[index].get_info()
+        # the two nucleotides sharing the same yang bit must be distinguished by the yin bit in each row.
+        available = numpy.all((yin_candidates[:, :, same[0]] + yin_candidates[:, :, same[1]] == 1)
+                              & (yin_candidates[:, :, same[2]] + yin_candidates[:, :, same[3]] == 1), axis=1)
 
+        yin_rules.append(yin_candidates[available])
+        yang_rules.append(numpy.repeat(yang_rule[None, :], len(yin_rules[-1]), axis=0))
 
-def _check(rule1, rule2):
-    for index in range(len(rule1)):
-        if rule1[index] != 0 and rule1[index] != 1:
-            return False
+    yang_rules = numpy.concatenate(yang_rules).astype(numpy.uint8)
+    yin_rules = numpy.concatenate(yin_rules).astype(numpy.uint8)
 
-    if sum(rule1) != 2:
-        return False
+    support_bases = numpy.repeat(numpy.arange(len(yyc_support_bases), dtype=numpy.uint8), len(yang_rules))
+    yang_rules = numpy.tile(yang_rules, (len(yyc_support_bases), 1))
+    yin_rules = numpy.tile(yin_rules, (len(yyc_support_bases), 1, 1))
 
-    if rule1[0] == rule1[1]:
-        same = [0, 1, 2, 3]
-    elif rule1[0] == rule1[2]:
-        same = [0, 2, 1, 3]
-    else:
-        same = [0, 3, 1, 2]
+    return support_bases, yang_rules, yin_rules
 
-    for row in range(len(rule2)):
-        if rule2[row][same[0]] + rule2[row][same[1]] != 1 or rule2[row][same[0]] * rule2[row][same[1]] != 0:
-            return False
-        if rule2[row][same[2]] + rule2[row][same[3]] != 1 or rule2[row][same[2]] * rule2[row][same[3]] != 0:
-            return False
 
-    return True
+def _yyc_rule_keys(support_bases, yang_rules, yin_rules):
+    yang_values = numpy.asarray(yang_rules, dtype=numpy.int64) @ (1 << numpy.arange(3, -1, -1))
+    yin_values = numpy.asarray(yin_rules, dtype=numpy.int64).reshape(-1, 16) @ (1 << numpy.arange(15, -1, -1))
+    return (numpy.asarray(support_bases, dtype=numpy.int64) << 20) + (yang_values << 16) + yin_values
 
 
 class YYCRule:
@@ -0,0 +1,43 @@
+import os
+import unittest
+
+from Chamaeleo.methods.default import BaseCodingAlgorithm
+from Chamaeleo.methods.ecc import Hamming
+from Chamaeleo.utils.pipelines import BenchmarkPipeline
+
+
+class TestEncodeDecode(unittest.TestCase):
+
+    def setUp(self):
+        self.pipeline = BenchmarkPipeline(coding_schemes={"Base": BaseCodingAlgorithm()},
+                                          error_corrections={"None": None, "Hamming": Hamming()},
+                                          needed_indices=[True], data_sizes=[256], entropies=[2.0, 8.0], repeats=2)
+
+    def test_evaluate(self):
+        results = self.pipeline.evaluate()
+        self.assertEqual(len(results), 4)
+        for result in results:
+            self.assertTrue(result["transcoding state"])
+            self.assertEqual(set(result["encoding stages"].keys()), {"read", "index", "encode", "write"}
+                             if result["error-correction"] == "None"
+                             else {"read", "index", "error correction", "encode", "write"})
+            self.assertGreater(result["encoding nucleotide throughput"], 0)
+
+    def test_peak_memory(self):
+        pipeline = BenchmarkPipeline(coding_schemes={"Base": BaseCodingAlgorithm()}, error_corrections={"None": None},
+                                     needed_indices=[True], data_sizes=[256, 32768], entropies=[8.0], repeats=1)
+        results = pipeline.evaluate()
+        # the peak memory is measured per task, so the smaller task does not inherit the peak of the larger one.
+        self.assertGreater(results[1]["peak traced memory"], results[0]["peak traced memory"])
+        pipeline.data_sizes = [32768, 256]
+        results = pipeline.evaluate()
+        self.assertGreater(results[0]["peak traced memory"], results[1]["peak traced memory"])
+
+    def test_compare(self):
+        self.pipeline.evaluate()
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated_files", "benchmark.json")
+        self.pipeline.output_records(type="path", path=path)
+        comparison = self.pipeline.compare(path)
+        os.remove(path)
+        self.assertEqual([data["total speedup"] for data in comparison], [1.0] * 4)
+        self.assertEqual([data["regression"] for data in comparison], [False] * 4)
@@ -0,0 +1,49 @@
+import random
+import unittest
+
+from Chamaeleo.utils.channel import ChannelSimulator
+
+
+class TestEncodeDecode(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(40)
+        self.dna_sequences = [[random.choice(["A", "C", "G", "T"]) for _ in range(random.randint(100, 120))]
+                              for _ in range(2000)]
+        self.total_length = sum([len(dna_sequence) for dna_sequence in self.dna_sequences])
+
+    def test_perfect_channel(self):
+        results = ChannelSimulator(seed=40).simulate(self.dna_sequences)
+        self.assertEqual(results["dna"], self.dna_sequences)
+        self.assertEqual(results["origin"], list(range(len(self.dna_sequences))))
+
+    def test_reproducibility(self):
+        parameters = {"substitution_rate": 0.01, "insertion_rate": 0.01, "deletion_rate": 0.01, "seed": 40}
+        self.assertEqual(ChannelSimulator(**parameters).simulate(self.dna_sequences),
+                         ChannelSimulator(**parameters).simulate(self.dna_sequences))
+
+    def test_substitution_matrix(self):
+        channel = ChannelSimulator(substitution_rate=1, substitution_matrix=[[0, 0, 0, 1], [0, 0, 1, 0],
+                                                                             [0, 1, 0, 0], [1, 0, 0, 0]])
+        self.assertEqual(channel.simulate([list("AACGTT")])["dna"], [list("TTGCAA")])
+
+    def test_position_rates(self):
+        rates = [0] * 50 + [0.5] * 70
+        reads = ChannelSimulator(substitution_rate=rates, seed=40).simulate(self.dna_sequences)["dna"]
+        for read, dna_sequence in zip(reads, self.dna_sequences):
+            self.assertEqual(read[:50], dna_sequence[:50])
+
+    def test_indel_lengths(self):
+        reads = ChannelSimulator(deletion_rate=0.01, indel_lengths=[0, 1], seed=40).simulate(self.dna_sequences)["dna"]
+        deletion_rate = 1 - sum([len(read) for read in reads]) / self.total_length
+        self.assertAlmostEqual(deletion_rate, 0.02, delta=0.003)
+
+        reads = ChannelSimulator(insertion_rate=0.01, indel_lengths=[0, 0, 1], seed=40).simulate(self.dna_sequences)
+        insertion_rate = sum([len(read) for read in reads["dna"]]) / self.total_length - 1
+        self.assertAlmostEqual(insertion_rate, 0.03, delta=0.003)
+
+    def test_coverage(self):
+        results = ChannelSimulator(dropout=0.1, coverage=10, seed=40).simulate(self.dna_sequences)
+        self.assertAlmostEqual(len(results["dna"]) / len(self.dna_sequences), 9, delta=0.3)
+        for read, origin in zip(results["dna"], results["origin"]):
+            self.assertEqual(read, self.dna_sequences[origin])
@@ -0,0 +1,199 @@
+import gzip
+import os
+import random
+import unittest
+
+from Chamaeleo.methods.default import BaseCodingAlgorithm
+from Chamaeleo.methods.ecc import Hamming, ReedSolomon
+from Chamaeleo.methods.flowed import YinYangCode
+from Chamaeleo.utils.data_handle import DNAArchive, compress_chunks, compress_from_file, decompress_chunks, \
+    decompress_from_file, iterate_dna_file, is_dna_archive, read_dna_archive, read_dna_file, write_dna_archive
+from Chamaeleo.utils.pipelines import TranscodePipeline
+
+
+class TestEncodeDecode(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(46)
+        self.folder_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated_files")
+        self.dna_sequences = [[random.choice("ACGT") for _ in range(40)] for _ in range(5)]
+
+    def write(self, file_name, lines, compressed=False):
+        path = os.path.join(self.folder_path, file_name)
+        with (gzip.open(path, "wt") if compressed else open(path, "w")) as file:
+            file.write("\n".join(lines) + "\n")
+        return path
+
+    def test_raw_and_fasta(self):
+        path = self.write("sequences.dna", ["".join(dna_sequence) for dna_sequence in self.dna_sequences])
+        self.assertEqual(read_dna_file(path, False), self.dna_sequences)
+        os.remove(path)
+
+        lines = []
+        for index, dna_sequence in enumerate(self.dna_sequences):
+            lines += [">read " + str(index), "".join(dna_sequence[:25]), "".join(dna_sequence[25:])]
+        path = self.write("sequences.fasta.gz", lines, compressed=True)
+        self.assertEqual(list(iterate_dna_file(path)), self.dna_sequences)
+        os.remove(path)
+
+    def test_fastq_quality(self):
+        lines = []
+        for index, dna_sequence in enumerate(self.dna_sequences):
+            quality = ["I"] * len(dna_sequence)
+            if index % 2 == 1:
+                quality[index] = "#"
+            lines += ["@read " + str(index), "".join(dna_sequence), "+", "".join(quality)]
+        path = self.write("sequences.fastq.gz", lines, compressed=True)
+
+        self.assertEqual(read_dna_file(path, False), self.dna_sequences)
+        self.assertEqual(read_dna_file(path, False, 20, "drop"), self.dna_sequences[0::2])
+        masked_sequences = read_dna_file(path, False, 20)
+        self.assertEqual(masked_sequences[1][1], "N")
+        self.assertEqual(masked_sequences[3][3], "N")
+        self.assertEqual(masked_sequences[0], self.dna_sequences[0])
+        with self.assertRaises(ValueError):
+            read_dna_file(path, False, 20, "trim")
+        os.remove(path)
+
+    def test_pipeline_with_erasures(self):
+        pipeline = TranscodePipeline(coding_scheme=BaseCodingAlgorithm(), error_correction=ReedSolomon(check_size=2))
+        string = "".join([chr(random.randint(65, 90)) for _ in range(200)])
+        encoded_data = pipeline.transcode(direction="t_c", input_string=string, segment_length=64, index=True,
+                                          index_length=16)
+
+        lines = []
+        for index, dna_sequence in enumerate(encoded_data["dna"]):
+            quality = ["I"] * len(dna_sequence)
+            # two low-quality bases in different bytes, which are beyond one unknown error of RS(2).
+            quality[10], quality[30] = "#", "#"
+            dna_sequence = list(dna_sequence)
+            dna_sequence[10] = "ACGT"[("ACGT".index(dna_sequence[10]) + 1) % 4]
+            dna_sequence[30] = "ACGT"[("ACGT".index(dna_sequence[30]) + 1) % 4]
+            lines += ["@read " + str(index), "".join(dna_sequence), "+", "".join(quality)]
+        path = self.write("encoded.fastq", lines)
+
+        decoded_data = pipeline.transcode(direction="t_s", input_path=path, index=True, index_length=16,
+                                          quality_threshold=20)
+        os.remove(path)
+        self.assertEqual(decoded_data["bit"], encoded_data["bit"])
+
+    def test_pipeline_without_erasures(self):
+        string = "".join([chr(random.randint(65, 90)) for _ in range(300)])
+        for coding_scheme, error_correction in [(BaseCodingAlgorithm(), None), (YinYangCode(), None),
+                                                (YinYangCode(), Hamming())]:
+            pipeline = TranscodePipeline(coding_scheme=coding_scheme, error_correction=error_correction)
+            encoded_data = pipeline.transcode(direction="t_c", input_string=string, segment_length=120, index=True,
+                                              index_length=16)
+
+            lines = []
+            for index, dna_sequence in enumerate(encoded_data["dna"]):
+                lines += ["@read " + str(index), "".join(dna_sequence), "+", "I" * len(dna_sequence)]
+            lines += ["@noise", "".join(encoded_data["dna"][0]), "+", "#" * len(encoded_data["dna"][0])]
+            path = self.write("encoded.fastq", lines)
+
+            # the low-quality reads are dropped, because the masked bases cannot be decoded as the erasures.
+            decoded_data = pipeline.transcode(direction="t_s", input_path=path, index=True, index_length=16,
+                                              quality_threshold=20)
+            self.assertEqual(decoded_data["bit"], encoded_data["bit"])
+            with self.assertRaises(ValueError):
+                pipeline.transcode(direction="t_s", input_path=path, index=True, index_length=16,
+                                   quality_threshold=20, quality_mode="mask")
+            os.remove(path)
+
+    def test_archive(self):
+        dna_sequences = self.dna_sequences + [list("ACG"), [], list("T")]
+        path = os.path.join(self.folder_path, "sequences.dna")
+        write_dna_archive(path, dna_sequences, {"bit size": 100})
+        self.assertTrue(is_dna_archive(path))
+
+        archive = DNAArchive(path)
+        self.assertEqual(len(archive.data), 5 * 10 + 1 + 0 + 1)
+        self.assertEqual(len(archive), len(dna_sequences))
+        self.assertEqual(archive[5], list("ACG"))
+        self.assertEqual(archive[6], [])
+        self.assertEqual(archive[2], dna_sequences[2])
+        with self.assertRaises(IndexError):
+            archive[len(dna_sequences)]
+        self.assertEqual(read_dna_archive(path), (dna_sequences, {"bit size": 100, "count": 8}))
+
+        with self.assertRaises(ValueError):
+            write_dna_archive(path, [list("ACNT")])
+        os.remove(path)
+
+    def test_pipeline_with_archive(self):
+        string = "".join([chr(random.randint(65, 90)) for _ in range(300)])
+        path = os.path.join(self.folder_path, "encoded.dna")
+        pipeline = TranscodePipeline(coding_scheme=YinYangCode(), error_correction=Hamming())
+        encoded_data = pipeline.transcode(direction="t_c", input_string=string, index=True, output_path=path,
+                                          output_format="archive")
+
+        # a new pipeline decodes the archive with the parameters saved in its header.
+        pipeline = TranscodePipeline(coding_scheme=YinYangCode(), error_correction=Hamming())
+        decoded_data = pipeline.transcode(direction="t_s", input_path=path, index=True)
+        os.remove(path)
+        self.assertEqual(decoded_data["bit"], encoded_data["bit"])
+
+    def test_pipeline_with_archive_rule(self):
+        string = "".join([chr(random.randint(65, 90)) for _ in range(300)])
+        path = os.path.join(self.folder_path, "encoded.dna")
+        pipeline = TranscodePipeline(coding_scheme=YinYangCode(yang_rule=[1, 0, 1, 0],
+                                                               yin_rule=[[1, 0, 0, 1], [1, 0, 0, 1],
+                                                                         [0, 1, 1, 0], [0, 1, 1, 0]]))
+        encoded_data = pipeline.transcode(direction="t_c", input_string=string, index=True, output_path=path,
+                                          output_format="archive")
+
+        # the non-default rule is restored from the header of the archive.
+        pipeline = TranscodePipeline(coding_scheme=YinYangCode())
+        decoded_data = pipeline.transcode(direction="t_s", input_path=path, index=True)
+        os.remove(path)
+        self.assertEqual(pipeline.coding_scheme.yang_rule, [1, 0, 1, 0])
+        self.assertEqual(decoded_data["bit"], encoded_data["bit"])
+
+    def test_compression(self):
+        data = bytes("".join([random.choice(["DNA ", "storage ", "code "]) for _ in range(2000)]), encoding="utf8")
+        chunks = [data[position: position + 100] for position in range(0, len(data), 100)]
+        for codec in ["gzip", "zlib", "bz2", "lzma"]:
+            compressed_data = b"".join(compress_chunks(chunks, codec))
+            self.assertLess(len(compressed_data), len(data))
+            # the output chunks are bounded by the chunk size.
+            decompressed_chunks = list(decompress_chunks([compressed_data], codec, 1000))
+            self.assertTrue(all([len(chunk) <= 1000 for chunk in decompressed_chunks]))
+            self.assertEqual(b"".join(decompressed_chunks), data)
+        with self.assertRaises(ValueError):
+            list(compress_chunks(chunks, "zip"))
+
+        path = os.path.join(self.folder_path, "data.txt")
+        with open(path, "wb") as file:
+            file.write(data)
+        compressed_path = compress_from_file(path, 1000)
+        os.remove(path)
+        with gzip.open(compressed_path, "rb") as file:
+            self.assertEqual(file.read(), data)
+        self.assertEqual(decompress_from_file(compressed_path, 1000), path)
+        with open(path, "rb") as file:
+            self.assertEqual(file.read(), data)
+        os.remove(path)
+        os.remove(compressed_path)
+
+    def test_pipeline_with_compression(self):
+        data = bytes("".join([random.choice(["DNA ", "storage ", "code "]) for _ in range(2000)]), encoding="utf8")
+        input_path = os.path.join(self.folder_path, "data.txt")
+        with open(input_path, "wb") as file:
+            file.write(data)
+        path = os.path.join(self.folder_path, "encoded.dna")
+        output_path = os.path.join(self.folder_path, "decoded.txt")
+
+        pipeline = TranscodePipeline(coding_scheme=BaseCodingAlgorithm(), error_correction=Hamming())
+        encoded_data = pipeline.transcode(direction="t_c", input_path=input_path, segment_length=120, index=True,
+                                          index_length=16, output_path=path, output_format="archive",
+                                          compression="lzma", chunk_size=1000)
+        self.assertEqual(pipeline.records["compression"], "lzma")
+        self.assertLess(len(encoded_data["dna"]) * 120, len(data) * 8)
+
+        # the codec is restored from the header of the archive.
+        pipeline = TranscodePipeline(coding_scheme=BaseCodingAlgorithm(), error_correction=Hamming())
+        pipeline.transcode(direction="t_s", input_path=path, index=True, output_path=output_path, chunk_size=1000)
+        with open(output_path, "rb") as file:
+            self.assertEqual(file.read(), data)
+        for remove_path in [input_path, path, path + ".index.npz", output_path]:
+            os.remove(remove_path)
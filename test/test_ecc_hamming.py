@@ -44,3 +44,26 @@ class TestEncodeDecode(unittest.TestCase):
             results.append(output_list == real_list)
 
         self.assertEqual(results, [True, True])
+
+    def test_batch_consistency(self):
+        verified_bit_segments = [self.tool.insert_one(list(bit_segment)) for bit_segment in self.test_binaries]
+        self.assertEqual(self.tool.insert_batch(self.test_binaries), verified_bit_segments)
+
+        change_matrix = copy.deepcopy(self.test_real_verify_matrix)
+        for row, change_count in enumerate([0, 1, 2]):
+            for change_index in random.sample(range(len(change_matrix[row])), change_count):
+                change_matrix[row][change_index] = 1 - change_matrix[row][change_index]
+
+        outputs = [self.tool.remove_one(list(bit_segment)) for bit_segment in change_matrix]
+        batch_output = self.tool.remove_batch(change_matrix)
+        self.assertEqual(batch_output["data"], [output["data"] for output in outputs])
+        self.assertEqual(batch_output["type"], [output["type"] for output in outputs])
+
+    def test_parallel_matrix(self):
+        tool = Hamming(processes=2)
+        output_matrix, _ = tool.insert(copy.deepcopy(self.test_binaries))
+        self.assertEqual(output_matrix, self.test_real_verify_matrix)
+
+        change_matrix = copy.deepcopy(self.test_real_verify_matrix)
+        change_matrix[1][5] = 1 - change_matrix[1][5]
+        self.assertEqual(tool.remove(copy.deepcopy(change_matrix)), self.tool.remove(copy.deepcopy(change_matrix)))
@@ -0,0 +1,44 @@
+import random
+import unittest
+
+from Chamaeleo.methods.ecc import OuterReedSolomon
+from Chamaeleo.methods.fixed import Church
+from Chamaeleo.utils.pipelines import TranscodePipeline
+
+
+class TestEncodeDecode(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(33)
+        self.test_binaries = [[random.randint(0, 1) for _ in range(64)] for _ in range(45)]
+        self.tool = OuterReedSolomon(block_size=10, check_size=3)
+
+    def test_recover_missing_segments(self):
+        bit_segments, parity_count = self.tool.insert(self.test_binaries)
+        self.assertEqual(parity_count, 15)
+        self.assertEqual(bit_segments[:45], self.test_binaries)
+
+        missing_indices = [0, 4, 9, 50, 23, 31, 57, 58]
+        for index in missing_indices:
+            bit_segments[index] = [0] * 64
+
+        results = self.tool.remove(bit_segments[:58], missing_indices)
+        self.assertEqual(results["bit"], self.test_binaries)
+        self.assertEqual(results["e_i"], [])
+
+    def test_unrecoverable_block(self):
+        bit_segments, _ = self.tool.insert(self.test_binaries)
+        missing_indices = [10, 11, 12, 13]
+        results = self.tool.remove(bit_segments, missing_indices)
+        self.assertEqual(results["e_i"], missing_indices)
+        self.assertEqual(results["bit"][:10], self.test_binaries[:10])
+
+    def test_pipeline_with_lost_sequences(self):
+        pipeline = TranscodePipeline(coding_scheme=Church(), outer_correction=OuterReedSolomon(block_size=8))
+        string = "".join([chr(random.randint(65, 90)) for _ in range(300)])
+        dna_sequences = pipeline.transcode(direction="t_c", input_string=string, segment_length=64,
+                                           index=True)["dna"]
+        del dna_sequences[5], dna_sequences[2]
+        bit_segments = pipeline.transcode(direction="t_s", input_string=dna_sequences, index=True)["bit"]
+        self.assertEqual(bit_segments, pipeline.transcode(direction="t_c", input_string=string, segment_length=64,
+                                                          index=True)["bit"])
@@ -2,6 +2,8 @@ import copy
 import random
 import unittest
 
+import numpy
+
 from Chamaeleo.methods.ecc import ReedSolomon
 
 
@@ -53,3 +55,23 @@ class TestEncodeDecode(unittest.TestCase):
             results.append(output_list == real_list)
 
         self.assertEqual(results, [True, True])
+
+    def test_batch_matrix(self):
+        output_matrix = self.tool.insert_batch(numpy.array(self.test_binaries))
+        self.assertEqual(output_matrix, self.test_real_verify_matrix)
+
+        change_matrix = copy.deepcopy(self.test_real_verify_matrix)
+        change_matrix[0][3] = 1 - change_matrix[0][3]
+        output = self.tool.remove_batch(numpy.array(change_matrix))
+        self.assertEqual(output["data"], self.test_binaries)
+        self.assertEqual(output["type"], [True, True, True])
+
+    def test_erasure_matrix(self):
+        change_matrix = copy.deepcopy(self.test_real_verify_matrix)
+        for change_index in [1, 42]:
+            change_matrix[0][change_index] = 1 - change_matrix[0][change_index]
+
+        self.assertFalse(self.tool.remove_one(copy.deepcopy(change_matrix[0]))["type"])
+
+        output = self.tool.remove_one(copy.deepcopy(change_matrix[0]), erasures=[0, 1, 2, 40, 42])
+        self.assertEqual(output, {"data": self.test_binaries[0], "type": True})
@@ -0,0 +1,37 @@
+import os
+import unittest
+
+from Chamaeleo.utils.features import FeatureStatistics
+
+
+class TestEncodeDecode(unittest.TestCase):
+
+    def setUp(self):
+        self.dna_sequences = ["AAAACG", "ACGTAC", "GGGCCC", "TTTTTTTT", "ACGTTTAC"]
+
+    def test_statistics(self):
+        statistics = FeatureStatistics()
+        statistics.update(self.dna_sequences)
+
+        gc_distribution = statistics.gc_distribution()
+        self.assertEqual(sum(gc_distribution), 5)
+        self.assertEqual([gc_distribution[0], gc_distribution[33], gc_distribution[38],
+                          gc_distribution[50], gc_distribution[100]], [1, 1, 1, 1, 1])
+        self.assertEqual(statistics.homopolymer_distribution(), [0, 1, 0, 2, 1, 0, 0, 0, 1])
+        self.assertEqual(statistics.composition[0].tolist(), [3, 0, 1, 1])
+        self.assertEqual(statistics.composition[7].tolist(), [0, 1, 0, 1])
+
+    def test_streaming_file(self):
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated_files", "features.dna")
+        with open(path, "w") as file:
+            for dna_sequence in self.dna_sequences:
+                file.write(dna_sequence + "\n")
+
+        statistics, streaming_statistics = FeatureStatistics(), FeatureStatistics()
+        statistics.update(self.dna_sequences)
+        streaming_statistics.update_file(path, batch_size=2)
+        os.remove(path)
+
+        self.assertEqual(streaming_statistics.gc_distribution(), statistics.gc_distribution())
+        self.assertEqual(streaming_statistics.homopolymer_distribution(), statistics.homopolymer_distribution())
+        self.assertEqual(streaming_statistics.composition.tolist(), statistics.composition.tolist())
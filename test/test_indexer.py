@@ -26,3 +26,9 @@ class TestEncodeDecode(unittest.TestCase):
         indices, temp_matrix = divide_all(shuffle_i_matrix)
         restore_matrix = sort_order(indices, temp_matrix)
         self.assertEqual(restore_matrix, self.test_o_matrix)
+
+    def test_vote_indices(self):
+        indices = [0, 1, 1, 0, 1]
+        bit_segments = [[0, 0], [1, 0], [1, 1], [0, 1], [1, 1]]
+        self.assertEqual(sort_order(indices, bit_segments), [[0, 0], [1, 0]])
+        self.assertEqual(sort_order(indices, bit_segments, counts=[2, 1, 1, 3, 1]), [[0, 1], [1, 1]])
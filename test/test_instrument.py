@@ -0,0 +1,52 @@
+import cProfile
+import csv
+import json
+import os
+import random
+import unittest
+
+from Chamaeleo.methods.ecc import Hamming
+from Chamaeleo.methods.flowed import YinYangCode
+from Chamaeleo.utils.instrument import Instrument, profiler_hook
+from Chamaeleo.utils.pipelines import TranscodePipeline
+
+
+class TestEncodeDecode(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(37)
+        self.profiler = cProfile.Profile()
+        self.instrument = Instrument(hooks=[profiler_hook(self.profiler, stages=["encode"])])
+        self.pipeline = TranscodePipeline(coding_scheme=YinYangCode(), error_correction=Hamming(),
+                                          instrument=self.instrument)
+        self.string = "".join([chr(random.randint(65, 90)) for _ in range(600)])
+
+    def test_stage_records(self):
+        dna_sequences = self.pipeline.transcode(direction="t_c", input_string=self.string, index=True)["dna"]
+        self.pipeline.transcode(direction="t_s", input_string=dna_sequences, index=True, output_string=True)
+
+        stages = [record["stage"] for record in self.instrument.records]
+        self.assertEqual(stages, ["read", "index", "error correction", "encode",
+                                  "read", "decode", "error correction", "index", "write"])
+        encode_record = self.instrument.records[3]
+        self.assertEqual(encode_record["segments"], len(dna_sequences))
+        self.assertEqual(encode_record["nucleotides"], sum([len(dna_sequence) for dna_sequence in dna_sequences]))
+        self.assertGreaterEqual(encode_record["screening checks"], len(dna_sequences))
+        self.assertEqual(self.instrument.records[0]["bytes"], 600)
+        self.assertGreater(len(self.profiler.getstats()), 0)
+
+        # the peak memory of the process never decreases (it is None without the module "resource").
+        peaks = [record["process peak memory"] for record in self.instrument.records]
+        if None not in peaks:
+            self.assertEqual(peaks, sorted(peaks))
+
+    def test_output_records(self):
+        self.pipeline.transcode(direction="t_c", input_string=self.string, index=True)
+        self.assertEqual(json.loads(self.instrument.output_records(type="json")), self.instrument.records)
+
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated_files", "instrument.csv")
+        self.instrument.output_records(type="csv", path=path)
+        with open(path, "r", encoding="utf-8") as file:
+            rows = list(csv.DictReader(file))
+        os.remove(path)
+        self.assertEqual([row["stage"] for row in rows], ["read", "index", "error correction", "encode"])
@@ -0,0 +1,26 @@
+import io
+import unittest
+
+from Chamaeleo.utils.monitor import Monitor
+
+
+class TestEncodeDecode(unittest.TestCase):
+
+    def test_rate_limited_output(self):
+        stream = io.StringIO()
+        monitor = Monitor(stream=stream, interval=0, step=10)
+        for state in range(1, 1001):
+            monitor.output(state, 1000)
+        self.assertEqual(stream.getvalue().count("\r"), 11)
+        self.assertTrue(stream.getvalue().endswith("|████████████████████|100% (1000/1000) used 0000:00:00.\n"))
+
+    def test_disabled_output(self):
+        stream = io.StringIO()
+        monitor = Monitor(stream=stream, enable=False)
+        for state in range(1, 101):
+            monitor.output(state, 100)
+        self.assertEqual(stream.getvalue(), "")
+
+    def test_wrong_setting(self):
+        with self.assertRaises(ValueError):
+            Monitor(color=True)
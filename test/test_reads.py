@@ -0,0 +1,72 @@
+import random
+import unittest
+
+from Chamaeleo.methods.default import BaseCodingAlgorithm
+from Chamaeleo.utils.channel import ChannelSimulator
+from Chamaeleo.utils.pipelines import TranscodePipeline
+from Chamaeleo.utils.reads import ReadClustering, align, collapse, pack
+
+
+class TestEncodeDecode(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(44)
+        self.string = "".join([chr(random.randint(65, 90)) for _ in range(300)])
+
+    def test_pack(self):
+        self.assertEqual(pack("ACGT"), int("10123", 4))
+        self.assertNotEqual(pack("AACGT"), pack("ACGT"))
+        self.assertEqual(pack(["A", "N", "T"]), "ANT")
+
+    def test_collapse(self):
+        dna_sequences = [list("ACGT"), list("TTAC"), list("ACGT"), list("ACNT"), list("ACGT"), list("ACNT")]
+        unique_sequences, counts = collapse(dna_sequences)
+        self.assertEqual(unique_sequences, [list("ACGT"), list("TTAC"), list("ACNT")])
+        self.assertEqual(counts, [3, 1, 2])
+
+    def test_pipeline_with_copies(self):
+        pipeline = TranscodePipeline(coding_scheme=BaseCodingAlgorithm())
+        encoded_data = pipeline.transcode(direction="t_c", input_string=self.string, segment_length=64,
+                                          index=True, index_length=16)
+
+        reads = []
+        for dna_sequence in encoded_data["dna"]:
+            # a mutated copy (outside the index) comes first, followed by the correct copies.
+            mutated_sequence = list(dna_sequence)
+            mutated_sequence[-1] = random.choice([nucleotide for nucleotide in "ACGT"
+                                                  if nucleotide != dna_sequence[-1]])
+            reads += [mutated_sequence] + [list(dna_sequence) for _ in range(random.randint(2, 6))]
+
+        decoded_data = pipeline.transcode(direction="t_s", input_string=reads, index=True, index_length=16,
+                                          collapse=True)
+        self.assertEqual(pipeline.records["unique sequences"], 2 * len(encoded_data["dna"]))
+        self.assertEqual(decoded_data["bit"], encoded_data["bit"])
+        self.assertEqual(len(decoded_data["dna"]), len(reads))
+
+    def test_align(self):
+        self.assertEqual(align("ACGTACGT", "ACGTACGT", 2), list(range(8)))
+        self.assertEqual(align("ACGACGT", "ACGTACGT", 2), [0, 1, 2, 4, 5, 6, 7])
+        self.assertEqual(align("ACGTTACGT", "ACGTACGT", 2), [0, 1, 2, 3, None, 4, 5, 6, 7])
+        self.assertIsNone(align("AAAATTTT", "TTTTAAAA", 2))
+        # a deletion and an insertion (2 edits) instead of 3 substitutions at the same length.
+        self.assertEqual(align("ACAGTGG", "ACATGCG", 3, 3), [0, 1, 2, None, 3, 4, 6])
+        self.assertEqual(align("ACGAACGT", "ACGTACGT", 2), list(range(8)))
+
+    def test_consensus(self):
+        dna_sequences = [list("ACGTTGCAACGT"), list("ACGTGCAACGT"), list("ACGTTGCAACGAT"), list("ACCTTGCAACGT"),
+                         list("TGCATGCAAGGC"), list("TGCATGCAAGGC")]
+        results = ReadClustering(error_rate=0.2, kmer_length=3, window_size=2).consensus(dna_sequences)
+        self.assertEqual(results["dna"], [list("ACGTTGCAACGT"), list("TGCATGCAAGGC")])
+        self.assertEqual(results["counts"], [4, 2])
+
+    def test_pipeline_with_noisy_reads(self):
+        pipeline = TranscodePipeline(coding_scheme=BaseCodingAlgorithm(), clustering=ReadClustering(min_size=3))
+        encoded_data = pipeline.transcode(direction="t_c", input_string=self.string, segment_length=64,
+                                          index=True, index_length=16)
+        channel = ChannelSimulator(substitution_rate=0.01, insertion_rate=0.005, deletion_rate=0.005, coverage=15,
+                                   seed=45)
+        reads = channel.simulate(encoded_data["dna"])["dna"]
+
+        decoded_data = pipeline.transcode(direction="t_s", input_string=reads, index=True, index_length=16)
+        self.assertGreaterEqual(pipeline.records["cluster count"], len(encoded_data["dna"]))
+        self.assertEqual(decoded_data["bit"], encoded_data["bit"])
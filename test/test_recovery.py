@@ -0,0 +1,34 @@
+import random
+import unittest
+
+from Chamaeleo.utils import recovery
+
+
+class TestEncodeDecode(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(41)
+        self.original_bit_segments = [[random.randint(0, 1) for _ in range(40)] for _ in range(6)]
+
+    def test_ordered_scoring(self):
+        decoded_bit_segments = [list(bit_segment) for bit_segment in self.original_bit_segments[:5]]
+        decoded_bit_segments[1][3] ^= 1
+        decoded_bit_segments[1][7] ^= 1
+        decoded_bit_segments[2] = [0] * 40
+        decoded_bit_segments[3] = decoded_bit_segments[3][:30]
+
+        scores = recovery.score_recovery(self.original_bit_segments, decoded_bit_segments)
+        self.assertEqual(scores["status"].tolist(), [recovery.recovered, recovery.corrupted, recovery.missing,
+                                                     recovery.corrupted, recovery.recovered, recovery.missing])
+        self.assertEqual(scores["bit errors"].tolist()[:2], [0, 2])
+        self.assertGreaterEqual(scores["bit errors"][3], 10)
+        self.assertEqual([scores["recovered count"], scores["missing count"], scores["corrupted count"]], [2, 2, 2])
+
+    def test_unordered_scoring(self):
+        decoded_bit_segments = [list(bit_segment) for bit_segment in self.original_bit_segments[::-1][:4]]
+        decoded_bit_segments[0][0] ^= 1
+
+        scores = recovery.score_recovery(self.original_bit_segments, decoded_bit_segments, ordered=False)
+        self.assertEqual(scores["status"].tolist(), [recovery.missing, recovery.missing, recovery.recovered,
+                                                     recovery.recovered, recovery.recovered, recovery.missing])
+        self.assertEqual(scores["unmatched count"], 1)
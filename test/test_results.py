@@ -0,0 +1,73 @@
+import io
+import os
+import random
+import unittest
+from contextlib import redirect_stdout
+
+from Chamaeleo.methods.default import BaseCodingAlgorithm
+from Chamaeleo.methods.fixed import Church
+from Chamaeleo.utils.pipelines import BasicFeaturePipeline, RobustnessPipeline, OptimalChoicePipeline
+from Chamaeleo.utils.results import ResultStore
+
+
+class TestEncodeDecode(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(43)
+        self.file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated_files", "results.txt")
+        with open(self.file_path, "w", encoding="utf-8") as file:
+            file.write("".join([chr(random.randint(65, 90)) for _ in range(600)]))
+        self.coding_schemes = {"Base": BaseCodingAlgorithm(), "Church et al.": Church()}
+
+    def tearDown(self):
+        os.remove(self.file_path)
+
+    def test_append_and_query(self):
+        store = ResultStore(":memory:")
+        run = store.create_run("feature")
+        store.append_features(run, "task 0", "Base", "text", [0] * 40 + [3, 5] + [0] * 59, [0, 2, 1])
+        gc_histograms, homo_histograms = store.histograms("gc"), store.histograms("homopolymer")
+        self.assertEqual(len(gc_histograms), 1)
+        self.assertEqual(gc_histograms[0][0], "Base")
+        self.assertEqual(len(gc_histograms[0][1]), 101)
+        self.assertEqual(gc_histograms[0][1][40: 42].tolist(), [3, 5])
+        self.assertEqual(homo_histograms[0][1].tolist(), [0, 2, 1])
+
+        store.append_records("rules", store.create_run("rule selection"),
+                             [{"rule index": 3, "additional count": 1, "gc bias": 0.5}])
+        self.assertEqual(store.query("SELECT run, rule_index, gc_bias FROM rules"), [(2, 3, 0.5)])
+        with self.assertRaises(ValueError):
+            store.append("runs", [{}])
+        store.close()
+
+    def test_pipelines(self):
+        store = ResultStore(":memory:")
+        BasicFeaturePipeline(coding_schemes=self.coding_schemes, needed_indices=[True, True],
+                             file_paths={"text": self.file_path}, index_length=16, store=store).calculate()
+        RobustnessPipeline(coding_schemes=self.coding_schemes, error_corrections={"None": None},
+                           needed_indices=[True, True], file_paths={"text": self.file_path},
+                           nucleotide_mutation=0.0, sequence_loss=0.0, iterations=2,
+                           index_length=16, seed=43, store=store).evaluate()
+
+        self.assertEqual(len(store.histograms("gc", "Church et al.")), 1)
+        rows = store.query("SELECT coding_scheme, success_count, total_count FROM robustness ORDER BY coding_scheme")
+        self.assertEqual(len(rows), 4)
+        for _, success_count, total_count in rows:
+            self.assertEqual(success_count, total_count)
+
+        OptimalChoicePipeline(coding_schemes=self.coding_schemes, store=store).calculate_best()
+        with self.assertRaises(ValueError):
+            OptimalChoicePipeline(coding_schemes=self.coding_schemes, store="results.db")
+        store.close()
+
+    def test_single_gc_bin(self):
+        # all the sequences have the same GC content, the lowest and the highest bins are the same one.
+        store = ResultStore(":memory:")
+        store.append_features(store.create_run("feature"), "task 0", "Base", "text", [0] * 45 + [8] + [0] * 55, [0, 8])
+        store.append("robustness", [{"run": 2, "coding_scheme": "Base", "information_density": 2.0,
+                                     "success_count": 8, "total_count": 8}])
+        output = io.StringIO()
+        with redirect_stdout(output):
+            OptimalChoicePipeline(coding_schemes=self.coding_schemes, store=store).calculate_best()
+        self.assertIn("6%", output.getvalue())
+        store.close()
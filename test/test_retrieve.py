@@ -0,0 +1,139 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from Chamaeleo.methods.default import BaseCodingAlgorithm
+from Chamaeleo.methods.ecc import Hamming
+from Chamaeleo.methods.flowed import YinYangCode
+from Chamaeleo.utils.data_handle import read_index_sidecar
+from Chamaeleo.utils.pipelines import TranscodePipeline
+
+
+class TestEncodeDecode(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(48)
+        self.string = "".join([chr(random.randint(65, 90)) for _ in range(500)])
+        self.path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated_files", "retrieve.dna")
+        self.ranges = [(0, 7), (13, 150), (299, 300), (480, 600)]
+
+    def tearDown(self):
+        for path in [self.path, self.path + ".index.npz"]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_sidecar_of_transcoding(self):
+        pipeline = TranscodePipeline(coding_scheme=BaseCodingAlgorithm())
+        pipeline.transcode(direction="t_c", input_string=self.string, segment_length=64, index=True,
+                           output_path=self.path)
+        self.assertTrue(os.path.exists(self.path + ".index.npz"))
+
+        for start, stop in self.ranges:
+            self.assertEqual(pipeline.retrieve(input_path=self.path, start=start, stop=stop),
+                             self.string.encode()[start: stop])
+        self.assertEqual(pipeline.retrieve(input_path=self.path, start=600, stop=700), b"")
+
+        # the file rewritten with the same size is detected by its modification time.
+        status = os.stat(self.path)
+        os.utime(self.path, ns=(status.st_atime_ns, status.st_mtime_ns + 10 ** 9))
+        self.assertIsNone(read_index_sidecar(self.path))
+
+        # the re-encoding without the sidecar removes the outdated one.
+        pipeline = TranscodePipeline(coding_scheme=YinYangCode())
+        pipeline.transcode(direction="t_c", input_string=self.string, segment_length=120, index=True,
+                           output_path=self.path)
+        self.assertFalse(os.path.exists(self.path + ".index.npz"))
+
+    def test_scanned_sidecar_of_archive(self):
+        pipeline = TranscodePipeline(coding_scheme=YinYangCode(), error_correction=Hamming())
+        pipeline.transcode(direction="t_c", input_string=self.string, segment_length=120, index=True,
+                           output_path=self.path, output_format="archive")
+        self.assertFalse(os.path.exists(self.path + ".index.npz"))
+
+        pipeline = TranscodePipeline(coding_scheme=YinYangCode(), error_correction=Hamming())
+        for start, stop in self.ranges:
+            self.assertEqual(pipeline.retrieve(input_path=self.path, start=start, stop=stop),
+                             self.string.encode()[start: stop])
+        self.assertTrue(os.path.exists(self.path + ".index.npz"))
+
+        with self.assertRaises(ValueError):
+            pipeline.retrieve(input_path=self.path, start=0)
+
+    def test_multiple_files(self):
+        folder_path = tempfile.mkdtemp()
+        contents = {"empty.txt": b"", "short.txt": b"DNA", "long.txt": self.string.encode()}
+        input_paths = {}
+        for name, content in contents.items():
+            input_paths[name] = os.path.join(folder_path, "input_" + name)
+            with open(input_paths[name], "wb") as file:
+                file.write(content)
+
+        pipeline = TranscodePipeline(coding_scheme=BaseCodingAlgorithm())
+        pipeline.transcode(direction="t_c", input_paths=input_paths, segment_length=64, index=True, index_length=16,
+                           output_path=self.path, output_format="archive")
+        self.assertEqual([(entry["name"], entry["start"], entry["stop"]) for entry in pipeline.records["manifest"]],
+                         [("empty.txt", 0, 0), ("short.txt", 0, 1), ("long.txt", 1, 64)])
+
+        pipeline = TranscodePipeline(coding_scheme=BaseCodingAlgorithm())
+        pipeline.transcode(direction="t_s", input_path=self.path, index=True, output_directory=folder_path)
+        for name, content in contents.items():
+            with open(os.path.join(folder_path, name), "rb") as file:
+                self.assertEqual(file.read(), content)
+
+        pipeline = TranscodePipeline(coding_scheme=BaseCodingAlgorithm())
+        self.assertEqual(pipeline.extract(input_path=self.path, name="long.txt"), contents["long.txt"])
+        self.assertEqual(pipeline.extract(input_path=self.path, name="short.txt"), contents["short.txt"])
+        with self.assertRaises(ValueError):
+            pipeline.extract(input_path=self.path, name="missing.txt")
+
+        # the names are written in the folder, so the paths are rejected.
+        output_directory = os.path.join(folder_path, "output")
+        os.mkdir(output_directory)
+        with self.assertRaises(ValueError):
+            pipeline.transcode(direction="t_c", input_paths={"../escape.txt": input_paths["short.txt"]},
+                               segment_length=64, index=True, index_length=16)
+        for name in ["../escape.txt", os.path.join(folder_path, "escape.txt"), ".."]:
+            with self.assertRaises(ValueError):
+                pipeline.transcode(direction="t_s", input_path=self.path, index=True, output_directory=output_directory,
+                                   manifest=[{"name": name, "size": 3, "start": 0, "stop": 1}])
+        self.assertFalse(os.path.exists(os.path.join(folder_path, "escape.txt")))
+        shutil.rmtree(folder_path)
+
+    def test_compressed_archive(self):
+        pipeline = TranscodePipeline(coding_scheme=BaseCodingAlgorithm())
+        pipeline.transcode(direction="t_c", input_string=self.string, segment_length=64, index=True, index_length=16,
+                           output_path=self.path, output_format="archive", compression="gzip")
+
+        # the byte range of the original data is not located in the compressed data.
+        pipeline = TranscodePipeline(coding_scheme=BaseCodingAlgorithm())
+        with self.assertRaises(ValueError):
+            pipeline.retrieve(input_path=self.path, start=0, stop=20)
+
+    def test_compressed_multiple_files(self):
+        folder_path = tempfile.mkdtemp()
+        contents = {"empty.txt": b"", "short.txt": b"DNA", "long.txt": (self.string * 4).encode()}
+        input_paths = {}
+        for name, content in contents.items():
+            input_paths[name] = os.path.join(folder_path, "input_" + name)
+            with open(input_paths[name], "wb") as file:
+                file.write(content)
+
+        pipeline = TranscodePipeline(coding_scheme=BaseCodingAlgorithm())
+        pipeline.transcode(direction="t_c", input_paths=input_paths, segment_length=64, index=True, index_length=16,
+                           output_path=self.path, output_format="archive", compression="bz2")
+        self.assertEqual([entry["original size"] for entry in pipeline.records["manifest"]],
+                         [len(content) for content in contents.values()])
+        self.assertLess(pipeline.records["compression ratio"], 1)
+
+        pipeline = TranscodePipeline(coding_scheme=BaseCodingAlgorithm())
+        pipeline.transcode(direction="t_s", input_path=self.path, index=True, output_directory=folder_path)
+        for name, content in contents.items():
+            with open(os.path.join(folder_path, name), "rb") as file:
+                self.assertEqual(file.read(), content)
+
+        pipeline = TranscodePipeline(coding_scheme=BaseCodingAlgorithm())
+        for name, content in contents.items():
+            self.assertEqual(pipeline.extract(input_path=self.path, name=name), content)
+        shutil.rmtree(folder_path)
@@ -0,0 +1,71 @@
+import os
+import random
+import unittest
+
+from Chamaeleo.methods.default import BaseCodingAlgorithm
+from Chamaeleo.methods.ecc import Hamming, ReedSolomon
+from Chamaeleo.methods.fixed import Church
+from Chamaeleo.methods.flowed import YinYangCode
+from Chamaeleo.utils.channel import ChannelSimulator
+from Chamaeleo.utils.pipelines import RobustnessPipeline
+
+
+class TestEncodeDecode(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(39)
+        self.file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated_files", "robustness.txt")
+        with open(self.file_path, "w", encoding="utf-8") as file:
+            file.write("".join([chr(random.randint(65, 90)) for _ in range(1200)]))
+
+    def tearDown(self):
+        os.remove(self.file_path)
+
+    def evaluate(self, processes, channel=None):
+        pipeline = RobustnessPipeline(coding_schemes={"Base": BaseCodingAlgorithm(), "Church et al.": Church()},
+                                      error_corrections={"None": None, "Hamming": Hamming()},
+                                      needed_indices=[True, True], file_paths={"text": self.file_path},
+                                      nucleotide_mutation=0.05, sequence_loss=0.01, iterations=3,
+                                      index_length=16, processes=processes, seed=39, channel=channel)
+        pipeline.evaluate()
+        return pipeline.records["results"]
+
+    def test_parallel_evaluation(self):
+        results = self.evaluate(1)
+        self.assertEqual(list(results.keys()), ["task 0", "task 1", "task 2", "task 3"])
+        for data in results.values():
+            self.assertEqual(len(data["result"]), 3)
+            for iter_log in data["result"]:
+                self.assertIn(iter_log["transcoding state"], [True, False])
+                self.assertLessEqual(iter_log["success count"], iter_log["total count"])
+
+        parallel_results = self.evaluate(2)
+        for task_id, data in results.items():
+            for iter_log, parallel_iter_log in zip(data["result"], parallel_results[task_id]["result"]):
+                for key in ["error rate", "error indices", "success count", "success rate"]:
+                    self.assertEqual(iter_log[key], parallel_iter_log[key])
+
+    def test_channel(self):
+        channel = ChannelSimulator(substitution_rate=0.002, dropout=0.05)
+        results = self.evaluate(1, channel)
+        parallel_results = self.evaluate(2, channel)
+        for task_id, data in results.items():
+            for iter_log, parallel_iter_log in zip(data["result"], parallel_results[task_id]["result"]):
+                self.assertEqual(iter_log["success count"], parallel_iter_log["success count"])
+                self.assertLess(iter_log["success count"], iter_log["total count"])
+
+    def test_without_errors(self):
+        # the files with different sizes make the encoding states (such as the index length) different.
+        other_path = os.path.join(os.path.dirname(self.file_path), "robustness_other.txt")
+        with open(other_path, "w", encoding="utf-8") as file:
+            file.write("".join([chr(random.randint(65, 90)) for _ in range(3000)]))
+        self.addCleanup(os.remove, other_path)
+        pipeline = RobustnessPipeline(coding_schemes={"Base": BaseCodingAlgorithm(), "YYC": YinYangCode()},
+                                      error_corrections={"None": None, "Hamming": Hamming(), "RS": ReedSolomon()},
+                                      needed_indices=[True, True],
+                                      file_paths={"text": self.file_path, "other text": other_path},
+                                      index_length=16, processes=2, seed=39)
+        pipeline.evaluate()
+        self.assertEqual(len(pipeline.records["results"]), 12)
+        for data in pipeline.records["results"].values():
+            self.assertTrue(data["result"][0]["transcoding state"])
@@ -0,0 +1,47 @@
+import os
+import unittest
+
+from Chamaeleo.methods.flowed import YinYangCode
+from Chamaeleo.utils.pipelines import RuleSelectionPipeline
+
+
+class TestEncodeDecode(unittest.TestCase):
+
+    def setUp(self):
+        self.file_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                      "data", "pictures", "Mona Lisa.jpg")
+
+    def search(self, processes):
+        pipeline = RuleSelectionPipeline(coding_scheme=YinYangCode(), file_path=self.file_path,
+                                         rule_indices=list(range(0, 6144, 512)), sample_count=200,
+                                         processes=processes)
+        return pipeline.search(), pipeline.records["results"]
+
+    def test_ranking(self):
+        best_choice, results = self.search(1)
+        self.assertEqual(len(results), 12)
+        self.assertEqual(best_choice["index"], results[0]["rule index"])
+
+        keys = [(result["additional count"], result["mean gc bias"], result["homopolymer limit count"],
+                 result["rule index"]) for result in results]
+        self.assertEqual(keys, sorted(keys))
+
+    def test_determinism(self):
+        best_choice, results = self.search(1)
+        parallel_best_choice, parallel_results = self.search(2)
+        self.assertEqual(best_choice, parallel_best_choice)
+        self.assertEqual([result["rule index"] for result in results],
+                         [result["rule index"] for result in parallel_results])
+
+    def test_failed_rules(self):
+        # with 500 sampled segments, the rules 0 and 512 cannot encode some segments under the screening.
+        pipeline = RuleSelectionPipeline(coding_scheme=YinYangCode(), file_path=self.file_path,
+                                         rule_indices=[0, 192, 512, 1728], sample_count=500)
+        self.assertEqual(pipeline.search()["index"], 1728)
+        self.assertEqual([result["rule index"] for result in pipeline.records["results"]], [1728, 192, 0, 512])
+        self.assertIsNone(pipeline.records["results"][-1]["additional count"])
+
+        pipeline = RuleSelectionPipeline(coding_scheme=YinYangCode(), file_path=self.file_path,
+                                         rule_indices=[0, 512], sample_count=500)
+        with self.assertRaises(ValueError):
+            pipeline.search()
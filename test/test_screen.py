@@ -1,8 +1,9 @@
 import random
 import unittest
 
-from Chamaeleo.methods.inherent import index_base
+from Chamaeleo.methods.inherent import index_base, to_nucleotide_codes
 from Chamaeleo.utils import screen
+from Chamaeleo.utils.screen import Constraint
 
 
 class TestEncodeDecode(unittest.TestCase):
@@ -133,4 +134,27 @@ class TestEncodeDecode(unittest.TestCase):
                 True,
                 False
             ]
-        )
\ No newline at end of file
+        )
+
+    def test_batch_check(self):
+        nucleotide_codes = to_nucleotide_codes(self.sequences)
+        for max_homopolymer, max_content in [(self.max_homopolymer, None), (None, self.max_content),
+                                             (self.max_homopolymer, self.max_content), (1, 0.5)]:
+            results = [screen.check(sequence, max_homopolymer, max_content) for sequence in self.sequences]
+            self.assertEqual(screen.batch_check(nucleotide_codes, max_homopolymer, max_content).tolist(), results)
+
+    def test_homopolymer_lengths(self):
+        nucleotide_codes = to_nucleotide_codes(["AAAAAA", "ACGTAC", "ACCGGG", "TTGTTT"])
+        self.assertEqual(screen.homopolymer_lengths(nucleotide_codes).tolist(), [6, 1, 3, 3])
+
+    def test_constraint(self):
+        constraint = Constraint(max_homopolymer=self.max_homopolymer, window_size=8, window_content=0.75,
+                                motifs=["GAATTC", "ACG"])
+        results = []
+        for sequence in self.sequences:
+            windows = [sequence[index: index + 8] for index in range(len(sequence) - 7)]
+            results.append(screen.homopolymer(sequence, self.max_homopolymer)
+                           and "GAATTC" not in sequence and "ACG" not in sequence
+                           and all(0.25 <= (window.count("C") + window.count("G")) / 8 <= 0.75 for window in windows))
+        self.assertEqual([constraint.check(sequence) for sequence in self.sequences], results)
+        self.assertEqual(constraint.batch_check(to_nucleotide_codes(self.sequences)).tolist(), results)
\ No newline at end of file
@@ -2,6 +2,7 @@ import random
 import unittest
 
 from Chamaeleo.methods.fixed import Church
+from Chamaeleo.utils.screen import Constraint
 
 
 class TestEncodeDecode(unittest.TestCase):
@@ -86,4 +87,15 @@ class TestEncodeDecode(unittest.TestCase):
              'G', 'A', 'G', 'G', 'C', 'A', 'A', 'T', 'C', 'G', 'G', 'T', 'G']
         ]).get("bit")
 
-        self.assertEqual(bit_segments, self.test_list)
\ No newline at end of file
+        self.assertEqual(bit_segments, self.test_list)
+
+    def test_constraint(self):
+        constraint = Constraint(window_size=20, window_content=0.7, motifs=["GAATTC", "GGATCC"])
+        tool = Church(constraint=constraint)
+        dna_sequences = tool.silicon_to_carbon(self.test_list, 160 * 4).get("dna")
+        for dna_sequence in dna_sequences:
+            self.assertTrue(constraint.check("".join(dna_sequence)))
+        self.assertEqual(tool.carbon_to_silicon(dna_sequences).get("bit"), self.test_list)
+
+        # the first positional parameter is still "need_logs".
+        self.assertIsNone(Church(False).constraint)
@@ -2,6 +2,8 @@ import random
 import unittest
 
 from Chamaeleo.methods.flowed import YinYangCode
+from Chamaeleo.methods.inherent import to_nucleotide_codes
+from Chamaeleo.utils.screen import Constraint
 
 
 class TestEncodeDecode(unittest.TestCase):
@@ -46,4 +48,16 @@ class TestEncodeDecode(unittest.TestCase):
         ]).get("bit")
 
         for bit_segment in bit_segments:
-            self.assertIn(bit_segment, self.test_list)
\ No newline at end of file
+            self.assertIn(bit_segment, self.test_list)
+
+    def test_batch_decode(self):
+        dna_sequences = self.tool.silicon_to_carbon([list(bit_segment) for bit_segment in self.test_list],
+                                                    100 * 4).get("dna")
+        bit_segments = self.tool.batch_decode(to_nucleotide_codes(dna_sequences)).tolist()
+        self.assertEqual(sorted(bit_segments), sorted(self.test_list))
+
+    def test_unsatisfiable_constraint(self):
+        # no DNA sequence avoids the motif "A", so the search is stopped instead of looping forever.
+        tool = YinYangCode(faster=True, max_iterations=5, constraint=Constraint(motifs=["A"]))
+        with self.assertRaises(ValueError):
+            tool.silicon_to_carbon(self.test_list, 100 * 4)
@@ -0,0 +1,47 @@
+import os
+import unittest
+
+import numpy
+
+from Chamaeleo.methods.inherent import get_yyc_rule_by_index, get_yyc_index_by_rule, load_yyc_rules
+
+
+class TestEncodeDecode(unittest.TestCase):
+
+    def setUp(self):
+        self.test_indices = [0, 1, 255, 256, 1535, 1536, 3000, 6143]
+        self.test_rules = [
+            ["A", [0, 0, 1, 1], [[0, 1, 0, 1], [0, 1, 0, 1], [0, 1, 0, 1], [0, 1, 0, 1]]],
+            ["A", [0, 0, 1, 1], [[0, 1, 0, 1], [0, 1, 0, 1], [0, 1, 0, 1], [0, 1, 1, 0]]],
+            ["A", [0, 0, 1, 1], [[1, 0, 1, 0], [1, 0, 1, 0], [1, 0, 1, 0], [1, 0, 1, 0]]],
+            ["A", [0, 1, 0, 1], [[0, 0, 1, 1], [0, 0, 1, 1], [0, 0, 1, 1], [0, 0, 1, 1]]],
+            ["A", [1, 1, 0, 0], [[1, 0, 1, 0], [1, 0, 1, 0], [1, 0, 1, 0], [1, 0, 1, 0]]],
+            ["T", [0, 0, 1, 1], [[0, 1, 0, 1], [0, 1, 0, 1], [0, 1, 0, 1], [0, 1, 0, 1]]],
+            ["T", [1, 1, 0, 0], [[1, 0, 0, 1], [1, 0, 1, 0], [1, 0, 0, 1], [0, 1, 0, 1]]],
+            ["G", [1, 1, 0, 0], [[1, 0, 1, 0], [1, 0, 1, 0], [1, 0, 1, 0], [1, 0, 1, 0]]]
+        ]
+
+    def test_rule_by_index(self):
+        rules = [get_yyc_rule_by_index(index) for index in self.test_indices]
+        self.assertEqual(rules, self.test_rules)
+
+    def test_index_by_rule(self):
+        indices = [get_yyc_index_by_rule(*rule) for rule in self.test_rules]
+        self.assertEqual(indices, self.test_indices)
+
+    def test_wrong_rule(self):
+        with self.assertRaises(ValueError):
+            get_yyc_rule_by_index(6144)
+        with self.assertRaises(ValueError):
+            get_yyc_index_by_rule("A", [0, 0, 1, 1], [[1, 1, 0, 0], [1, 1, 0, 0], [1, 1, 0, 0], [1, 1, 0, 0]])
+
+    def test_cache(self):
+        rules = load_yyc_rules()
+        # the cache file is written even if the table is already in memory.
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated_files", "yyc_rules.npz")
+        load_yyc_rules(cache_path=path)
+        self.assertTrue(os.path.exists(path))
+        with numpy.load(path) as data:
+            self.assertEqual(data["yin_rules"].tolist(), rules[2].tolist())
+        self.assertEqual(load_yyc_rules(cache_path=path)[0].tolist(), rules[0].tolist())
+        os.remove(path)
@@ -0,0 +1,154 @@
+import numpy
+
+_nucleotide_codes = numpy.zeros(shape=256, dtype=numpy.uint8)
+_nucleotide_codes[[ord("A"), ord("C"), ord("G"), ord("T")]] = [0, 1, 2, 3]
+
+
+class ChannelSimulator(object):
+
+    def __init__(self, substitution_rate=0.0, insertion_rate=0.0, deletion_rate=0.0, substitution_matrix=None,
+                 indel_lengths=None, dropout=0.0, coverage=None, seed=None):
+        """
+        introduction: Vectorized simulator of the synthesis and sequencing channel.
+
+        :param substitution_rate: Substitution rate of each nucleotide, or the rates of the positions.
+                                  Type: float or one-dimensional list(float)
+
+        :param insertion_rate: Insertion rate after each nucleotide, or the rates of the positions.
+                               Type: float or one-dimensional list(float)
+
+        :param deletion_rate: Deletion rate of each nucleotide, or the rates of the positions.
+                              Type: float or one-dimensional list(float)
+
+        :param substitution_matrix: Weights from the original nucleotide (row) to the substituted one (column),
+                                    in the order of A, C, G and T. The diagonal is ignored, default is uniform.
+                                    Type: two-dimensional list(float), the shape is (4, 4).
+
+        :param indel_lengths: Probabilities of the indel lengths 1, 2, 3, ..., default is [1.0].
+                              Type: one-dimensional list(float)
+
+        :param dropout: Probability that a DNA sequence is lost.
+
+        :param coverage: Mean copy number (Poisson) of each DNA sequence, None means one copy.
+
+        :param seed: Seed of the random number generator.
+        """
+        self.substitution_rate = substitution_rate
+        self.insertion_rate = insertion_rate
+        self.deletion_rate = deletion_rate
+        self.substitution_matrix = substitution_matrix
+        self.indel_lengths = indel_lengths if indel_lengths is not None else [1.0]
+        self.dropout = dropout
+        self.coverage = coverage
+        self.seed = seed
+        self.generator = numpy.random.default_rng(seed)
+
+        self.__init_check__()
+
+        weights = numpy.ones(shape=(4, 4)) if substitution_matrix is None else numpy.array(substitution_matrix, float)
+        numpy.fill_diagonal(weights, 0)
+        self.substitution_cumulation = numpy.cumsum(weights / numpy.sum(weights, axis=1, keepdims=True), axis=1)
+        indel_lengths = numpy.array(self.indel_lengths, dtype=float)
+        self.indel_cumulation = numpy.cumsum(indel_lengths / numpy.sum(indel_lengths))
+
+    def __init_check__(self):
+        for name in ["substitution_rate", "insertion_rate", "deletion_rate"]:
+            rates = numpy.array(getattr(self, name), dtype=float)
+            if rates.ndim > 1 or numpy.any(rates < 0) or numpy.any(rates > 1):
+                raise ValueError("Wrong value in the \"" + name + "\", the value is in the range of [0, 1]!")
+
+        if self.substitution_matrix is not None:
+            weights = numpy.array(self.substitution_matrix, dtype=float)
+            if weights.shape != (4, 4) or numpy.any(weights < 0):
+                raise ValueError("The \"substitution_matrix\" needs to be a non-negative 4 x 4 matrix!")
+            if numpy.any(numpy.sum(weights, axis=1) - numpy.diag(weights) <= 0):
+                raise ValueError("Each nucleotide in the \"substitution_matrix\" needs to be substituted by others!")
+
+        if len(self.indel_lengths) == 0 or numpy.any(numpy.array(self.indel_lengths) < 0) \
+                or numpy.sum(self.indel_lengths) <= 0:
+            raise ValueError("Wrong value in the \"indel_lengths\", they are the probabilities of the lengths!")
+
+        if self.dropout < 0 or self.dropout > 1:
+            raise ValueError("Wrong value in the \"dropout\", the value is in the range of [0, 1]!")
+
+        if self.coverage is not None and self.coverage <= 0:
+            raise ValueError("Wrong value in the \"coverage\", the value is in the range of (0, +inf)!")
+
+    def simulate(self, dna_sequences, seed=None):
+        """
+        introduction: Simulate the channel on the DNA sequences.
+
+        :param dna_sequences: DNA sequences (the lengths can be different).
+                              Type: two-dimensional list(string)
+
+        :param seed: Seed for this simulation, the generator of the simulator is used if it is None.
+
+        :return output: "dna" is the obtained DNA sequences (reads) and "origin" is their original indices.
+                        Type: dict
+        """
+        generator = numpy.random.default_rng(seed) if seed is not None else self.generator
+
+        # sequence dropout and copy number.
+        copies = numpy.ones(shape=len(dna_sequences), dtype=int)
+        if self.coverage is not None:
+            copies = generator.poisson(self.coverage, size=len(dna_sequences))
+        if self.dropout > 0:
+            copies[generator.random(size=len(dna_sequences)) < self.dropout] = 0
+        origins = numpy.repeat(numpy.arange(len(dna_sequences)), copies)
+        if len(origins) == 0:
+            return {"dna": [], "origin": []}
+
+        lengths = numpy.array([len(dna_sequence) for dna_sequence in dna_sequences], dtype=int)
+        sequence_length = int(numpy.max(lengths))
+        codes = numpy.zeros(shape=(len(dna_sequences), sequence_length), dtype=numpy.uint8)
+        nucleotides = "".join(["".join(dna_sequence) for dna_sequence in dna_sequences]).encode("ascii")
+        codes[numpy.arange(sequence_length)[None, :] < lengths[:, None]] = \
+            _nucleotide_codes[numpy.frombuffer(nucleotides, dtype=numpy.uint8)]
+        codes, lengths = codes[origins], lengths[origins]
+        valid = numpy.arange(sequence_length)[None, :] < lengths[:, None]
+
+        # substitution errors
+        chosen = valid & (generator.random(size=codes.shape) < self._rates(self.substitution_rate, sequence_length))
+        targets = generator.random(size=int(numpy.count_nonzero(chosen)))
+        codes[chosen] = numpy.sum(targets[:, None] >= self.substitution_cumulation[codes[chosen]][:, :3], axis=1)
+
+        # deletion errors, each starting position deletes a run of the sampled length.
+        starts = valid & (generator.random(size=codes.shape) < self._rates(self.deletion_rate, sequence_length))
+        rows, columns = numpy.nonzero(starts)
+        deletions = numpy.zeros(shape=(len(codes), sequence_length + 1), dtype=int)
+        numpy.add.at(deletions, (rows, columns), 1)
+        numpy.add.at(deletions, (rows, numpy.minimum(columns + self._indel_lengths(generator, len(rows)),
+                                                     sequence_length)), -1)
+        kept = valid & (numpy.cumsum(deletions, axis=1)[:, :-1] == 0)
+
+        # insertion errors after the positions.
+        chosen = valid & (generator.random(size=codes.shape) < self._rates(self.insertion_rate, sequence_length))
+        insertions = numpy.zeros(shape=codes.shape, dtype=int)
+        insertions[chosen] = self._indel_lengths(generator, int(numpy.count_nonzero(chosen)))
+
+        # each position outputs its kept nucleotide and then the inserted random nucleotides.
+        counts = (kept.astype(int) + insertions).reshape(-1)
+        positions = numpy.repeat(numpy.arange(counts.size), counts)
+        offsets = numpy.arange(len(positions)) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+        output_codes = codes.reshape(-1)[positions]
+        inserted = offsets >= kept.reshape(-1)[positions]
+        output_codes[inserted] = generator.integers(0, 4, size=int(numpy.count_nonzero(inserted)))
+        nucleotides = numpy.frombuffer(b"ACGT", dtype=numpy.uint8)[output_codes].tobytes().decode("ascii")
+
+        boundaries = numpy.cumsum(numpy.sum(counts.reshape(len(codes), -1), axis=1)).tolist()
+        reads = [list(nucleotides[start: end]) for start, end in zip([0] + boundaries[:-1], boundaries)]
+
+        return {"dna": reads, "origin": origins.tolist()}
+
+    def _indel_lengths(self, generator, count):
+        return numpy.searchsorted(self.indel_cumulation, generator.random(size=count), side="right") + 1
+
+    @staticmethod
+    def _rates(rates, sequence_length):
+        rates = numpy.array(rates, dtype=float)
+        if rates.ndim == 0:
+            return rates
+        if len(rates) < sequence_length:
+            raise ValueError("The number of the position rates (" + str(len(rates)) + ") is less than "
+                             + "the sequence length (" + str(sequence_length) + ")!")
+        return rates[None, :sequence_length]
@@ -1,9 +1,20 @@
+import bz2
 import gzip
+import json
+import lzma
+import os
 import pickle
 import struct
-from numpy import fromfile, array, uint8
+import zlib
+from numpy import fromfile, frombuffer, array, arange, concatenate, cumsum, load, memmap, packbits, repeat, savez, \
+    unpackbits, zeros, uint8
 from Chamaeleo.utils.monitor import Monitor
 
+_archive_magic = b"CHDNA\x01"
+_archive_codes = zeros(shape=256, dtype=uint8)
+_archive_codes[[ord("A"), ord("C"), ord("G"), ord("T")]] = [0, 1, 2, 3]
+_archive_bases = frombuffer(b"ACGT", dtype=uint8)
+
 
 def read_bits_from_str(string, segment_length=120, need_logs=False):
     monitor = Monitor()
@@ -47,24 +58,118 @@ def write_bits_to_str(matrix, bit_size, need_logs=False):
     return str(bytes(values), encoding="utf8")
 
 
-def compress_from_file(path):
+def compress_from_file(path, chunk_size=65536):
     new_path = path + ".gz"
-    compress_file = gzip.GzipFile(filename="", mode="wb", compresslevel=9, fileobj=open(new_path, "wb"))
-    with open(path, "wb") as file:
-        compress_file.write(file.read())
-    compress_file.close()
+    with open(new_path, "wb") as file:
+        for data in compress_chunks(read_chunks(path, chunk_size), "gzip"):
+            file.write(data)
     return new_path
 
 
-def decompress_from_file(path):
+def decompress_from_file(path, chunk_size=65536):
     new_path = path[:-3]
-    decompress_file = gzip.GzipFile(mode="rb", fileobj=open(path, "rb"))
     with open(new_path, "wb") as file:
-        file.write(decompress_file.read())
-    decompress_file.close()
+        for data in decompress_chunks(read_chunks(path, chunk_size), "gzip", chunk_size):
+            file.write(data)
     return new_path
 
 
+def read_chunks(path, chunk_size=65536):
+    with open(path, "rb") as file:
+        while True:
+            data = file.read(chunk_size)
+            if not data:
+                break
+            yield data
+
+
+def compress_chunks(chunks, codec="gzip"):
+    """
+    introduction: Compress the chunks by the streaming codec, so the memory does not grow with the data.
+
+    :param chunks: Chunks of the data.
+                   Type: iterable(bytes)
+
+    :param codec: "gzip", "zlib", "bz2" or "lzma".
+
+    :return compressed_chunks: Generator of the compressed chunks.
+                               Type: bytes
+    """
+    if codec == "gzip":
+        compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+    elif codec == "zlib":
+        compressor = zlib.compressobj(9)
+    elif codec == "bz2":
+        compressor = bz2.BZ2Compressor(9)
+    elif codec == "lzma":
+        compressor = lzma.LZMACompressor()
+    else:
+        raise ValueError("Unknown codec \"" + str(codec) + "\", please use \"gzip\", \"zlib\", \"bz2\" or \"lzma\"!")
+
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def decompress_chunks(chunks, codec="gzip", chunk_size=65536):
+    """
+    introduction: Decompress the chunks by the streaming codec, each decompressed chunk is at most "chunk_size".
+
+    :param chunks: Chunks of the compressed data.
+                   Type: iterable(bytes)
+
+    :param codec: "gzip", "zlib", "bz2" or "lzma".
+
+    :param chunk_size: Maximum size of the decompressed chunk.
+
+    :return decompressed_chunks: Generator of the decompressed chunks.
+                                 Type: bytes
+    """
+    if codec == "gzip":
+        decompressor = zlib.decompressobj(31)
+    elif codec == "zlib":
+        decompressor = zlib.decompressobj()
+    elif codec == "bz2":
+        decompressor = bz2.BZ2Decompressor()
+    elif codec == "lzma":
+        decompressor = lzma.LZMADecompressor()
+    else:
+        raise ValueError("Unknown codec \"" + str(codec) + "\", please use \"gzip\", \"zlib\", \"bz2\" or \"lzma\"!")
+
+    for chunk in chunks:
+        data = decompressor.decompress(chunk, chunk_size)
+        while True:
+            if data:
+                yield data
+            # the rest of the chunk is decompressed later, so that the output is bounded.
+            if codec in ["gzip", "zlib"]:
+                if not decompressor.unconsumed_tail:
+                    break
+                data = decompressor.decompress(decompressor.unconsumed_tail, chunk_size)
+            else:
+                if decompressor.eof or decompressor.needs_input:
+                    break
+                data = decompressor.decompress(b"", chunk_size)
+
+    if codec in ["gzip", "zlib"]:
+        data = decompressor.flush()
+        if data:
+            yield data
+
+
+def read_bits_from_bytes(data, segment_length=120, need_logs=False):
+    if need_logs:
+        print("Read binary matrix from " + str(len(data)) + " bytes.")
+
+    bits = unpackbits(frombuffer(data, dtype=uint8))
+    if len(bits) % segment_length != 0:
+        bits = concatenate([bits, zeros(shape=segment_length - len(bits) % segment_length, dtype=uint8)])
+
+    return bits.reshape(-1, segment_length).tolist(), len(data) * 8
+
+
 def read_bits_from_file(path, segment_length=120, need_logs=True):
     monitor = Monitor()
     if need_logs:
@@ -105,25 +210,176 @@ def write_bits_to_file(path, matrix, bit_size, need_logs=True):
     return True
 
 
-def read_dna_file(path, need_logs=True):
+def read_bits_from_files(paths, segment_length=120, need_logs=True, compression=None, chunk_size=65536):
+    """
+    introduction: Read the binary matrix of several files, the segments of each file start at a new segment.
+
+    :param paths: Names and paths of the files.
+                  Type: dict
+
+    :param segment_length: Length of each binary segment.
+
+    :param need_logs: Show the process of reading.
+
+    :param compression: Codec compressing each file independently ("gzip", "zlib", "bz2" or "lzma"),
+                        so that each file can still be decoded alone. None means no compression.
+
+    :param chunk_size: Size of the chunks read from each file for the compression.
+
+    :return matrix: Binary matrix of all the files.
+                    Type: Two-dimensional list(int)
+
+    :return bit_size: Total number of bits in the matrix.
+
+    :return manifest: Name, size (in bytes, after the compression) and range [start, stop) of the segments
+                      of each file, and its original size (in bytes) if it is compressed.
+                      Type: list(dict)
+    """
+    matrix, manifest = [], []
+    for name, path in paths.items():
+        _check_file_name(name)
+        if compression is None:
+            bit_segments, bit_size = read_bits_from_file(path, segment_length, need_logs)
+            entry = {"name": name, "size": bit_size // 8}
+        else:
+            data = b"".join(compress_chunks(read_chunks(path, chunk_size), compression))
+            bit_segments, bit_size = read_bits_from_bytes(data, segment_length, need_logs)
+            entry = {"name": name, "size": len(data), "original size": os.path.getsize(path)}
+        entry["start"], entry["stop"] = len(matrix), len(matrix) + len(bit_segments)
+        manifest.append(entry)
+        matrix += bit_segments
+
+    return matrix, len(matrix) * segment_length, manifest
+
+
+def write_bits_to_files(folder_path, matrix, manifest, need_logs=True, compression=None, chunk_size=65536):
+    """
+    introduction: Write the files in the manifest from the binary matrix of all the files.
+
+    :param folder_path: Folder of the files, the names in the manifest are their file names.
+
+    :param matrix: Binary matrix of all the files.
+                   Type: Two-dimensional list(int)
+
+    :param manifest: Name, size (in bytes) and range [start, stop) of the segments of each file.
+                     Type: list(dict)
+
+    :param need_logs: Show the process of writing.
+
+    :param compression: Codec compressing each file in "read_bits_from_files", None means no compression.
+
+    :param chunk_size: Maximum size of the decompressed chunks written to each file.
+    """
     monitor = Monitor()
 
-    dna_sequences = []
+    # the names may come from the header of a DNA archive, so they are checked before any file is written.
+    for entry in manifest:
+        _check_file_name(entry["name"])
 
-    with open(path, "r") as file:
+    for index, entry in enumerate(manifest):
+        path = os.path.join(folder_path, entry["name"])
         if need_logs:
-            print("Read DNA sequences from file: " + path)
+            print("Write file from binary matrix: " + path)
+
+        bits = array(matrix[entry["start"]: entry["stop"]], dtype=uint8).reshape(-1)[: entry["size"] * 8]
+        with open(path, "wb") as file:
+            if compression is None:
+                file.write(packbits(bits).tobytes())
+            else:
+                for data in decompress_chunks([packbits(bits).tobytes()], compression, chunk_size):
+                    file.write(data)
+
+        if need_logs:
+            monitor.output(index + 1, len(manifest))
+
+    return True
+
+
+def _check_file_name(name):
+    # the file name needs to stay in the folder, so the paths are not accepted.
+    if type(name) != str or name in ["", ".", ".."] or os.path.isabs(name) \
+            or "/" in name or "\\" in name:
+        raise ValueError("The file name \"" + str(name) + "\" needs to be a plain name without the folder!")
+
+
+def read_dna_file(path, need_logs=True, quality_threshold=None, quality_mode="mask"):
+    return list(iterate_dna_file(path, need_logs, quality_threshold, quality_mode))
+
 
-        # Read current file by line
-        lines = file.readlines()
+def iterate_dna_file(path, need_logs=False, quality_threshold=None, quality_mode="mask", quality_offset=33):
+    """
+    introduction: Read DNA sequences from the file lazily.
+                  The file can be one sequence per line, FASTA or FASTQ, which can be compressed by gzip.
 
-        for index, line in enumerate(lines):
-            dna_sequences.append(list(line.replace("\n", "")))
+    :param path: Path of the file.
+
+    :param need_logs: Show the process of reading.
+
+    :param quality_threshold: Minimum quality score of the base in FASTQ, None means no filtering.
+
+    :param quality_mode: "mask" replaces the low-quality bases with "N", which are regarded as the erasures
+                         by the coding scheme if the error correction is used. "drop" skips the reads
+                         containing low-quality bases.
+
+    :param quality_offset: Offset of the quality characters, 33 for Phred+33.
+
+    :return dna_sequences: Generator of the DNA sequences.
+                           Type: list(str)
+    """
+    if quality_mode not in ["mask", "drop"]:
+        raise ValueError("Unknown parameter \"quality_mode\", please use \"mask\" or \"drop\"!")
+
+    monitor = Monitor()
+
+    with open(path, "rb") as handle:
+        if need_logs:
+            print("Read DNA sequences from file: " + path)
+
+        total_size = os.fstat(handle.fileno()).st_size
+        compressed = handle.read(2) == b"\x1f\x8b"
+        handle.seek(0)
+        stream = gzip.GzipFile(fileobj=handle, mode="rb") if compressed else handle
+
+        file_type, header, lines = None, None, []
+        for line in stream:
+            line = line.rstrip(b"\r\n").decode("ascii")
+            if file_type is None:
+                file_type = "fasta" if line.startswith(">") else ("fastq" if line.startswith("@") else "raw")
+
+            if file_type == "raw":
+                yield list(line)
+            elif file_type == "fasta":
+                if line.startswith(">"):
+                    if header is not None:
+                        yield list("".join(lines))
+                    header, lines = line, []
+                else:
+                    lines.append(line)
+            else:
+                lines.append(line)
+                if len(lines) == 4:
+                    dna_sequence = _filter_quality(lines[1], lines[3], quality_threshold, quality_mode, quality_offset)
+                    if dna_sequence is not None:
+                        yield dna_sequence
+                    lines = []
 
             if need_logs:
-                monitor.output(index + 1, len(lines))
+                # the compressed position is used for the gzip file.
+                monitor.output(handle.tell(), total_size)
+
+        if file_type == "fasta" and header is not None:
+            yield list("".join(lines))
 
-    return dna_sequences
+
+def _filter_quality(dna_sequence, quality, quality_threshold, quality_mode, quality_offset):
+    if quality_threshold is None or min(quality, default=chr(127)) >= chr(quality_threshold + quality_offset):
+        return list(dna_sequence)
+
+    if quality_mode == "drop":
+        return None
+
+    return [nucleotide if ord(score) - quality_offset >= quality_threshold else "N"
+            for nucleotide, score in zip(dna_sequence, quality)]
 
 
 def write_dna_file(path, dna_sequences, need_logs=False):
@@ -142,6 +398,183 @@ def write_dna_file(path, dna_sequences, need_logs=False):
     return True
 
 
+def write_dna_archive(path, dna_sequences, header=None, need_logs=False):
+    """
+    introduction: Write DNA sequences to the packed archive (4 nucleotides per byte).
+                  The archive is the magic bytes, the length of the JSON header, the header,
+                  the byte offset table (uint64, one more than the sequences), the sequence lengths (uint32)
+                  and the packed sequences, each of which starts at a new byte.
+
+    :param path: Path of the archive.
+
+    :param dna_sequences: DNA sequences, which can only contain "A", "C", "G" and "T".
+                          Type: Two-dimensional list(str)
+
+    :param header: Parameters saved with the sequences, such as "bit size" and "segment length".
+                   Type: dict
+
+    :param need_logs: Show the process of writing.
+    """
+    if need_logs:
+        print("Write DNA sequences to archive: " + path)
+
+    lengths = array([len(dna_sequence) for dna_sequence in dna_sequences], dtype="<u4")
+    values = frombuffer("".join(["".join(dna_sequence) for dna_sequence in dna_sequences]).encode("ascii"),
+                        dtype=uint8)
+    codes = _archive_codes[values]
+    if (_archive_bases[codes] != values).any():
+        raise ValueError("Only \"A\", \"C\", \"G\" and \"T\" can be saved in the DNA archive!")
+
+    sizes = lengths.astype("int64")
+    offsets = concatenate([[0], cumsum((sizes + 3) // 4)]).astype("int64")
+    positions = arange(len(values)) + repeat(offsets[:-1] * 4 - (cumsum(sizes) - sizes), sizes)
+    padded_codes = zeros(shape=int(offsets[-1]) * 4, dtype=uint8)
+    padded_codes[positions] = codes
+    quads = padded_codes.reshape(-1, 4)
+    packed_bytes = (quads[:, 0] << 6) | (quads[:, 1] << 4) | (quads[:, 2] << 2) | quads[:, 3]
+
+    header = dict(header) if header is not None else {}
+    header["count"] = len(dna_sequences)
+    header_bytes = json.dumps(header).encode("utf-8")
+    # the offset table is aligned to 8 bytes, so that it can be memory-mapped directly.
+    header_bytes += b" " * (-(len(_archive_magic) + 4 + len(header_bytes)) % 8)
+
+    with open(path, "wb") as file:
+        file.write(_archive_magic + struct.pack("<I", len(header_bytes)) + header_bytes)
+        file.write(offsets.astype("<u8").tobytes())
+        file.write(lengths.tobytes())
+        file.write(packed_bytes.tobytes())
+
+    return True
+
+
+def is_dna_archive(path):
+    with open(path, "rb") as file:
+        return file.read(len(_archive_magic)) == _archive_magic
+
+
+def read_dna_archive(path, need_logs=False):
+    """
+    introduction: Read all the DNA sequences and the header from the packed archive.
+
+    :param path: Path of the archive.
+
+    :param need_logs: Show the process of reading.
+
+    :return dna_sequences: DNA sequences.
+                           Type: Two-dimensional list(str)
+
+    :return header: Parameters saved with the sequences.
+                    Type: dict
+    """
+    if need_logs:
+        print("Read DNA sequences from archive: " + path)
+
+    archive = DNAArchive(path)
+    return archive.sequences(), archive.header
+
+
+class DNAArchive(object):
+
+    def __init__(self, path):
+        """
+        introduction: Memory-mapped reader of the packed archive, which accesses each DNA sequence in O(1).
+
+        :param path: Path of the archive.
+        """
+        with open(path, "rb") as file:
+            if file.read(len(_archive_magic)) != _archive_magic:
+                raise ValueError("The file " + path + " is not a DNA archive!")
+            header_length = struct.unpack("<I", file.read(4))[0]
+            self.header = json.loads(file.read(header_length).decode("utf-8"))
+            total_size = os.fstat(file.fileno()).st_size
+
+        self.path = path
+        self.count = self.header["count"]
+        table_offset = len(_archive_magic) + 4 + header_length
+        self.offsets = memmap(path, dtype="<u8", mode="r", offset=table_offset, shape=(self.count + 1,))
+        self.lengths = memmap(path, dtype="<u4", mode="r", offset=table_offset + 8 * (self.count + 1),
+                              shape=(self.count,)) if self.count > 0 else array([], dtype="<u4")
+        data_offset = table_offset + 8 * (self.count + 1) + 4 * self.count
+        self.data = memmap(path, dtype=uint8, mode="r", offset=data_offset) \
+            if total_size > data_offset else array([], dtype=uint8)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0 or index >= self.count:
+            raise IndexError("The index " + str(index) + " is out of the DNA archive!")
+
+        packed_bytes = self.data[int(self.offsets[index]): int(self.offsets[index + 1])]
+        return list(_archive_bases[_unpack_codes(packed_bytes)[: int(self.lengths[index])]].tobytes().decode())
+
+    def sequences(self):
+        """
+        introduction: Unpack all the DNA sequences.
+
+        :return dna_sequences: DNA sequences.
+                               Type: Two-dimensional list(str)
+        """
+        # each sequence starts at a new byte, so it is sliced from the unpacked string with the padding.
+        string = _archive_bases[_unpack_codes(self.data)].tobytes().decode()
+
+        dna_sequences = []
+        for offset, length in zip(self.offsets[:-1].tolist(), self.lengths.tolist()):
+            dna_sequences.append(list(string[offset * 4: offset * 4 + length]))
+
+        return dna_sequences
+
+
+def write_index_sidecar(path, indices, positions):
+    """
+    introduction: Save the segment indices carried by the DNA sequences of the file to its sidecar
+                  (path + ".index.npz"), with the size and the modification time of the file
+                  to detect the outdated sidecar.
+
+    :param path: Path of the DNA file.
+
+    :param indices: Segment index carried by each DNA sequence (one DNA sequence can carry several of them).
+                    Type: list(int)
+
+    :param positions: Position of the DNA sequence in the file for each segment index.
+                      Type: list(int)
+    """
+    status = os.stat(path)
+    savez(path + ".index.npz", indices=array(indices, dtype="int64"), positions=array(positions, dtype="int64"),
+          size=array([status.st_size], dtype="int64"), mtime=array([status.st_mtime_ns], dtype="int64"))
+
+
+def read_index_sidecar(path):
+    """
+    introduction: Load the segment indices of the DNA file from its sidecar.
+
+    :param path: Path of the DNA file.
+
+    :return sidecar: Segment indices and positions of their DNA sequences,
+                     None if there is no sidecar or the file has been changed.
+                     Type: tuple(numpy.ndarray) or None
+    """
+    if not os.path.exists(path + ".index.npz"):
+        return None
+
+    status = os.stat(path)
+    with load(path + ".index.npz") as sidecar:
+        if "mtime" not in sidecar or int(sidecar["size"][0]) != status.st_size \
+                or int(sidecar["mtime"][0]) != status.st_mtime_ns:
+            return None
+        return sidecar["indices"], sidecar["positions"]
+
+
+def remove_index_sidecar(path):
+    if os.path.exists(path + ".index.npz"):
+        os.remove(path + ".index.npz")
+
+
+def _unpack_codes(packed_bytes):
+    return ((array(packed_bytes)[:, None] >> array([6, 4, 2, 0], dtype=uint8)) & 3).reshape(-1)
+
+
 def save_model(path, model, need_logs=False):
     if need_logs:
         print("Save model to file: " + path)
@@ -0,0 +1,95 @@
+import numpy
+
+from Chamaeleo.methods.inherent import to_nucleotide_codes
+from Chamaeleo.utils import screen
+
+
+class FeatureStatistics(object):
+
+    def __init__(self):
+        """
+        introduction: Streaming statistics of the DNA sequences, including the histogram of C and G content (%),
+                      the histogram of the longest homopolymer and the nucleotide composition of each position.
+        """
+        self.sequence_count = 0
+        self.maximum_length = 0
+        self.gc_histogram = numpy.zeros(shape=101, dtype=int)
+        self.homopolymer_histogram = numpy.zeros(shape=1, dtype=int)
+        self.composition = numpy.zeros(shape=(0, 4), dtype=int)
+
+    def update(self, dna_sequences):
+        """
+        introduction: Add a batch of DNA sequences (the lengths can be different) to the statistics.
+
+        :param dna_sequences: DNA sequences.
+                              Type: two-dimensional list(string) or list(string)
+        """
+        groups = {}
+        for dna_sequence in dna_sequences:
+            if len(dna_sequence) > 0:
+                groups.setdefault(len(dna_sequence), []).append(dna_sequence)
+
+        for sequences in groups.values():
+            self.update_codes(to_nucleotide_codes(sequences))
+
+    def update_codes(self, nucleotide_codes):
+        """
+        introduction: Add a batch of DNA sequences with the same length to the statistics.
+
+        :param nucleotide_codes: DNA sequences in the form of nucleotide codes (A: 0, C: 1, G: 2 and T: 3).
+                                 Type: two-dimensional numpy.ndarray
+        """
+        nucleotide_codes = numpy.asarray(nucleotide_codes)
+        sequence_count, sequence_length = nucleotide_codes.shape
+        if sequence_count == 0 or sequence_length == 0:
+            return
+
+        gc_contents = (screen.gc_contents(nucleotide_codes) * 100 + 0.5).astype(int)
+        self.gc_histogram += numpy.bincount(gc_contents, minlength=101)
+
+        homopolymer_histogram = numpy.bincount(screen.homopolymer_lengths(nucleotide_codes))
+        self.homopolymer_histogram = _add(self.homopolymer_histogram, homopolymer_histogram)
+
+        # count of each nucleotide (column) in each position (row).
+        composition = numpy.zeros(shape=(sequence_length, 4), dtype=int)
+        for code in range(4):
+            composition[:, code] = numpy.count_nonzero(nucleotide_codes == code, axis=0)
+        self.composition = _add(self.composition, composition)
+
+        self.sequence_count += sequence_count
+        self.maximum_length = max(self.maximum_length, sequence_length)
+
+    def update_file(self, path, batch_size=100000):
+        """
+        introduction: Add the DNA sequences in the file (one sequence per line) to the statistics,
+                      the file is read in batches instead of being loaded at once.
+
+        :param path: Path of the DNA file.
+
+        :param batch_size: Number of DNA sequences in each batch.
+        """
+        with open(path, "r") as file:
+            batch = []
+            for line in file:
+                batch.append(line.rstrip("\r\n"))
+                if len(batch) == batch_size:
+                    self.update(batch)
+                    batch = []
+            if len(batch) > 0:
+                self.update(batch)
+
+    def homopolymer_distribution(self):
+        # the distribution covers the lengths from 0 to the maximum length of the sequences.
+        return _add(numpy.zeros(shape=self.maximum_length, dtype=int), self.homopolymer_histogram).tolist()
+
+    def gc_distribution(self):
+        return self.gc_histogram.tolist()
+
+
+def _add(array_1, array_2):
+    # add two arrays with the different lengths (first dimension).
+    if len(array_1) < len(array_2):
+        array_1, array_2 = array_2, array_1
+    result = array_1.copy()
+    result[:len(array_2)] += array_2
+    return result
@@ -54,17 +54,28 @@ def divide(bit_segment, index_binary_length):
     return index, divided_list
 
 
-def sort_order(indices, bit_segments, need_logs=False):
+def sort_order(indices, bit_segments, need_logs=False, counts=None):
     monitor = Monitor()
 
     if need_logs:
         print("Restore data order according to index.")
 
+    # the segments sharing an index are voted by their copy numbers, or the first one is kept without the counts.
+    candidates = {}
+    for position, index in enumerate(indices):
+        if index not in candidates:
+            candidates[index] = {}
+        key = tuple(bit_segments[position])
+        if key in candidates[index]:
+            candidates[index][key][0] += counts[position] if counts is not None else 0
+        else:
+            candidates[index][key] = [counts[position] if counts is not None else 1, -position]
+
     sorted_bit_segments = []
 
     for index in range(max(indices) + 1):
-        if index in indices:
-            sorted_bit_segments.append(bit_segments[indices.index(index)])
+        if index in candidates:
+            sorted_bit_segments.append(bit_segments[-max(candidates[index].values())[1]])
         else:
             sorted_bit_segments.append([0 for _ in range(len(bit_segments[0]))])
 
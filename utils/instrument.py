@@ -0,0 +1,134 @@
+import csv
+import json
+import sys
+from time import perf_counter
+
+from Chamaeleo.utils import screen
+
+try:
+    import resource
+except ImportError:  # resource is not available on Windows.
+    resource = None
+
+
+class Instrument(object):
+
+    def __init__(self, hooks=None, need_memory=True):
+        """
+        introduction: Instrumentation of the stages in the pipelines.
+
+        :param hooks: Callables as hook(event, stage, record) for the external profilers,
+                      which are called when a stage is started ("start") and stopped ("stop").
+                      Type: list(callable)
+
+        :param need_memory: Whether to sample the peak memory of the process at the end of each stage.
+                            It is the high-water mark (resident set size) since the process started,
+                            which never decreases and cannot be attributed to the stage alone.
+        """
+        self.hooks = list(hooks) if hooks else []
+        self.need_memory = need_memory
+        self.records = []
+        self.active_stages = {}
+
+    def start(self, stage):
+        record = {"stage": stage, "runtime": None}
+        self.active_stages[stage] = (perf_counter(), screen.statistics["check"], screen.statistics["reject"], record)
+        for hook in self.hooks:
+            hook("start", stage, record)
+
+    def stop(self, stage, **counters):
+        """
+        introduction: Stop the stage and record its runtime, counters and screening statistics.
+
+        :param stage: Name of the started stage.
+
+        :param counters: Counters of the stage, such as "segments", "nucleotides" and "bytes".
+
+        :return record: Record of the stage.
+                        Type: dict
+        """
+        if stage not in self.active_stages:
+            raise ValueError("The stage \"" + str(stage) + "\" is not started!")
+
+        start_time, check_count, reject_count, record = self.active_stages.pop(stage)
+        record["runtime"] = perf_counter() - start_time
+        record.update(counters)
+        if "segments" in counters and record["runtime"] > 0:
+            record["segment throughput"] = counters["segments"] / record["runtime"]
+        if "nucleotides" in counters and record["runtime"] > 0:
+            record["nucleotide throughput"] = counters["nucleotides"] / record["runtime"]
+        if screen.statistics["check"] > check_count:
+            record["screening checks"] = screen.statistics["check"] - check_count
+            record["screening rejections"] = screen.statistics["reject"] - reject_count
+        if self.need_memory:
+            record["process peak memory"] = peak_memory()
+
+        self.records.append(record)
+        for hook in self.hooks:
+            hook("stop", stage, record)
+
+        return record
+
+    def output_records(self, **info):
+        """
+        introduction: Output the records as JSON ("type" is "json") or CSV ("type" is "csv").
+
+        :param info: "type" is the format of the records and "path" is the file path,
+                     the records are returned as string if there is no "path".
+
+        :return string: Formatted records if there is no "path".
+        """
+        record_type = info["type"] if "type" in info else "json"
+        if record_type == "json":
+            string = json.dumps(self.records, indent=2)
+            if "path" in info:
+                with open(info["path"], "w", encoding="utf-8") as save_file:
+                    save_file.write(string)
+            else:
+                return string
+        elif record_type == "csv":
+            header = []
+            for record in self.records:
+                header += [key for key in record if key not in header]
+
+            if "path" in info:
+                with open(info["path"], "w", encoding="utf-8", newline="") as save_file:
+                    writer = csv.DictWriter(save_file, fieldnames=header)
+                    writer.writeheader()
+                    writer.writerows(self.records)
+            else:
+                lines = [",".join(header)]
+                for record in self.records:
+                    lines.append(",".join([str(record[key]) if key in record else "" for key in header]))
+                return "\n".join(lines)
+        else:
+            raise ValueError("Unknown parameter \"type\", please use \"json\" or \"csv\".")
+
+
+def profiler_hook(profiler, stages=None):
+    """
+    introduction: Hook to enable an external profiler (such as cProfile.Profile) only in the selected stages.
+
+    :param profiler: Profiler with "enable" and "disable" functions.
+
+    :param stages: Names of the selected stages, all the stages are selected if it is None.
+
+    :return hook: Hook for Instrument.
+    """
+    def hook(event, stage, record):
+        if stages is None or stage in stages:
+            if event == "start":
+                profiler.enable()
+            else:
+                profiler.disable()
+
+    return hook
+
+
+def peak_memory():
+    # high-water mark of the resident set size of the current process in KB (reported in bytes on macOS).
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
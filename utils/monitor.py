@@ -1,30 +1,78 @@
-from datetime import datetime
+import sys
+from time import monotonic
 
 
 class Monitor:
 
-    def __init__(self):
+    # the default settings shared by the monitors, which can be changed by "Monitor.configure".
+    settings = {"interval": 0.1, "step": 1, "stream": None, "logger": None, "enable": True}
+
+    def __init__(self, **settings):
+        """
+        introduction: Progress monitor, the progress is redrawn at most every "interval" seconds
+                      or every "step" percent, and always at the end.
+
+        :param settings: "interval" is the minimum seconds between two redrawings;
+                         "step" is the minimum percent between two redrawings;
+                         "stream" is the writable stream of the progress bar, the default is sys.stdout;
+                         "logger" is the logging.Logger to record the progress instead of the stream;
+                         "enable" is whether to output the progress.
+        """
+        for key in settings:
+            if key not in Monitor.settings:
+                raise ValueError("Unknown parameter \"" + key + "\" of the monitor!")
+
+        self.custom_settings = settings
         self.last_time = None
+        self.draw_time = None
+        self.next_state = 0
+        self.total_state = None
+
+    @staticmethod
+    def configure(**settings):
+        for key, value in settings.items():
+            if key not in Monitor.settings:
+                raise ValueError("Unknown parameter \"" + key + "\" of the monitor!")
+            Monitor.settings[key] = value
+
+    def get(self, key):
+        return self.custom_settings[key] if key in self.custom_settings else Monitor.settings[key]
 
     def output(self, current_state, total_state, extra=None):
+        # cheap counter check before everything.
+        if current_state < self.next_state and current_state != total_state and total_state == self.total_state:
+            return
+
+        finish = current_state == total_state
+        if not self.get("enable"):
+            self.next_state, self.total_state = (0, None) if finish else (total_state, total_state)
+            return
+
+        now = monotonic()
         if self.last_time is None:
-            self.last_time = datetime.now()
+            self.last_time = now
+        if total_state != self.total_state:
+            self.draw_time, self.total_state = None, total_state
 
-        position = int(current_state / total_state * 100)
+        self.next_state = current_state + max(int(total_state * self.get("step") / 100), 1)
 
-        string = "|"
+        if not finish and self.draw_time is not None and now - self.draw_time < self.get("interval"):
+            return
 
-        for index in range(0, 100, 5):
-            if position >= index:
-                string += "█"
-            else:
-                string += " "
+        self.draw_time = now
+        self._draw(self._format(current_state, total_state, now - self.last_time, extra), finish)
 
-        string += "|"
+        if finish:
+            self.last_time, self.draw_time, self.next_state, self.total_state = None, None, 0, None
+
+    def _format(self, current_state, total_state, pass_time, extra):
+        position = int(current_state / total_state * 100)
+
+        filled = min(position // 5 + 1, 20)
+        string = "|" + "█" * filled + " " * (20 - filled) + "|"
 
         current_state = max(current_state, 1)
 
-        pass_time = (datetime.now() - self.last_time).total_seconds()
         wait_time = int(pass_time * (total_state - current_state) / current_state)
 
         string += " " * (3 - len(str(position))) + str(position) + "% ("
@@ -45,8 +93,14 @@ class Monitor:
         else:
             string += "."
 
-        print("\r" + string, end="", flush=True)
+        return string
+
+    def _draw(self, string, finish):
+        logger = self.get("logger")
+        if logger is not None:
+            logger.info(string)
+            return
 
-        if current_state == total_state:
-            self.last_time = None
-            print()
+        stream = self.get("stream") if self.get("stream") is not None else sys.stdout
+        stream.write("\r" + string + ("\n" if finish else ""))
+        stream.flush()
@@ -1,19 +1,33 @@
 import copy
 import csv
+import json
 import os
 import random
+import tempfile
+import tracemalloc
+from datetime import datetime
+from multiprocessing import Pool
 
 import numpy
 from terminaltables import AsciiTable
 from Chamaeleo.methods.default import AbstractCodingAlgorithm, AbstractErrorCorrectionCode
-from Chamaeleo.utils import data_handle, indexer
+from Chamaeleo.methods.flowed import YinYangCode
+from Chamaeleo.methods.inherent import get_yyc_rule_by_index, load_yyc_rules, to_nucleotide_codes
+from Chamaeleo.utils import data_handle, indexer, reads, recovery, screen
+from Chamaeleo.utils.channel import ChannelSimulator
+from Chamaeleo.utils.features import FeatureStatistics
+from Chamaeleo.utils.instrument import Instrument
 from Chamaeleo.utils.monitor import Monitor
+from Chamaeleo.utils.reads import ReadClustering
+from Chamaeleo.utils.results import ResultStore
 
 
 class DefaultPipeline(object):
 
     def __init__(self, **info):
         self.need_logs = info["need_logs"] if "need_logs" in info else False
+        self.instrument = info["instrument"] if "instrument" in info else None
+        self.store = info["store"] if "store" in info else None
         self.monitor = Monitor()
         self.records = {}
 
@@ -21,6 +35,14 @@ class DefaultPipeline(object):
         if type(self.need_logs) != bool:
             raise ValueError("\"need_logs\" must be bool type!")
 
+    def _start(self, stage):
+        if self.instrument is not None:
+            self.instrument.start(stage)
+
+    def _stop(self, stage, **counters):
+        if self.instrument is not None:
+            self.instrument.stop(stage, **counters)
+
     def output_records(self, **info):
         raise NotImplementedError("\"output_records\" interface needs to be implemented!")
 
@@ -31,6 +53,8 @@ class TranscodePipeline(DefaultPipeline):
         super().__init__(**info)
         self.coding_scheme = info["coding_scheme"] if "coding_scheme" in info else None
         self.error_correction = info["error_correction"] if "error_correction" in info else None
+        self.outer_correction = info["outer_correction"] if "outer_correction" in info else None
+        self.clustering = info["clustering"] if "clustering" in info else None
 
         self.__init_check__()
 
@@ -39,6 +63,10 @@ class TranscodePipeline(DefaultPipeline):
             self.coding_scheme.need_logs = True
             if self.error_correction is not None:
                 self.error_correction.need_logs = True
+            if self.outer_correction is not None:
+                self.outer_correction.need_logs = True
+            if self.clustering is not None:
+                self.clustering.need_logs = True
 
     def __init_check__(self):
         super().__init_check__()
@@ -53,6 +81,9 @@ class TranscodePipeline(DefaultPipeline):
             raise ValueError("The error correction needs to "
                              + "inherit AbstractErrorCorrectionCode in methods/default.py!")
 
+        if self.clustering is not None and not isinstance(self.clustering, ReadClustering):
+            raise ValueError("The \"clustering\" needs to be ReadClustering in utils/reads.py!")
+
     def transcode(self, **info):
         if "direction" in info:
             if info["direction"] == "t_c":
@@ -60,7 +91,28 @@ class TranscodePipeline(DefaultPipeline):
 
                 self.records["payload length"] = segment_length
 
-                if "input_path" in info:
+                compression = info["compression"] if "compression" in info else None
+                if compression is None:
+                    self.records.pop("compression", None)
+                    self.records.pop("compression ratio", None)
+
+                self._start("read")
+                if "input_paths" in info:
+                    # each file is compressed independently, so that it can be extracted alone.
+                    chunk_size = info["chunk_size"] if "chunk_size" in info else 65536
+                    bit_segments, bit_size, manifest = data_handle.read_bits_from_files(info["input_paths"],
+                                                                                        segment_length,
+                                                                                        self.need_logs,
+                                                                                        compression, chunk_size)
+                    self.records["manifest"] = manifest
+                    if compression is not None:
+                        original_size = sum([entry["original size"] for entry in manifest])
+                        self.records["compression"] = compression
+                        self.records["compression ratio"] = round(sum([entry["size"] for entry in manifest])
+                                                                  / original_size, 3) if original_size > 0 else 1.0
+                elif compression is not None:
+                    bit_segments, bit_size = self._compress(info, segment_length)
+                elif "input_path" in info:
                     bit_segments, bit_size = data_handle.read_bits_from_file(info["input_path"], segment_length,
                                                                              self.need_logs)
                 elif "input_string" in info:
@@ -68,67 +120,155 @@ class TranscodePipeline(DefaultPipeline):
                                                                             self.need_logs)
                 else:
                     raise ValueError("There is no digital data input here!")
+                self._stop("read", segments=len(bit_segments), bytes=bit_size // 8)
 
                 original_bit_segments = copy.deepcopy(bit_segments)
 
+                if self.outer_correction is not None:
+                    if not ("index" in info and info["index"]):
+                        raise ValueError("The outer error correction needs the index to locate the missing segments!")
+
+                    self._start("outer correction")
+                    bit_segments, parity_count = self.outer_correction.insert(bit_segments)
+                    self._stop("outer correction", segments=len(bit_segments))
+                    self.records["outer-correction segments"] = parity_count
+
                 if "index" in info and info["index"]:
+                    self._start("index")
                     if "index_length" in info:
                         bit_segments, index_length = indexer.connect_all(bit_segments, info["index_length"],
                                                                          self.need_logs)
                     else:
                         bit_segments, index_length = indexer.connect_all(bit_segments, None, self.need_logs)
+                    self._stop("index", segments=len(bit_segments))
 
                     self.records["index length"] = index_length
                 else:
                     self.records["index length"] = 0
 
                 if self.error_correction is not None:
+                    self._start("error correction")
                     bit_segments, error_correction_length = self.error_correction.insert(bit_segments)
+                    self._stop("error correction", segments=len(bit_segments))
                     self.records["error-correction length"] = error_correction_length
                 else:
                     self.records["error-correction length"] = 0
 
+                self._start("encode")
                 results = self.coding_scheme.silicon_to_carbon(bit_segments, bit_size)
 
                 dna_sequences = results["dna"]
+                self._stop("encode", segments=len(dna_sequences),
+                           nucleotides=sum([len(dna_sequence) for dna_sequence in dna_sequences]))
 
                 self.records["information density"] = round(results["i"], 3)
                 self.records["encoding runtime"] = round(results["t"], 3)
 
                 if "output_path" in info:
-                    data_handle.write_dna_file(info["output_path"], dna_sequences, self.need_logs)
+                    self._start("write")
+                    if "output_format" in info and info["output_format"] == "archive":
+                        header = {"coding scheme": type(self.coding_scheme).__name__,
+                                  "parameters": _archive_parameters(self.coding_scheme),
+                                  "bit size": bit_size,
+                                  "segment length": self.coding_scheme.segment_length,
+                                  "index length": self.records["index length"],
+                                  "error-correction length": self.records["error-correction length"],
+                                  "payload length": segment_length}
+                        if "manifest" in self.records:
+                            header["manifest"] = self.records["manifest"]
+                        if "compression" in self.records:
+                            header["compression"] = self.records["compression"]
+                        data_handle.write_dna_archive(info["output_path"], dna_sequences, header, self.need_logs)
+                    else:
+                        data_handle.write_dna_file(info["output_path"], dna_sequences, self.need_logs)
+                    if "index" in info and info["index"] and self.coding_scheme.nucleotide_bits is not None \
+                            and len(dna_sequences) == len(bit_segments):
+                        # the coding scheme placing bits position by position keeps the order of the segments.
+                        data_handle.write_index_sidecar(info["output_path"], range(len(dna_sequences)),
+                                                        range(len(dna_sequences)))
+                    else:
+                        # the sidecar of the previous encoding to the same path is outdated.
+                        data_handle.remove_index_sidecar(info["output_path"])
+                    self._stop("write", segments=len(dna_sequences))
 
                 return {"bit": original_bit_segments, "dna": dna_sequences}
             elif info["direction"] == "t_s":
-                if "input_path" in info:
-                    dna_sequences = data_handle.read_dna_file(info["input_path"], self.need_logs)
+                # the masked bases ("N") are only decoded as the erasures by the error correction
+                # and the coding scheme placing bits position by position, otherwise the reads are dropped.
+                quality_threshold = info["quality_threshold"] if "quality_threshold" in info else None
+                need_erasures = self.error_correction is not None \
+                    and getattr(self.coding_scheme, "nucleotide_bits", None) is not None
+                quality_mode = info["quality_mode"] if "quality_mode" in info else ("mask" if need_erasures else "drop")
+                if quality_threshold is not None and quality_mode == "mask" and not need_erasures:
+                    raise ValueError("The low-quality bases can only be masked if the error correction is used "
+                                     "and the coding scheme places bits position by position, "
+                                     "please use the \"quality_mode\" \"drop\"!")
+
+                self._start("read")
+                if "input_path" in info and data_handle.is_dna_archive(info["input_path"]):
+                    dna_sequences, header = data_handle.read_dna_archive(info["input_path"], self.need_logs)
+                    self._restore_archive(header, info)
+                elif "input_path" in info:
+                    dna_sequences = data_handle.read_dna_file(info["input_path"], self.need_logs,
+                                                              quality_threshold, quality_mode)
                 elif "input_string" in info:
                     dna_sequences = []
                     for index, string in enumerate(info["input_string"]):
                         dna_sequences.append(string)
                 else:
                     raise ValueError("There is no digital data input here!")
+                self._stop("read", segments=len(dna_sequences),
+                           nucleotides=sum([len(dna_sequence) for dna_sequence in dna_sequences]))
 
                 original_dna_sequences = copy.deepcopy(dna_sequences)
 
-                results = self.coding_scheme.carbon_to_silicon(dna_sequences)
+                counts = None
+                if "collapse" in info and info["collapse"]:
+                    self._start("collapse")
+                    dna_sequences, counts = reads.collapse(dna_sequences, self.need_logs)
+                    self._stop("collapse", segments=len(dna_sequences))
+                    self.records["unique sequences"] = len(dna_sequences)
+
+                if self.clustering is not None:
+                    self._start("clustering")
+                    if counts is None:
+                        dna_sequences, counts = reads.collapse(dna_sequences, self.need_logs)
+                    clustered_data = self.clustering.consensus(dna_sequences, counts)
+                    dna_sequences, counts = clustered_data["dna"], clustered_data["counts"]
+                    self._stop("clustering", segments=len(dna_sequences))
+                    self.records["cluster count"] = len(dna_sequences)
+
+                self._start("decode")
+                results = self.coding_scheme.carbon_to_silicon(dna_sequences,
+                                                               need_erasures=self.error_correction is not None)
+                self._stop("decode", segments=len(results["bit"]),
+                           nucleotides=sum([len(dna_sequence) for dna_sequence in dna_sequences]))
                 self.records["decoding runtime"] = round(results["t"], 3)
 
                 bit_segments = results["bit"]
                 bit_size = results["s"]
 
+                if counts is not None and len(counts) != len(bit_segments):
+                    # the copy numbers are only used if the coding scheme decodes each sequence to one segment.
+                    counts = None
+
                 if not bit_segments:
                     self.records["error rate"] = "100.00%"
                     return {"bit": None, "dna": original_dna_sequences}
 
                 if self.error_correction is not None:
-                    verified_data = self.error_correction.remove(bit_segments)
+                    self._start("error correction")
+                    verified_data = self.error_correction.remove(bit_segments, results.get("e"))
                     bit_segments = verified_data["bit"]
+                    self._stop("error correction", segments=len(bit_segments))
                     self.records["error rate"] = str(round(verified_data["e_r"] * 100, 2)) + "%"
                     self.records["error indices"] = str(verified_data["e_i"]).replace(", ", "-") \
                         if verified_data["e_i"] != [] else None
                     self.records["error bit segments"] = str(verified_data["e_bit"]).replace(", ", "-") \
                         if verified_data["e_bit"] != [] else None
+                    if counts is not None:
+                        error_indices = set(verified_data["e_i"])
+                        counts = [count for index, count in enumerate(counts) if index not in error_indices]
                 else:
                     self.records["error rate"] = None
                     self.records["error indices"] = None
@@ -138,19 +278,46 @@ class TranscodePipeline(DefaultPipeline):
                     return {"bit": None, "dna": original_dna_sequences}
 
                 if "index" in info and info["index"]:
+                    self._start("index")
                     if "index_length" in info:
                         indices, bit_segments = indexer.divide_all(bit_segments, info["index_length"], self.need_logs)
                     else:
                         indices, bit_segments = indexer.divide_all(bit_segments, None, self.need_logs)
 
-                    bit_segments = indexer.sort_order(indices, bit_segments, self.need_logs)
-
-                if "output_path" in info:
+                    bit_segments = indexer.sort_order(indices, bit_segments, self.need_logs, counts)
+                    self._stop("index", segments=len(bit_segments))
+
+                    if self.outer_correction is not None:
+                        self._start("outer correction")
+                        available_indices = set(indices)
+                        missing_indices = [index for index in range(len(bit_segments))
+                                           if index not in available_indices]
+                        recovered_data = self.outer_correction.remove(bit_segments, missing_indices)
+                        bit_segments = recovered_data["bit"]
+                        self._stop("outer correction", segments=len(bit_segments))
+                        self.records["outer error rate"] = str(round(recovered_data["e_r"] * 100, 2)) + "%"
+                        self.records["outer error indices"] = str(recovered_data["e_i"]).replace(", ", "-") \
+                            if recovered_data["e_i"] != [] else None
+
+                compression = info["compression"] if "compression" in info else self.records.get("compression")
+
+                self._start("write")
+                if "output_directory" in info:
+                    manifest = info["manifest"] if "manifest" in info else self.records.get("manifest")
+                    if manifest is None:
+                        raise ValueError("The \"manifest\" is needed to write the files to the directory!")
+                    chunk_size = info["chunk_size"] if "chunk_size" in info else 65536
+                    data_handle.write_bits_to_files(info["output_directory"], bit_segments, manifest, self.need_logs,
+                                                    compression, chunk_size)
+                elif compression is not None:
+                    self._decompress(info, compression, bit_segments, bit_size)
+                elif "output_path" in info:
                     data_handle.write_bits_to_file(info["output_path"], bit_segments, bit_size, self.need_logs)
                 elif "output_string" in info:
                     string = data_handle.write_bits_to_str(bit_segments, bit_size, self.need_logs)
                     if self.need_logs:
                         print(string)
+                self._stop("write", segments=len(bit_segments), bytes=bit_size // 8)
 
                 return {"bit": bit_segments, "dna": original_dna_sequences}
             else:
@@ -158,6 +325,211 @@ class TranscodePipeline(DefaultPipeline):
         else:
             raise ValueError("Unknown parameter \"direction\", please use \"t_c\" or \"t_s\".")
 
+    def retrieve(self, **info):
+        """
+        introduction: Decode the bytes in the range [start, stop) of the encoded file,
+                      only the DNA sequences carrying the segments of the range are decoded.
+                      The segment indices of the DNA sequences are loaded from the sidecar of the DNA file,
+                      which is written by the transcoding with index or built by one scan of the DNA sequences.
+
+        :param info: "input_path" (DNA file or archive), "start" and "stop" are needed.
+                     "index_length" and "segment_length" (of the digital data) are needed
+                     if they are neither saved in the DNA archive nor recorded by this pipeline.
+
+        :return data: Bytes in the range.
+                      Type: bytes
+        """
+        if "input_path" not in info or "start" not in info or "stop" not in info:
+            raise ValueError("\"input_path\", \"start\" and \"stop\" are needed for the retrieval!")
+
+        dna_sequences, index_length, segment_length = self._open_indexed(info)
+
+        # the byte range of the original data cannot be located in the compressed data.
+        compression = info["compression"] if "compression" in info else self.records.get("compression")
+        if compression is not None:
+            raise ValueError("The byte range cannot be retrieved from the compressed data, "
+                             "please decode the whole file by \"transcode\"!")
+
+        start, stop = max(info["start"], 0), min(info["stop"], self.coding_scheme.bit_size // 8)
+        if start >= stop:
+            return b""
+
+        needed_indices = list(range(start * 8 // segment_length, (stop * 8 - 1) // segment_length + 1))
+        segments = self._decode_indices(info["input_path"], dna_sequences, index_length, needed_indices)
+
+        bits = [bit for index in needed_indices for bit in segments[index]]
+        offset = start * 8 - needed_indices[0] * segment_length
+        return numpy.packbits(numpy.array(bits[offset: offset + (stop - start) * 8], dtype=numpy.uint8)).tobytes()
+
+    def extract(self, **info):
+        """
+        introduction: Decode one file of the multi-file encoding (transcoded with "input_paths"),
+                      only the DNA sequences carrying the segments of the file are decoded.
+
+        :param info: "input_path" (DNA file or archive) and "name" (of the file in the manifest) are needed.
+                     "manifest" is needed if it is neither saved in the DNA archive nor recorded by this pipeline.
+                     The file is written if "output_path" is given.
+
+        :return data: Bytes of the file.
+                      Type: bytes
+        """
+        if "input_path" not in info or "name" not in info:
+            raise ValueError("\"input_path\" and \"name\" are needed for the extraction!")
+
+        dna_sequences, index_length, segment_length = self._open_indexed(info)
+
+        manifest = info["manifest"] if "manifest" in info else self.records.get("manifest")
+        entries = [entry for entry in (manifest if manifest is not None else []) if entry["name"] == info["name"]]
+        if len(entries) == 0:
+            raise ValueError("The file \"" + str(info["name"]) + "\" is not in the manifest!")
+
+        needed_indices = list(range(entries[0]["start"], entries[0]["stop"]))
+        segments = self._decode_indices(info["input_path"], dna_sequences, index_length, needed_indices)
+
+        bits = [bit for index in needed_indices for bit in segments[index]]
+        data = numpy.packbits(numpy.array(bits[: entries[0]["size"] * 8], dtype=numpy.uint8)).tobytes()
+
+        # each file is compressed independently, so it is decompressed alone.
+        compression = info["compression"] if "compression" in info else self.records.get("compression")
+        if compression is not None:
+            chunk_size = info["chunk_size"] if "chunk_size" in info else 65536
+            data = b"".join(data_handle.decompress_chunks([data], compression, chunk_size))
+
+        if "output_path" in info:
+            with open(info["output_path"], "wb") as file:
+                file.write(data)
+
+        return data
+
+    def _open_indexed(self, info):
+        self._start("read")
+        if data_handle.is_dna_archive(info["input_path"]):
+            dna_sequences = data_handle.DNAArchive(info["input_path"])
+            self._restore_archive(dna_sequences.header, info)
+        else:
+            dna_sequences = data_handle.read_dna_file(info["input_path"], self.need_logs)
+        self._stop("read", segments=len(dna_sequences))
+
+        index_length = info["index_length"] if "index_length" in info else self.records.get("index length")
+        segment_length = info["segment_length"] if "segment_length" in info else self.records.get("payload length")
+        if not index_length or segment_length is None or self.coding_scheme.bit_size is None:
+            raise ValueError("The index length, the segment length and the bit size of the encoding are needed!")
+
+        return dna_sequences, index_length, segment_length
+
+    def _decode_indices(self, path, dna_sequences, index_length, needed_indices):
+        self._start("index")
+        sidecar = data_handle.read_index_sidecar(path)
+        if sidecar is None:
+            sidecar = self._scan_indices(dna_sequences, index_length)
+            data_handle.write_index_sidecar(path, sidecar[0], sidecar[1])
+        indices, positions = numpy.array(sidecar[0], dtype=int), numpy.array(sidecar[1], dtype=int)
+        selected_positions = numpy.unique(positions[numpy.isin(indices, needed_indices)]).tolist()
+        self._stop("index", segments=len(selected_positions))
+
+        self._start("decode")
+        segments, needed_indices = {}, set(needed_indices)
+        for bit_segment in self._decode_segments([dna_sequences[position] for position in selected_positions]):
+            index, data = indexer.divide(bit_segment, index_length)
+            if index in needed_indices and index not in segments:
+                segments[index] = data
+        self._stop("decode", segments=len(selected_positions))
+
+        missing_indices = sorted(needed_indices - set(segments.keys()))
+        if missing_indices:
+            raise ValueError("The segments " + str(missing_indices) + " of the range cannot be recovered!")
+
+        return segments
+
+    def _restore_archive(self, header, info):
+        if header["coding scheme"] != type(self.coding_scheme).__name__:
+            raise ValueError("The DNA archive is encoded by " + header["coding scheme"] + ", not "
+                             + type(self.coding_scheme).__name__ + "!")
+
+        # the coding scheme is restored to the parameters of the encoding saved in the archive.
+        for name, value in header["parameters"].items():
+            setattr(self.coding_scheme, name, value)
+        if self.error_correction is not None and self.error_correction.segment_length is None:
+            self.error_correction.segment_length = header["segment length"] - header["error-correction length"]
+        if "index_length" not in info and header["index length"] > 0:
+            info["index_length"] = header["index length"]
+        self.records["payload length"] = header["payload length"]
+        if "manifest" in header:
+            self.records["manifest"] = header["manifest"]
+        if "compression" in header:
+            self.records["compression"] = header["compression"]
+        else:
+            self.records.pop("compression", None)
+
+    def _compress(self, info, segment_length):
+        chunk_size = info["chunk_size"] if "chunk_size" in info else 65536
+        if "input_path" in info:
+            chunks = data_handle.read_chunks(info["input_path"], chunk_size)
+            original_size = os.path.getsize(info["input_path"])
+        elif "input_string" in info:
+            data = bytes(info["input_string"], encoding="utf8")
+            chunks = [data[position: position + chunk_size] for position in range(0, len(data), chunk_size)]
+            original_size = len(data)
+        else:
+            raise ValueError("The compression needs the digital data from \"input_path\" or \"input_string\"!")
+
+        self._start("compression")
+        compressed_data = b"".join(data_handle.compress_chunks(chunks, info["compression"]))
+        self._stop("compression", bytes=original_size)
+
+        self.records["compression"] = info["compression"]
+        self.records["compression ratio"] = round(len(compressed_data) / original_size, 3) if original_size > 0 else 1.0
+
+        return data_handle.read_bits_from_bytes(compressed_data, segment_length, self.need_logs)
+
+    def _decompress(self, info, compression, bit_segments, bit_size):
+        chunk_size = info["chunk_size"] if "chunk_size" in info else 65536
+        bits = numpy.array(bit_segments, dtype=numpy.uint8).reshape(-1)[: bit_size]
+        compressed_data = numpy.packbits(bits).tobytes()
+        chunks = (compressed_data[position: position + chunk_size]
+                  for position in range(0, len(compressed_data), chunk_size))
+
+        self._start("decompression")
+        original_size = 0
+        if "output_path" in info:
+            with open(info["output_path"], "wb") as file:
+                for data in data_handle.decompress_chunks(chunks, compression, chunk_size):
+                    file.write(data)
+                    original_size += len(data)
+        elif "output_string" in info:
+            data = b"".join(data_handle.decompress_chunks(chunks, compression, chunk_size))
+            original_size = len(data)
+            if self.need_logs:
+                print(str(data, encoding="utf8"))
+        self._stop("decompression", bytes=original_size)
+
+    def _decode_segments(self, dna_sequences):
+        if len(dna_sequences) == 0:
+            return []
+
+        results = self.coding_scheme.carbon_to_silicon(dna_sequences, need_erasures=self.error_correction is not None)
+        bit_segments = results["bit"]
+        if self.error_correction is not None and bit_segments:
+            bit_segments = self.error_correction.remove(bit_segments, results.get("e"))["bit"]
+
+        return bit_segments
+
+    def _scan_indices(self, dna_sequences, index_length):
+        if self.need_logs:
+            print("Scan the segment indices of the DNA sequences.")
+
+        # each DNA sequence is decoded alone, so that its segments are located whatever the coding scheme is.
+        indices, positions = [], []
+        for position in range(len(dna_sequences)):
+            for bit_segment in self._decode_segments([dna_sequences[position]]):
+                indices.append(indexer.divide(bit_segment, index_length)[0])
+                positions.append(position)
+
+            if self.need_logs:
+                self.monitor.output(position + 1, len(dna_sequences))
+
+        return indices, positions
+
     def output_records(self, **info):
         if "type" in info:
             if info["type"] == "path":
@@ -198,7 +570,10 @@ class RobustnessPipeline(DefaultPipeline):
         self.nucleotide_mutation = info["nucleotide_mutation"] if "nucleotide_mutation" in info else 0
         self.nucleotide_deletion = info["nucleotide_deletion"] if "nucleotide_deletion" in info else 0
         self.sequence_loss = info["sequence_loss"] if "sequence_loss" in info else 0
+        self.channel = info["channel"] if "channel" in info else None
         self.iterations = info["iterations"] if "iterations" in info else 1
+        self.processes = info["processes"] if "processes" in info else 1
+        self.seed = info["seed"] if "seed" in info else None
 
         self.segment_length = info["segment_length"] if "segment_length" in info else 120
         self.index_length = info["index_length"] if "index_length" in info else None
@@ -221,6 +596,13 @@ class RobustnessPipeline(DefaultPipeline):
             }
         }
 
+        if self.channel is not None:
+            self.records["evaluation parameters"]["perturbation"]["channel"] = {
+                "substitution rate": self.channel.substitution_rate, "insertion rate": self.channel.insertion_rate,
+                "deletion rate": self.channel.deletion_rate, "indel lengths": self.channel.indel_lengths,
+                "dropout": self.channel.dropout, "coverage": self.channel.coverage
+            }
+
     def __init_check__(self):
         super().__init_check__()
         if self.coding_schemes is None:
@@ -260,6 +642,9 @@ class RobustnessPipeline(DefaultPipeline):
         if self.sequence_loss > 1 or self.sequence_loss < 0:
             raise ValueError("Wrong value in the \"sequence_loss\", the value is in the range of [0, 1]!")
 
+        if self.channel is not None and not isinstance(self.channel, ChannelSimulator):
+            raise ValueError("The \"channel\" needs to be ChannelSimulator in utils/channel.py!")
+
         if self.segment_length <= -1 or type(self.segment_length) != int:
             raise ValueError("Wrong value in the \"segment_length\", "
                              "the value is in the range of [-1, +inf) and the type is int!")
@@ -268,9 +653,13 @@ class RobustnessPipeline(DefaultPipeline):
             raise ValueError("Wrong value in the \"iterations\", "
                              "the value is in the range of [1, +inf) and the type is int!")
 
+        if self.processes < 1 or type(self.processes) != int:
+            raise ValueError("Wrong value in the \"processes\", "
+                             "the value is in the range of [1, +inf) and the type is int!")
+
     def evaluate(self):
-        results = {}
-        task_index = 0
+        # each (scheme, error correction, file) is encoded once and shared with the iteration tasks.
+        encoded_tasks = []
         total_task = len(self.coding_schemes) * len(self.error_corrections) * len(self.file_paths)
         for (scheme_name, coding_scheme), needed_index in zip(self.coding_schemes.items(), self.needed_indices):
             for correct_name, error_correction in self.error_corrections.items():
@@ -278,7 +667,7 @@ class RobustnessPipeline(DefaultPipeline):
                     if self.need_logs:
                         print(">" * 50)
                         print("*" * 50)
-                        print("Run task (" + str(task_index + 1) + "/" + str(total_task) + ").")
+                        print("Encode task (" + str(len(encoded_tasks) + 1) + "/" + str(total_task) + ").")
                         print("*" * 50)
 
                     pipeline = TranscodePipeline(coding_scheme=coding_scheme, error_correction=error_correction,
@@ -288,90 +677,76 @@ class RobustnessPipeline(DefaultPipeline):
                                                       segment_length=self.segment_length,
                                                       index=needed_index, index_length=self.index_length)
 
-                    pipeline_logs = []
-                    for iteration in range(self.iterations):
-                        chosen_count = int(len(encoded_data["dna"]) * (1 - self.sequence_loss))
-                        dna_sequences = random.sample(copy.deepcopy(encoded_data["dna"]), chosen_count)
-
-                        total_indices = [sequence_index for sequence_index in range(len(dna_sequences))]
-
-                        # insertion errors
-                        for insertion_iteration in range(int(len(dna_sequences) * self.nucleotide_insertion)):
-                            chosen_index = random.choice(total_indices)
-                            dna_sequences[chosen_index].insert(random.randint(0, len(dna_sequences[chosen_index]) - 1),
-                                                               random.choice(['A', 'C', 'G', 'T']))
-
-                        # mutation errors
-                        for mutation_iteration in range(int(len(dna_sequences) * self.nucleotide_mutation)):
-                            chosen_index = random.choice(total_indices)
-                            chosen_index_in_sequence = random.randint(0, len(dna_sequences[chosen_index]) - 1)
-                            chosen_nucleotide = dna_sequences[chosen_index][chosen_index_in_sequence]
-                            dna_sequences[chosen_index][chosen_index_in_sequence] = \
-                                random.choice(list(filter(lambda nucleotide: nucleotide != chosen_nucleotide,
-                                                          ['A', 'C', 'G', 'T'])))
-
-                        # deletion errors
-                        for deletion_iteration in range(int(len(dna_sequences) * self.nucleotide_deletion)):
-                            chosen_index = random.choice(total_indices)
-                            del dna_sequences[chosen_index][random.randint(0, len(dna_sequences[chosen_index]) - 1)]
-
-                        decoded_data = pipeline.transcode(direction="t_s", input_string=dna_sequences,
-                                                          index=needed_index, index_length=self.index_length)
-
-                        bit_segments = decoded_data["bit"]
-
-                        temps = []
-                        for bit_segment in bit_segments:
-                            if bit_segment is not None:
-                                temps.append(bit_segment)
-                        bit_segments = temps
-
-                        if len(bit_segments) == 0:
-                            bit_segments = None
-
-                        if bit_segments is None:
-                            iter_log = pipeline.output_records()
-                            iter_log["transcoding state"] = False
-                            iter_log["success rate"] = "0.000%"
-                        else:
-                            iter_log = pipeline.output_records()
-                            decoded_bit_segments, encoded_bit_segments = set(), set()
-                            for bit_segment in bit_segments:
-                                decoded_bit_segments.add(str(bit_segment))
-                            for bit_segment in encoded_data["bit"]:
-                                encoded_bit_segments.add(str(bit_segment))
-                            intersection = encoded_bit_segments & decoded_bit_segments
-                            success_count, total_count = len(intersection), len(encoded_bit_segments)
-                            iter_log["transcoding state"] = (total_count == success_count)
-                            iter_log["success count"] = success_count
-                            iter_log["total count"] = total_count
-                            iter_log["success rate"] = str(round(success_count / total_count * 100, 3)) + "%"
-
-                        string = scheme_name + ", " + correct_name + ", " + file_name + ", "
-                        string += str(iter_log["information density"]) + ", "
-                        string += str(iter_log["encoding runtime"]) + ", "
-                        string += str(iter_log["decoding runtime"]) + ", "
-                        string += str(iter_log["transcoding state"]) + ", "
-                        string += str(iter_log["success count"]) + ", "
-                        string += str(iter_log["total count"]) + ", "
-                        string += str(iter_log["success rate"])
-                        if self.need_logs:
-                            print(string)
-                        pipeline_logs.append(iter_log)
-
-                    result = {
-                        "coding scheme": scheme_name, "error-correction": correct_name,
-                        "file": file_name, "result": pipeline_logs
-                    }
-                    results["task " + str(task_index)] = result
-                    task_index += 1
+                    # the coding scheme and the error correction keep the state of this encoding (such as the
+                    # segment length and the index length), which is overwritten by the next encoding if shared.
+                    pipeline.coding_scheme = copy.deepcopy(coding_scheme)
+                    pipeline.error_correction = copy.deepcopy(error_correction)
+
+                    # the logs of decoding are too many in the iterations.
+                    pipeline.need_logs = False
+                    encoded_tasks.append({
+                        "coding scheme": scheme_name, "error-correction": correct_name, "file": file_name,
+                        "pipeline": pipeline, "index": needed_index, "encoded data": encoded_data
+                    })
 
                     if self.need_logs:
                         print(">" * 50)
                         print()
 
+        seed_generator = random.Random(self.seed) if self.seed is not None else random
+        tasks = []
+        for task_index in range(len(encoded_tasks)):
+            for iteration in range(self.iterations):
+                tasks.append((task_index, iteration, seed_generator.randint(0, 2 ** 32 - 1)))
+
+        parameters = {
+            "nucleotide insertion": self.nucleotide_insertion, "nucleotide mutation": self.nucleotide_mutation,
+            "nucleotide deletion": self.nucleotide_deletion, "sequence loss": self.sequence_loss,
+            "index length": self.index_length, "channel": self.channel
+        }
+
+        if self.need_logs:
+            print("Run " + str(len(tasks)) + " iteration tasks by " + str(self.processes) + " process(es).")
+
+        pipeline_logs = [[None] * self.iterations for _ in range(len(encoded_tasks))]
+        if self.processes > 1:
+            with Pool(self.processes, initializer=_share_robustness_data, initargs=(encoded_tasks, parameters)) as pool:
+                for (task_index, iteration, _), iter_log in zip(tasks, pool.imap(_evaluate_robustness, tasks)):
+                    pipeline_logs[task_index][iteration] = iter_log
+                    self._output_iteration(encoded_tasks[task_index], iter_log)
+        else:
+            _share_robustness_data(encoded_tasks, parameters)
+            for task in tasks:
+                iter_log = _evaluate_robustness(task)
+                pipeline_logs[task[0]][task[1]] = iter_log
+                self._output_iteration(encoded_tasks[task[0]], iter_log)
+            _share_robustness_data(None, None)
+
+        results = {}
+        for task_index, encoded_task in enumerate(encoded_tasks):
+            results["task " + str(task_index)] = {
+                "coding scheme": encoded_task["coding scheme"], "error-correction": encoded_task["error-correction"],
+                "file": encoded_task["file"], "result": pipeline_logs[task_index]
+            }
+
         self.records["results"] = results
 
+        if self.store is not None:
+            self.store.append_robustness(self.store.create_run("robustness"), results)
+
+    def _output_iteration(self, encoded_task, iter_log):
+        if self.need_logs:
+            string = encoded_task["coding scheme"] + ", " + encoded_task["error-correction"] + ", "
+            string += encoded_task["file"] + ", "
+            string += str(iter_log["information density"]) + ", "
+            string += str(iter_log["encoding runtime"]) + ", "
+            string += str(iter_log["decoding runtime"]) + ", "
+            string += str(iter_log["transcoding state"]) + ", "
+            string += str(iter_log["success count"]) + ", "
+            string += str(iter_log["total count"]) + ", "
+            string += str(iter_log["success rate"])
+            print(string)
+
     def output_records(self, **info):
         if "type" in info:
             param_names = []
@@ -477,6 +852,7 @@ class BasicFeaturePipeline(DefaultPipeline):
     def calculate(self):
         results = {}
         task_index = 0
+        run = self.store.create_run("feature") if self.store is not None else None
         total_task = len(self.coding_schemes) * len(self.file_paths)
         for file_name, file_path in self.file_paths.items():
             original_bit_segments, bit_size = data_handle.read_bits_from_file(file_path,
@@ -499,23 +875,10 @@ class BasicFeaturePipeline(DefaultPipeline):
 
                 dna_sequences = coding_scheme.silicon_to_carbon(bit_segments, bit_size)["dna"]
 
-                gc_distribution = [0 for _ in range(101)]
-                homo_distribution = [0 for _ in range(max(list(map(len, dna_sequences))))]
-
-                for dna_sequence in dna_sequences:
-                    dna_segment = "".join(dna_sequence)
-                    gc_content = int(((dna_segment.count("C") + dna_segment.count("G")) / len(dna_segment) * 100) + 0.5)
-                    gc_distribution[gc_content] += 1
-                    for homo_length in [homo + 1 for homo in range(len(dna_sequence))][::-1]:
-                        is_find = False
-                        missing_segments = ["A" * homo_length, "C" * homo_length, "G" * homo_length, "T" * homo_length]
-                        for missing_segment in missing_segments:
-                            if missing_segment in dna_segment:
-                                is_find = True
-                                homo_distribution[homo_length] += 1
-                                break
-                        if is_find:
-                            break
+                statistics = FeatureStatistics()
+                statistics.update(dna_sequences)
+                gc_distribution = statistics.gc_distribution()
+                homo_distribution = statistics.homopolymer_distribution()
                 if self.need_logs:
                     print(">" * 50)
                     print()
@@ -526,6 +889,9 @@ class BasicFeaturePipeline(DefaultPipeline):
                     "gc": str(gc_distribution).replace(", ", "-"),
                     "homo": str(homo_distribution).replace(", ", "-")
                 }
+                if self.store is not None:
+                    self.store.append_features(run, "task " + str(task_index), scheme_name, file_name,
+                                               gc_distribution, homo_distribution)
                 task_index += 1
 
         self.records["results"] = results
@@ -588,6 +954,11 @@ class OptimalChoicePipeline(DefaultPipeline):
                 raise ValueError("\"coding_scheme \" " + str(name) + "[" + str(type(coding_scheme))
                                  + "] needs to inherit AbstractCodingScheme in methods/default.py!")
 
+        if self.store is not None:
+            if not isinstance(self.store, ResultStore):
+                raise ValueError("The \"store\" needs to be ResultStore in utils/results.py!")
+            return
+
         if self.feature_log_path is None:
             raise ValueError("\"feature_log_path\" must be available!")
 
@@ -601,6 +972,56 @@ class OptimalChoicePipeline(DefaultPipeline):
         homopolymer_results = {}
         recover_results = {}
 
+        if self.store is not None:
+            # the typed columns are queried directly, without parsing the log files.
+            for name, gc in self.store.histograms("gc"):
+                gc = gc / numpy.sum(gc)
+                gc_suitable_rate_results.setdefault(name, []).append(numpy.sum(gc[41: 61]))
+                gc_bias_results.setdefault(name, []).append(max(numpy.nonzero(gc)[0][-1] - 51,
+                                                                51 - numpy.nonzero(gc)[0][0]))
+            for name, ho in self.store.histograms("homopolymer"):
+                homopolymer_results.setdefault(name, []).append(numpy.nonzero(ho)[0][-1])
+            for name, information_density, recover in self.store.query(
+                    "SELECT coding_scheme, information_density, CAST(success_count AS REAL) / total_count "
+                    "FROM robustness"):
+                information_density_results.setdefault(name, []).append(information_density)
+                recover_results.setdefault(name, []).append(recover)
+        else:
+            self._read_logs(information_density_results, gc_suitable_rate_results, gc_bias_results,
+                            homopolymer_results, recover_results)
+
+        names = set()
+        for name, value in gc_suitable_rate_results.items():
+            names.add(name)
+        for name, value in recover_results.items():
+            names.add(name)
+
+        title = [
+            "scheme id", "coding scheme", "average information density",
+            "GC content within 40% - 60%", "maximum bias of GC content", "maximum homopolymer",
+            "average recover rate"
+        ]
+
+        record_group = [title]
+        for index, name in enumerate(list(names)):
+            one_record = [
+                str(index + 1), name,
+                str(numpy.mean(numpy.array(information_density_results[name]))),
+                str(round(numpy.mean(numpy.array(gc_suitable_rate_results[name])) * 100, 2)) + "%",
+                str(round(numpy.max(numpy.array(gc_bias_results[name])), 2)) + "%",
+                str(numpy.max(numpy.array(homopolymer_results[name]))) + "nt",
+                str(round(numpy.mean(numpy.array(recover_results[name])) * 100, 2)) + "%"
+            ]
+            record_group.append(one_record)
+
+        print("Evaluation results.")
+        table_instance = AsciiTable(record_group, title)
+        for i in range(len(title)):
+            table_instance.justify_columns[i] = 'center'
+        print(table_instance.table)
+
+    def _read_logs(self, information_density_results, gc_suitable_rate_results, gc_bias_results,
+                   homopolymer_results, recover_results):
         with open(self.feature_log_path, "r") as file:
             rows = csv.reader(file)
             for index, row in enumerate(rows):
@@ -641,36 +1062,6 @@ class OptimalChoicePipeline(DefaultPipeline):
                     else:
                         recover_results[name] = [recover]
 
-        names = set()
-        for name, value in gc_suitable_rate_results.items():
-            names.add(name)
-        for name, value in recover_results.items():
-            names.add(name)
-
-        title = [
-            "scheme id", "coding scheme", "average information density",
-            "GC content within 40% - 60%", "maximum bias of GC content", "maximum homopolymer",
-            "average recover rate"
-        ]
-
-        record_group = [title]
-        for index, name in enumerate(list(names)):
-            one_record = [
-                str(index + 1), name,
-                str(numpy.mean(numpy.array(information_density_results[name]))),
-                str(round(numpy.mean(numpy.array(gc_suitable_rate_results[name])) * 100, 2)) + "%",
-                str(round(numpy.max(numpy.array(gc_bias_results[name])), 2)) + "%",
-                str(numpy.max(numpy.array(homopolymer_results[name]))) + "nt",
-                str(round(numpy.mean(numpy.array(recover_results[name])) * 100, 2)) + "%"
-            ]
-            record_group.append(one_record)
-
-        print("Evaluation results.")
-        table_instance = AsciiTable(record_group, title)
-        for i in range(len(title)):
-            table_instance.justify_columns[i] = 'center'
-        print(table_instance.table)
-
     def output_records(self, **info):
         selected_coding_scheme = self.coding_schemes[info["selected_coding_scheme"]]
         pipeline = TranscodePipeline(coding_scheme=selected_coding_scheme, error_correction=info["error_correction"],
@@ -683,3 +1074,520 @@ class OptimalChoicePipeline(DefaultPipeline):
             "information density": pipeline.records["information density"],
             "encoding runtime": pipeline.records["encoding runtime"]
         }
+
+
+class RuleSelectionPipeline(DefaultPipeline):
+
+    def __init__(self, **info):
+        super().__init__(**info)
+
+        self.coding_scheme = info["coding_scheme"] if "coding_scheme" in info else YinYangCode()
+        self.file_path = info["file_path"] if "file_path" in info else None
+
+        self.rule_indices = info["rule_indices"] if "rule_indices" in info else None
+        self.sample_count = info["sample_count"] if "sample_count" in info else 1000
+        self.processes = info["processes"] if "processes" in info else 1
+        self.seed = info["seed"] if "seed" in info else 30
+
+        self.segment_length = info["segment_length"] if "segment_length" in info else 120
+        self.index = info["index"] if "index" in info else True
+        self.index_length = info["index_length"] if "index_length" in info else None
+
+        self.__init_check__()
+
+        if self.rule_indices is None:
+            self.rule_indices = list(range(len(load_yyc_rules()[0])))
+
+        self.records = {
+            "selection parameters": {
+                "evaluated file": self.file_path,
+                "evaluated rules": len(self.rule_indices),
+                "sample count": self.sample_count,
+                "segment length": self.segment_length
+            }
+        }
+
+    def __init_check__(self):
+        super().__init_check__()
+        if not isinstance(self.coding_scheme, YinYangCode):
+            raise ValueError("The \"coding_scheme\" needs to be YinYangCode in methods/flowed.py!")
+
+        if self.file_path is None:
+            raise ValueError("No digital file path!")
+        if not os.path.exists(self.file_path):
+            raise ValueError("The path of digital file " + self.file_path + " does not exist!")
+
+        if self.sample_count < 1 or type(self.sample_count) != int:
+            raise ValueError("Wrong value in the \"sample_count\", "
+                             "the value is in the range of [1, +inf) and the type is int!")
+
+        if self.processes < 1 or type(self.processes) != int:
+            raise ValueError("Wrong value in the \"processes\", "
+                             "the value is in the range of [1, +inf) and the type is int!")
+
+        if self.segment_length <= -1 or type(self.segment_length) != int:
+            raise ValueError("Wrong value in the \"segment_length\", "
+                             "the value is in the range of [-1, +inf) and the type is int!")
+
+    def search(self):
+        bit_segments, bit_size = data_handle.read_bits_from_file(self.file_path, self.segment_length, self.need_logs)
+
+        if self.index:
+            bit_segments, _ = indexer.connect_all(bit_segments, self.index_length, self.need_logs)
+
+        random.seed(self.seed)
+        if len(bit_segments) > self.sample_count:
+            sample_indices = sorted(random.sample(range(len(bit_segments)), self.sample_count))
+            bit_segments = [bit_segments[index] for index in sample_indices]
+
+        if self.need_logs:
+            print("Trial-encode " + str(len(bit_segments)) + " sampled bit segments by "
+                  + str(len(self.rule_indices)) + " Yin-Yang rules.")
+
+        parameters = {
+            "max_iterations": self.coding_scheme.max_iterations, "max_ratio": self.coding_scheme.max_ratio,
+            "faster": self.coding_scheme.faster, "max_homopolymer": self.coding_scheme.max_homopolymer,
+            "max_content": self.coding_scheme.max_content
+        }
+        tasks = [(rule_index, bit_segments, parameters, self.seed) for rule_index in self.rule_indices]
+
+        results = []
+        if self.processes > 1:
+            with Pool(self.processes) as pool:
+                for result in pool.imap(_evaluate_yyc_rule, tasks, chunksize=max(1, len(tasks) // (self.processes * 8))):
+                    results.append(result)
+                    if self.need_logs:
+                        self.monitor.output(len(results), len(tasks))
+        else:
+            for task in tasks:
+                results.append(_evaluate_yyc_rule(task))
+                if self.need_logs:
+                    self.monitor.output(len(results), len(tasks))
+
+        # fewer oligos first, then the more balanced and synthesizable sequences.
+        # the maximum GC bias and the maximum homopolymer are saturated by the screening,
+        # so the averages over the sequences are compared, and the rule index makes the order deterministic.
+        # the rules failing to encode the sampled segments are ranked last.
+        results.sort(key=lambda result: (result["additional count"] is None, result["additional count"] or 0,
+                                         result["mean gc bias"] or 0, result["homopolymer limit count"] or 0,
+                                         result["rule index"]))
+
+        self.records["results"] = results
+
+        if self.store is not None:
+            self.store.append_records("rules", self.store.create_run("rule selection"), results)
+
+        best_result = results[0]
+        if best_result["additional count"] is None:
+            raise ValueError("No evaluated Yin-Yang rule can encode the sampled bit segments!")
+        if self.need_logs:
+            print("The best rule is " + str(best_result["rule"]) + " (index " + str(best_result["rule index"]) + ").")
+
+        return {"index": best_result["rule index"], "rule": best_result["rule"]}
+
+    def output_records(self, **info):
+        if "type" in info:
+            param_names = []
+            param_values = []
+
+            for key, value in self.records["selection parameters"].items():
+                param_names.append(key)
+                param_values.append(value)
+
+            result_names = [
+                "rank", "rule index", "rule", "additional count", "mean gc bias", "homopolymer limit count",
+                "gc bias", "maximum homopolymer", "encoding runtime"
+            ]
+            result_data_group = []
+            for rank, data in enumerate(self.records["results"]):
+                result_data_group.append([
+                    rank + 1, data["rule index"], str(data["rule"]).replace(", ", "-"), data["additional count"],
+                    data["mean gc bias"], data["homopolymer limit count"], data["gc bias"],
+                    data["maximum homopolymer"], data["encoding runtime"]
+                ])
+
+            if info["type"] == "path":
+                if "path" in info:
+                    with open(info["path"], "w", encoding="utf-8") as save_file:
+                        save_file.write(str(param_names)[1: -1].replace("\'", "") + "\n")
+                        save_file.write(str(param_values)[1: -1].replace("\'", "") + "\n")
+                        save_file.write(str(result_names)[1: -1].replace("\'", "") + "\n")
+                        for result_data in result_data_group:
+                            save_file.write(str(result_data)[1: -1].replace("\'", "") + "\n")
+                else:
+                    raise ValueError("\"path\" is unknown!")
+            elif info["type"] == "string":
+                if self.need_logs:
+                    top = info["top"] if "top" in info else 10
+                    print("Rule selection results.")
+                    record_group = [result_names] + [list(map(str, data)) for data in result_data_group[:top]]
+                    table_instance = AsciiTable(record_group)
+                    for index in range(len(result_names)):
+                        table_instance.justify_columns[index] = "center"
+                    print(table_instance.table)
+
+        return self.records
+
+
+class BenchmarkPipeline(DefaultPipeline):
+
+    def __init__(self, **info):
+        super().__init__(**info)
+
+        self.coding_schemes = info["coding_schemes"] if "coding_schemes" in info else None
+        self.error_corrections = info["error_corrections"] if "error_corrections" in info else None
+        self.needed_indices = info["needed_indices"] if "needed_indices" in info else None
+
+        self.data_sizes = info["data_sizes"] if "data_sizes" in info else [4096]
+        self.entropies = info["entropies"] if "entropies" in info else [8.0]
+        self.repeats = info["repeats"] if "repeats" in info else 3
+        self.seed = info["seed"] if "seed" in info else 30
+        self.need_memory = info["need_memory"] if "need_memory" in info else True
+
+        self.segment_length = info["segment_length"] if "segment_length" in info else 120
+        self.index_length = info["index_length"] if "index_length" in info else 16
+
+        self.__init_check__()
+
+        self.records = {
+            "benchmark parameters": {
+                "evaluated coding schemes": list(self.coding_schemes.keys()),
+                "evaluated error correction": list(self.error_corrections.keys()),
+                "data sizes": self.data_sizes,
+                "entropies": self.entropies,
+                "repeats": self.repeats,
+                "seed": self.seed,
+                "segment length": self.segment_length,
+                "index length": self.index_length
+            }
+        }
+
+    def __init_check__(self):
+        super().__init_check__()
+        if self.coding_schemes is None:
+            raise ValueError("No coding scheme!")
+        for name, coding_scheme in self.coding_schemes.items():
+            if not isinstance(coding_scheme, AbstractCodingAlgorithm):
+                raise ValueError("\"coding_scheme \" " + str(name) + "[" + str(type(coding_scheme))
+                                 + "] needs to inherit AbstractCodingScheme in methods/default.py!")
+
+        if self.error_corrections is None:
+            raise ValueError("No error correction!")
+        for name, error_correction in self.error_corrections.items():
+            if error_correction is not None and not isinstance(error_correction, AbstractErrorCorrectionCode):
+                raise ValueError("\"error_correction \" " + str(name) + "[" + str(type(error_correction))
+                                 + "] needs to inherit AbstractErrorCorrectionCode in methods/default.py!")
+
+        if self.needed_indices is None:
+            raise ValueError("Whether each coding scheme needs \"index\" needs to be explained!")
+        if len(self.coding_schemes) != len(self.needed_indices):
+            raise ValueError("Coding scheme and its index requirements need to be matched one by one!")
+
+        for data_size in self.data_sizes:
+            if data_size < 1 or type(data_size) != int:
+                raise ValueError("Wrong value in the \"data_sizes\", "
+                                 "the value is in the range of [1, +inf) and the type is int!")
+        for entropy in self.entropies:
+            if entropy < 0 or entropy > 8:
+                raise ValueError("Wrong value in the \"entropies\", the value is in the range of [0, 8]!")
+
+        if self.repeats < 1 or type(self.repeats) != int:
+            raise ValueError("Wrong value in the \"repeats\", "
+                             "the value is in the range of [1, +inf) and the type is int!")
+
+    def evaluate(self):
+        results, run = [], None
+        with tempfile.TemporaryDirectory() as folder_path:
+            input_path = os.path.join(folder_path, "input.bin")
+            dna_path = os.path.join(folder_path, "encoded.dna")
+            output_path = os.path.join(folder_path, "output.bin")
+
+            for (scheme_name, coding_scheme), needed_index in zip(self.coding_schemes.items(), self.needed_indices):
+                for correct_name, error_correction in self.error_corrections.items():
+                    for data_size in self.data_sizes:
+                        for entropy in self.entropies:
+                            with open(input_path, "wb") as file:
+                                file.write(_synthetic_bytes(data_size, entropy, self.seed))
+
+                            result = {
+                                "coding scheme": scheme_name, "error-correction": correct_name,
+                                "data size": data_size, "entropy": entropy
+                            }
+                            repeat_results = []
+                            for repeat in range(self.repeats):
+                                random.seed(self.seed + repeat)
+                                repeat_results.append(self._run(coding_scheme, error_correction, needed_index,
+                                                                input_path, dna_path, output_path))
+                            # the fastest successful repeat is recorded.
+                            result.update(min(repeat_results, key=lambda data: (not data["transcoding state"],
+                                                                                data["total runtime"])))
+                            if self.need_memory:
+                                # the memory is traced in an additional run, which keeps the timed repeats unbiased.
+                                random.seed(self.seed)
+                                traced_result = self._run(coding_scheme, error_correction, needed_index,
+                                                          input_path, dna_path, output_path, trace_memory=True)
+                                result["peak traced memory"] = traced_result["peak traced memory"]
+                            results.append(result)
+
+                            if self.store is not None:
+                                if run is None:
+                                    run = self.store.create_run("benchmark")
+                                self.store.append_records("benchmark", run, [result])
+
+                            if self.need_logs:
+                                print(scheme_name + ", " + correct_name + ", " + str(data_size) + " bytes, entropy "
+                                      + str(entropy) + ": " + str(result["transcoding state"]) + ", "
+                                      + str(result["encoding runtime"]) + " s, " + str(result["decoding runtime"])
+                                      + " s.")
+
+        self.records["results"] = results
+
+        return results
+
+    def _run(self, coding_scheme, error_correction, needed_index, input_path, dna_path, output_path,
+             trace_memory=False):
+        # the peak traced memory (in KB) is the peak of the memory allocated by Python (and numpy) during this task,
+        # traced by tracemalloc, rather than the resident set size of the process.
+        encode_instrument, decode_instrument = Instrument(need_memory=False), Instrument(need_memory=False)
+        tracing, start_memory = tracemalloc.is_tracing(), 0
+        if trace_memory:
+            if tracing:
+                tracemalloc.reset_peak()
+                start_memory = tracemalloc.get_traced_memory()[0]
+            else:
+                tracemalloc.start()
+        result = {"transcoding state": False, "error": None, "peak traced memory": None}
+        try:
+            pipeline = TranscodePipeline(coding_scheme=coding_scheme, error_correction=error_correction,
+                                         instrument=encode_instrument)
+            encoded_data = pipeline.transcode(direction="t_c", input_path=input_path, output_path=dna_path,
+                                              segment_length=self.segment_length, index=needed_index,
+                                              index_length=self.index_length)
+            pipeline.instrument = decode_instrument
+            decoded_data = pipeline.transcode(direction="t_s", input_path=dna_path, output_path=output_path,
+                                              index=needed_index, index_length=self.index_length)
+            with open(input_path, "rb") as input_file, open(output_path, "rb") as output_file:
+                result["transcoding state"] = input_file.read() == output_file.read() \
+                    and decoded_data["bit"] is not None and len(encoded_data["dna"]) > 0
+        except (ValueError, IndexError, KeyError, ZeroDivisionError) as error:
+            result["error"] = str(error)
+        finally:
+            if trace_memory:
+                result["peak traced memory"] = (tracemalloc.get_traced_memory()[1] - start_memory) // 1024
+                if not tracing:
+                    tracemalloc.stop()
+
+        encoding_stages = {record["stage"]: record for record in encode_instrument.records}
+        decoding_stages = {record["stage"]: record for record in decode_instrument.records}
+        result["encoding stages"] = {stage: record["runtime"] for stage, record in encoding_stages.items()}
+        result["decoding stages"] = {stage: record["runtime"] for stage, record in decoding_stages.items()}
+        result["encoding runtime"] = sum(result["encoding stages"].values())
+        result["decoding runtime"] = sum(result["decoding stages"].values())
+        result["total runtime"] = result["encoding runtime"] + result["decoding runtime"]
+
+        bit_size = encoding_stages["read"]["bytes"] * 8 if "read" in encoding_stages else 0
+        encoding_record = encoding_stages["encode"] if "encode" in encoding_stages else None
+        decoding_record = decoding_stages["decode"] if "decode" in decoding_stages else None
+        if encoding_record is not None and encoding_record["runtime"] > 0:
+            result["encoding bit throughput"] = bit_size / encoding_record["runtime"]
+            result["encoding nucleotide throughput"] = encoding_record["nucleotides"] / encoding_record["runtime"]
+        if decoding_record is not None and decoding_record["runtime"] > 0:
+            result["decoding bit throughput"] = bit_size / decoding_record["runtime"]
+            result["decoding nucleotide throughput"] = decoding_record["nucleotides"] / decoding_record["runtime"]
+
+        return result
+
+    def compare(self, baseline_path, tolerance=0.1):
+        """
+        introduction: Compare the results with the saved baseline (outputted by "output_records" with the type "path").
+
+        :param baseline_path: Path of the saved baseline.
+
+        :param tolerance: Tolerance of the slowdown, the task is regarded as the regression if its speedup
+                          (baseline runtime / current runtime) is less than 1 - tolerance.
+
+        :return comparison: Speedups of the tasks in both the baseline and the current results.
+                            Type: list(dict)
+        """
+        with open(baseline_path, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+
+        def task_key(data):
+            return data["coding scheme"], data["error-correction"], data["data size"], data["entropy"]
+
+        baseline_results = {task_key(data): data for data in baseline["results"]}
+        comparison = []
+        for data in self.records["results"]:
+            if task_key(data) not in baseline_results:
+                continue
+
+            baseline_data = baseline_results[task_key(data)]
+            one_comparison = {
+                "coding scheme": data["coding scheme"], "error-correction": data["error-correction"],
+                "data size": data["data size"], "entropy": data["entropy"]
+            }
+            for field in ["encoding runtime", "decoding runtime", "total runtime"]:
+                speed_field = field.replace("runtime", "speedup")
+                if data[field] > 0 and baseline_data[field] > 0:
+                    one_comparison[speed_field] = baseline_data[field] / data[field]
+                else:
+                    one_comparison[speed_field] = None
+            one_comparison["regression"] = one_comparison["total speedup"] is not None \
+                and one_comparison["total speedup"] < 1 - tolerance
+            comparison.append(one_comparison)
+
+        self.records["comparison"] = comparison
+
+        return comparison
+
+    def output_records(self, **info):
+        if "type" in info:
+            if info["type"] == "path":
+                if "path" in info:
+                    with open(info["path"], "w", encoding="utf-8") as save_file:
+                        json.dump(self.records, save_file, indent=2)
+                else:
+                    raise ValueError("\"path\" is unknown!")
+            elif info["type"] == "string":
+                if self.need_logs:
+                    result_names = ["coding scheme", "error-correction", "data size", "entropy", "transcoding state",
+                                    "encoding runtime", "decoding runtime", "encoding bit throughput",
+                                    "peak traced memory"]
+                    record_group = [result_names]
+                    for data in self.records["results"]:
+                        record_group.append([str(round(data[name], 3)) if type(data.get(name)) == float
+                                             else str(data.get(name)) for name in result_names])
+                    if "comparison" in self.records:
+                        result_names.append("total speedup")
+                        speedups = {(data["coding scheme"], data["error-correction"], data["data size"],
+                                     data["entropy"]): data["total speedup"] for data in self.records["comparison"]}
+                        for record, data in zip(record_group[1:], self.records["results"]):
+                            speedup = speedups.get((data["coding scheme"], data["error-correction"],
+                                                    data["data size"], data["entropy"]))
+                            record.append(str(round(speedup, 3)) if speedup is not None else "None")
+                    print("Benchmark results.")
+                    table_instance = AsciiTable(record_group)
+                    for index in range(len(result_names)):
+                        table_instance.justify_columns[index] = "center"
+                    print(table_instance.table)
+
+        return self.records
+
+
+def _evaluate_yyc_rule(task):
+    rule_index, bit_segments, parameters, seed = task
+    [support_base, yang_rule, yin_rule] = get_yyc_rule_by_index(rule_index)
+
+    random.seed(seed)
+    coding_scheme = YinYangCode(yang_rule=yang_rule, yin_rule=yin_rule, virtual_nucleotide=support_base,
+                                **parameters)
+
+    start_time = datetime.now()
+    try:
+        dna_sequences = coding_scheme.encode(copy.deepcopy(bit_segments))
+    except ValueError:
+        return {
+            "rule index": rule_index, "rule": [support_base, yang_rule, yin_rule], "additional count": None,
+            "mean gc bias": None, "homopolymer limit count": None, "gc bias": None, "maximum homopolymer": None,
+            "encoding runtime": round((datetime.now() - start_time).total_seconds(), 3)
+        }
+    encoding_runtime = (datetime.now() - start_time).total_seconds()
+
+    nucleotide_codes = to_nucleotide_codes(dna_sequences)
+    gc_biases = numpy.abs(screen.gc_contents(nucleotide_codes) - 0.5)
+    homopolymer_lengths = screen.homopolymer_lengths(nucleotide_codes)
+
+    return {
+        "rule index": rule_index, "rule": [support_base, yang_rule, yin_rule],
+        "additional count": len(dna_sequences) * 2 - len(bit_segments),
+        "mean gc bias": round(float(numpy.mean(gc_biases)), 6),
+        "homopolymer limit count": int(numpy.sum(homopolymer_lengths >= parameters["max_homopolymer"])),
+        "gc bias": round(float(numpy.max(gc_biases)), 3),
+        "maximum homopolymer": int(numpy.max(homopolymer_lengths)),
+        "encoding runtime": round(encoding_runtime, 3)
+    }
+
+
+def _archive_parameters(coding_scheme):
+    # the parameters (including the rules and the tables) saved in the DNA archive are the ones kept by JSON as is.
+    parameters = {}
+    for name, value in vars(coding_scheme).items():
+        if name == "need_logs" or value is None or type(value) not in [bool, int, float, str, list, dict]:
+            continue
+        if type(value) in [list, dict] and json.loads(json.dumps(value)) != value:
+            continue
+        parameters[name] = value
+
+    return parameters
+
+
+_robustness_data = {"tasks": None, "parameters": None}
+
+
+def _share_robustness_data(encoded_tasks, parameters):
+    # the encoded data is shared read-only with the worker processes once, rather than with each task.
+    _robustness_data["tasks"] = encoded_tasks
+    _robustness_data["parameters"] = parameters
+
+
+def _evaluate_robustness(task):
+    task_index, iteration, seed = task
+    encoded_task, parameters = _robustness_data["tasks"][task_index], _robustness_data["parameters"]
+    pipeline, encoded_data = encoded_task["pipeline"], encoded_task["encoded data"]
+
+    random.seed(seed)
+    if parameters["channel"] is not None:
+        dna_sequences = parameters["channel"].simulate(encoded_data["dna"], seed=seed)["dna"]
+    else:
+        chosen_count = int(len(encoded_data["dna"]) * (1 - parameters["sequence loss"]))
+        dna_sequences = copy.deepcopy(random.sample(encoded_data["dna"], chosen_count))
+
+        total_indices = [sequence_index for sequence_index in range(len(dna_sequences))]
+
+        # insertion errors
+        for insertion_iteration in range(int(len(dna_sequences) * parameters["nucleotide insertion"])):
+            chosen_index = random.choice(total_indices)
+            dna_sequences[chosen_index].insert(random.randint(0, len(dna_sequences[chosen_index]) - 1),
+                                               random.choice(['A', 'C', 'G', 'T']))
+
+        # mutation errors
+        for mutation_iteration in range(int(len(dna_sequences) * parameters["nucleotide mutation"])):
+            chosen_index = random.choice(total_indices)
+            chosen_index_in_sequence = random.randint(0, len(dna_sequences[chosen_index]) - 1)
+            chosen_nucleotide = dna_sequences[chosen_index][chosen_index_in_sequence]
+            dna_sequences[chosen_index][chosen_index_in_sequence] = \
+                random.choice(list(filter(lambda nucleotide: nucleotide != chosen_nucleotide, ['A', 'C', 'G', 'T'])))
+
+        # deletion errors
+        for deletion_iteration in range(int(len(dna_sequences) * parameters["nucleotide deletion"])):
+            chosen_index = random.choice(total_indices)
+            del dna_sequences[chosen_index][random.randint(0, len(dna_sequences[chosen_index]) - 1)]
+
+    decoded_data = pipeline.transcode(direction="t_s", input_string=dna_sequences,
+                                      index=encoded_task["index"], index_length=parameters["index length"])
+
+    bit_segments = decoded_data["bit"] if decoded_data["bit"] is not None else []
+
+    # the decoded bit segments are sorted by the indices if the index is used.
+    scores = recovery.score_recovery(encoded_data["bit"], bit_segments, ordered=encoded_task["index"])
+
+    # the records of the pipeline are copied, because the pipeline is reused by the next iteration.
+    iter_log = dict(pipeline.output_records())
+    success_count, total_count = scores["recovered count"], len(encoded_data["bit"])
+    iter_log["transcoding state"] = (total_count == success_count)
+    iter_log["success count"] = success_count
+    iter_log["total count"] = total_count
+    iter_log["success rate"] = str(round(success_count / total_count * 100, 3)) + "%"
+    iter_log["missing count"] = scores["missing count"]
+    iter_log["corrupted count"] = scores["corrupted count"]
+    iter_log["bit errors"] = int(numpy.sum(scores["bit errors"][scores["status"] == recovery.corrupted]))
+    iter_log["segment status"] = scores["status"]
+
+    return iter_log
+
+
+def _synthetic_bytes(data_size, entropy, seed):
+    # uniform bytes over 2^entropy symbols, the Shannon entropy of which is "entropy" bits per byte.
+    symbol_count = max(1, int(round(2 ** entropy)))
+    generator = numpy.random.default_rng(seed)
+    return generator.integers(0, symbol_count, size=data_size).astype(numpy.uint8).tobytes()
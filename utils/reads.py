@@ -0,0 +1,329 @@
+import zlib
+from multiprocessing import Pool
+
+from Chamaeleo.utils.monitor import Monitor
+
+_packing_table = str.maketrans("ACGT", "0123")
+_nucleotide_codes = {"A": 0, "C": 1, "G": 2, "T": 3}
+
+
+def pack(dna_sequence):
+    """
+    introduction: Pack the DNA sequence into an integer (2 bits per nucleotide), the leading 1 keeps the length.
+                  The sequence containing the nucleotide outside "A", "C", "G" and "T" is kept as a string.
+
+    :param dna_sequence: DNA sequence.
+                         Type: list(str) or str
+
+    :return key: Packed DNA sequence.
+                 Type: int or str
+    """
+    string = "".join(dna_sequence)
+    try:
+        return int("1" + string.translate(_packing_table), 4)
+    except ValueError:
+        return string
+
+
+def collapse(dna_sequences, need_logs=False):
+    """
+    introduction: Collapse the identical reads, the first occurrence of each read is kept.
+
+    :param dna_sequences: Reads from the sequencing.
+                          Type: Two-dimensional list(str)
+
+    :param need_logs: Show the process of collapsing.
+
+    :return unique_sequences: Unique reads in the order of their first occurrence.
+                              Type: Two-dimensional list(str)
+
+    :return counts: Copy number of each unique read.
+                    Type: list(int)
+    """
+    if need_logs:
+        print("Collapse the identical reads.")
+
+    monitor = Monitor()
+    positions, unique_sequences, counts = {}, [], []
+    for read_index, dna_sequence in enumerate(dna_sequences):
+        key = pack(dna_sequence)
+        position = positions.get(key)
+        if position is None:
+            positions[key] = len(unique_sequences)
+            unique_sequences.append(dna_sequence)
+            counts.append(1)
+        else:
+            counts[position] += 1
+
+        if need_logs:
+            monitor.output(read_index + 1, len(dna_sequences))
+
+    return unique_sequences, counts
+
+
+class ReadClustering(object):
+
+    def __init__(self, error_rate=0.1, band=4, kmer_length=6, window_size=10, max_candidates=8, min_size=1,
+                 processes=1, need_logs=False):
+        """
+        introduction: Clustering of the noisy reads and the consensus of each cluster.
+                      The reads are bucketed by their sampled k-mers, and a read joins the first candidate cluster
+                      within the banded edit distance of its representative, otherwise it creates a new cluster.
+                      Each cluster only keeps the votes of its positions (not the reads),
+                      so the memory grows with the clusters instead of the coverage.
+
+        :param error_rate: Maximum edit distance to the representative, relative to its length.
+
+        :param band: Maximum offset between the read and the representative in the alignment.
+
+        :param kmer_length: Length of the k-mers.
+
+        :param window_size: One in "window_size" k-mers (by their hashes) is sampled as the signature.
+
+        :param max_candidates: Maximum number of the candidate clusters compared with each read.
+
+        :param min_size: Minimum total copy number of the outputted cluster.
+
+        :param processes: Number of the processes. If it is greater than 1, the reads are sharded by their smallest
+                          signature and the shards are clustered independently.
+
+        :param need_logs: Show the process of clustering.
+        """
+        self.error_rate = error_rate
+        self.band = band
+        self.kmer_length = kmer_length
+        self.window_size = window_size
+        self.max_candidates = max_candidates
+        self.min_size = min_size
+        self.processes = processes
+        self.need_logs = need_logs
+        self.monitor = Monitor()
+
+        self.__init_check__()
+
+    def __init_check__(self):
+        if self.error_rate < 0 or self.error_rate >= 1:
+            raise ValueError("Wrong value in the \"error_rate\", the value is in the range of [0, 1)!")
+
+        for name in ["band", "kmer_length", "window_size", "max_candidates", "min_size", "processes"]:
+            if type(getattr(self, name)) != int or getattr(self, name) < 1:
+                raise ValueError("Wrong value in the \"" + name + "\", "
+                                 "the value is in the range of [1, +inf) and the type is int!")
+
+    def consensus(self, dna_sequences, counts=None):
+        """
+        introduction: Cluster the reads and obtain the consensus sequence of each cluster.
+
+        :param dna_sequences: Reads from the sequencing, which can be collapsed in advance.
+                              Type: Two-dimensional list(str)
+
+        :param counts: Copy number of each read, default is 1.
+                       Type: list(int)
+
+        :return results: "dna" is the consensus sequences in the descending order of the representative copy number
+                         and "counts" is the total copy number of each cluster.
+                         Type: dict
+        """
+        if counts is None:
+            counts = [1] * len(dna_sequences)
+
+        if self.need_logs:
+            print("Cluster the reads and obtain their consensus sequences.")
+
+        strings = ["".join(dna_sequence) for dna_sequence in dna_sequences]
+        if self.processes > 1:
+            shards = [([], []) for _ in range(self.processes)]
+            for string, count in zip(strings, counts):
+                signatures = _signatures(string, self.kmer_length, self.window_size)
+                shard = shards[min(signatures) % self.processes if signatures else 0]
+                shard[0].append(string)
+                shard[1].append(count)
+            with Pool(self.processes) as pool:
+                outputs = pool.map(_cluster_shard, [(self, shard_strings, shard_counts)
+                                                    for shard_strings, shard_counts in shards])
+        else:
+            outputs = [self.cluster(strings, counts)]
+
+        consensus_sequences, sizes = [], []
+        for clusters in outputs:
+            for representative, columns, insertions, size in clusters:
+                if size >= self.min_size:
+                    consensus_sequences.append(_vote(representative, columns, insertions, size))
+                    sizes.append(size)
+
+        return {"dna": consensus_sequences, "counts": sizes}
+
+    def cluster(self, strings, counts):
+        """
+        introduction: Cluster the reads in the descending order of their copy numbers,
+                      so that the representatives are likely to be the correct reads.
+
+        :param strings: Reads from the sequencing.
+                        Type: list(str)
+
+        :param counts: Copy number of each read.
+                       Type: list(int)
+
+        :return clusters: Representative, votes of its positions ("A", "C", "G", "T" and deletion),
+                          votes of the insertions before its positions and total copy number of each cluster.
+                          Type: list(list)
+        """
+        clusters, buckets = [], {}
+        order = sorted(range(len(strings)), key=lambda read_index: -counts[read_index])
+        for finished_count, read_index in enumerate(order):
+            string, count = strings[read_index], counts[read_index]
+            signatures = _signatures(string, self.kmer_length, self.window_size)
+
+            shared = {}
+            for signature in signatures:
+                for cluster_index in buckets.get(signature, []):
+                    shared[cluster_index] = shared.get(cluster_index, 0) + 1
+
+            cluster_index, mapping = None, None
+            for candidate in sorted(shared, key=lambda index: -shared[index])[:self.max_candidates]:
+                representative = clusters[candidate][0]
+                mapping = align(string, representative, max(1, int(self.error_rate * len(representative))),
+                                self.band)
+                if mapping is not None:
+                    cluster_index = candidate
+                    break
+
+            if cluster_index is None:
+                cluster_index, mapping = len(clusters), list(range(len(string)))
+                clusters.append([string, [[0, 0, 0, 0, 0] for _ in string], [{} for _ in range(len(string) + 1)], 0])
+                for signature in signatures:
+                    buckets.setdefault(signature, []).append(cluster_index)
+
+            representative, columns, insertions, _ = clusters[cluster_index]
+            next_position, inserted = 0, ""
+            for nucleotide, position in zip(string, mapping):
+                if position is None:
+                    inserted += nucleotide
+                    continue
+                for deleted_position in range(next_position, position):
+                    columns[deleted_position][4] += count
+                if inserted:
+                    insertions[position][inserted] = insertions[position].get(inserted, 0) + count
+                    inserted = ""
+                if nucleotide in _nucleotide_codes:
+                    columns[position][_nucleotide_codes[nucleotide]] += count
+                next_position = position + 1
+            for deleted_position in range(next_position, len(representative)):
+                columns[deleted_position][4] += count
+            if inserted:
+                insertions[-1][inserted] = insertions[-1].get(inserted, 0) + count
+            clusters[cluster_index][3] += count
+
+            if self.need_logs:
+                self.monitor.output(finished_count + 1, len(order))
+
+        return clusters
+
+
+def align(read, reference, max_distance, band=None):
+    """
+    introduction: Align the read to the reference by the banded edit distance.
+
+    :param read: Read.
+                 Type: str
+
+    :param reference: Reference, such as the representative of a cluster.
+                      Type: str
+
+    :param max_distance: Maximum edit distance.
+
+    :param band: Maximum offset between the read and the reference, default is the maximum edit distance.
+
+    :return mapping: Reference position of each nucleotide in the read (None for the insertion),
+                     or None if the edit distance exceeds the maximum.
+                     Type: list(int)
+    """
+    read_length, reference_length = len(read), len(reference)
+    # one substitution is the best alignment of the equal-length sequences,
+    # but more substitutions may be fewer edits with the insertions and the deletions.
+    if read_length == reference_length and sum(map(str.__ne__, read, reference)) <= min(1, max_distance):
+        return list(range(read_length))
+    band = min(band, max_distance) if band is not None else max_distance
+    if abs(read_length - reference_length) > band:
+        return None
+
+    # the diagonal transitions (Landau-Vishkin): the furthest read position of each diagonal "k"
+    # (the reference position minus the read position) is found for each edit distance,
+    # only the diagonals within the band are visited.
+    furthest = [{0: (_extend(read, reference, 0, 0), 0, None)}]
+    target = reference_length - read_length
+    distance = 0
+    while furthest[distance].get(target, (-1,))[0] != read_length:
+        if distance == max_distance:
+            return None
+        previous, current = furthest[distance], {}
+        distance += 1
+        for k in range(-min(distance, band), min(distance, band) + 1):
+            start, operation = -1, None
+            if k in previous and previous[k][0] < read_length and previous[k][0] + k < reference_length:
+                start, operation = previous[k][0] + 1, "substitution"
+            if k + 1 in previous and previous[k + 1][0] < read_length and previous[k + 1][0] + 1 > start:
+                start, operation = previous[k + 1][0] + 1, "insertion"
+            if k - 1 in previous and previous[k - 1][0] + k - 1 < reference_length and previous[k - 1][0] > start:
+                start, operation = previous[k - 1][0], "deletion"
+            if operation is not None:
+                current[k] = (_extend(read, reference, start, start + k), start, operation)
+        furthest.append(current)
+
+    mapping, k = [None] * read_length, target
+    for edits in range(distance, -1, -1):
+        end, start, operation = furthest[edits][k]
+        for position in range(start, end):
+            mapping[position] = position + k
+        if operation == "substitution":
+            mapping[start - 1] = start - 1 + k
+        elif operation == "insertion":
+            k += 1
+        elif operation == "deletion":
+            k -= 1
+
+    return mapping
+
+
+def _extend(read, reference, i, j):
+    while i + 8 <= len(read) and j + 8 <= len(reference) and read[i: i + 8] == reference[j: j + 8]:
+        i, j = i + 8, j + 8
+    while i < len(read) and j < len(reference) and read[i] == reference[j]:
+        i, j = i + 1, j + 1
+    return i
+
+
+def _vote(representative, columns, insertions, size):
+    # a position is kept (or an insertion is added) if it is supported by the majority of the cluster.
+    consensus_sequence = []
+    for position in range(len(representative) + 1):
+        if insertions[position]:
+            inserted = max(insertions[position], key=insertions[position].get)
+            if insertions[position][inserted] * 2 > size:
+                consensus_sequence += list(inserted)
+        if position < len(representative):
+            votes = columns[position]
+            if votes[4] * 2 <= size:
+                if max(votes[:4]) == 0:
+                    consensus_sequence.append(representative[position])
+                else:
+                    consensus_sequence.append("ACGT"[votes.index(max(votes[:4]))])
+
+    return consensus_sequence
+
+
+def _signatures(string, kmer_length, window_size):
+    # the k-mers are hashed by CRC32, which is stable across the processes.
+    # about one in "window_size" k-mers is sampled by its hash, so the samples of the similar reads are shared.
+    hashes = [zlib.crc32(string[position: position + kmer_length].encode())
+              for position in range(len(string) - kmer_length + 1)]
+    signatures = set([value for value in hashes if value % window_size == 0])
+    if not signatures and hashes:
+        signatures.add(min(hashes))
+    return signatures
+
+
+def _cluster_shard(task):
+    clustering, strings, counts = task
+    clustering.need_logs = False
+    return clustering.cluster(strings, counts)
@@ -0,0 +1,84 @@
+import numpy
+
+# status of each original bit segment.
+recovered, missing, corrupted = 0, 1, 2
+
+
+def score_recovery(original_bit_segments, decoded_bit_segments, ordered=True):
+    """
+    introduction: Score the recovery of the original bit segments by the decoded ones.
+
+    :param original_bit_segments: Original bit segments.
+                                  Type: Two-dimensional list(int)
+
+    :param decoded_bit_segments: Decoded bit segments.
+                                 If "ordered" is True, the i-th one corresponds to the i-th original one,
+                                 and the segments of 0s (filled by the index reassembly) are regarded as missing.
+                                 Type: Two-dimensional list(int)
+
+    :param ordered: Whether the decoded bit segments are sorted by their indices.
+                    If not, the segments are matched by their packed rows and the bit errors cannot be located.
+
+    :return output: "status" is the status (recovered, missing or corrupted) of each original bit segment;
+                    "bit errors" is the number of wrong bits of each original bit segment (missing is all bits);
+                    "recovered count", "missing count" and "corrupted count" are the counts of the status;
+                    "unmatched count" is the number of the decoded bit segments matching no original one.
+                    Type: dict
+    """
+    original_matrix = numpy.array(original_bit_segments, dtype=numpy.uint8).reshape(len(original_bit_segments), -1)
+    segment_count, segment_length = original_matrix.shape
+    decoded_bit_segments = [bit_segment for bit_segment in decoded_bit_segments if bit_segment is not None] \
+        if not ordered else decoded_bit_segments
+
+    status = numpy.full(shape=segment_count, fill_value=missing, dtype=numpy.uint8)
+    bit_errors = numpy.full(shape=segment_count, fill_value=segment_length, dtype=int)
+    unmatched_count = 0
+
+    if ordered:
+        count = min(segment_count, len(decoded_bit_segments))
+        available = [index for index in range(count) if decoded_bit_segments[index] is not None
+                     and len(decoded_bit_segments[index]) == segment_length]
+        for index in range(count):
+            bit_segment = decoded_bit_segments[index]
+            if bit_segment is not None and 0 < len(bit_segment) != segment_length:
+                # the segment with a wrong length is corrupted.
+                length = min(len(bit_segment), segment_length)
+                status[index] = corrupted
+                bit_errors[index] = int(numpy.count_nonzero(original_matrix[index, :length]
+                                                            != numpy.array(bit_segment[:length])))
+                bit_errors[index] += segment_length - length
+
+        if len(available) > 0:
+            available = numpy.array(available, dtype=int)
+            decoded_matrix = numpy.array([decoded_bit_segments[index] for index in available], dtype=numpy.uint8)
+            differences = numpy.count_nonzero(decoded_matrix != original_matrix[available], axis=1)
+            filled = ~numpy.any(decoded_matrix, axis=1) & (differences > 0)
+            status[available] = numpy.where(differences == 0, recovered, numpy.where(filled, missing, corrupted))
+            bit_errors[available] = numpy.where(filled, segment_length, differences)
+        unmatched_count = max(len(decoded_bit_segments) - segment_count, 0)
+    else:
+        # the packed rows are compared directly (as fixed-width bytes) instead of their string forms.
+        matched_segments = [bit_segment for bit_segment in decoded_bit_segments if len(bit_segment) == segment_length]
+        unmatched_count = len(decoded_bit_segments) - len(matched_segments)
+        decoded_keys = set()
+        if len(matched_segments) > 0:
+            decoded_keys = set(_packed_keys(numpy.array(matched_segments, dtype=numpy.uint8)))
+
+        original_keys = _packed_keys(original_matrix)
+        unmatched_count += len(decoded_keys - set(original_keys))
+        for index, key in enumerate(original_keys):
+            if key in decoded_keys:
+                status[index], bit_errors[index] = recovered, 0
+
+    return {
+        "status": status, "bit errors": bit_errors,
+        "recovered count": int(numpy.count_nonzero(status == recovered)),
+        "missing count": int(numpy.count_nonzero(status == missing)),
+        "corrupted count": int(numpy.count_nonzero(status == corrupted)),
+        "unmatched count": unmatched_count
+    }
+
+
+def _packed_keys(bit_matrix):
+    packed_matrix = numpy.packbits(bit_matrix, axis=1)
+    return [row.tobytes() for row in packed_matrix]
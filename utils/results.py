@@ -0,0 +1,139 @@
+import sqlite3
+from datetime import datetime
+
+import numpy
+
+_tables = {
+    "runs": [("run", "INTEGER PRIMARY KEY AUTOINCREMENT"), ("pipeline", "TEXT"), ("created", "TEXT")],
+    "features": [("run", "INTEGER"), ("task", "TEXT"), ("coding_scheme", "TEXT"), ("file", "TEXT"),
+                 ("kind", "TEXT"), ("bin", "INTEGER"), ("count", "INTEGER")],
+    "robustness": [("run", "INTEGER"), ("task", "TEXT"), ("coding_scheme", "TEXT"), ("error_correction", "TEXT"),
+                   ("file", "TEXT"), ("iteration", "INTEGER"), ("information_density", "REAL"),
+                   ("encoding_runtime", "REAL"), ("decoding_runtime", "REAL"), ("transcoding_state", "INTEGER"),
+                   ("success_count", "INTEGER"), ("total_count", "INTEGER"), ("missing_count", "INTEGER"),
+                   ("corrupted_count", "INTEGER"), ("bit_errors", "INTEGER")],
+    "benchmark": [("run", "INTEGER"), ("coding_scheme", "TEXT"), ("error_correction", "TEXT"),
+                  ("data_size", "INTEGER"), ("entropy", "REAL"), ("transcoding_state", "INTEGER"),
+                  ("encoding_runtime", "REAL"), ("decoding_runtime", "REAL"), ("encoding_bit_throughput", "REAL"),
+                  ("decoding_bit_throughput", "REAL"), ("peak_traced_memory", "INTEGER")],
+    "rules": [("run", "INTEGER"), ("rule_index", "INTEGER"), ("additional_count", "INTEGER"),
+              ("mean_gc_bias", "REAL"), ("homopolymer_limit_count", "INTEGER"), ("gc_bias", "REAL"),
+              ("maximum_homopolymer", "INTEGER"), ("encoding_runtime", "REAL")]
+}
+
+
+class ResultStore(object):
+
+    def __init__(self, path):
+        """
+        introduction: Columnar store (SQLite) of the pipeline results, which can be appended by the pipelines
+                      incrementally and queried by OptimalChoicePipeline directly.
+
+        :param path: Path of the store file, ":memory:" means an in-memory store.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+
+        for table, columns in _tables.items():
+            self.connection.execute("CREATE TABLE IF NOT EXISTS " + table + " ("
+                                    + ", ".join([name + " " + kind for name, kind in columns]) + ")")
+        self.connection.commit()
+
+    def create_run(self, pipeline):
+        cursor = self.connection.execute("INSERT INTO runs (pipeline, created) VALUES (?, ?)",
+                                         (pipeline, datetime.now().isoformat()))
+        self.connection.commit()
+        return cursor.lastrowid
+
+    def append(self, table, rows):
+        """
+        introduction: Append the rows to the table.
+
+        :param table: Name of the table, including "features", "robustness", "benchmark" and "rules".
+
+        :param rows: Rows, the keys of which are the column names.
+                     Type: list(dict)
+        """
+        if table not in _tables or table == "runs":
+            raise ValueError("Unknown table \"" + str(table) + "\" in the result store!")
+
+        names = [name for name, _ in _tables[table]]
+        self.connection.executemany("INSERT INTO " + table + " (" + ", ".join(names) + ") VALUES ("
+                                    + ", ".join(["?"] * len(names)) + ")",
+                                    [tuple([_to_value(row.get(name)) for name in names]) for row in rows])
+        self.connection.commit()
+
+    def append_features(self, run, task_id, coding_scheme, file_name, gc_distribution, homo_distribution):
+        rows = []
+        for kind, distribution in [("gc", gc_distribution), ("homopolymer", homo_distribution)]:
+            for position, count in enumerate(distribution):
+                if count > 0:
+                    rows.append({"run": run, "task": task_id, "coding_scheme": coding_scheme, "file": file_name,
+                                 "kind": kind, "bin": position, "count": count})
+        self.append("features", rows)
+
+    def append_robustness(self, run, results):
+        rows = []
+        for task_id, data in results.items():
+            for iteration, iter_log in enumerate(data["result"]):
+                row = dict(iter_log)
+                row.update({"task": task_id, "coding scheme": data["coding scheme"],
+                            "error-correction": data["error-correction"], "file": data["file"],
+                            "iteration": iteration})
+                rows.append(row)
+        self.append_records("robustness", run, rows)
+
+    def append_records(self, table, run, records):
+        # the keys of the records (such as "coding scheme") are changed to the column names ("coding_scheme").
+        rows = []
+        for record in records:
+            row = {key.replace(" ", "_").replace("-", "_"): value for key, value in record.items()}
+            row["run"] = run
+            rows.append(row)
+        self.append(table, rows)
+
+    def histograms(self, kind, coding_scheme=None):
+        """
+        introduction: Obtain the histograms of the feature tasks.
+
+        :param kind: "gc" or "homopolymer".
+
+        :param coding_scheme: Name of the coding scheme, all the coding schemes if it is None.
+
+        :return histograms: Coding scheme and histogram (numpy.ndarray) of each feature task.
+                            Type: list(tuple)
+        """
+        sql = "SELECT run, task, coding_scheme, bin, count FROM features WHERE kind = ?"
+        parameters = [kind]
+        if coding_scheme is not None:
+            sql += " AND coding_scheme = ?"
+            parameters.append(coding_scheme)
+
+        groups = {}
+        for run, task, name, position, count in self.connection.execute(sql + " ORDER BY run, task", parameters):
+            groups.setdefault((run, task, name), []).append((position, count))
+
+        histograms = []
+        for (_, _, name), bins in groups.items():
+            positions, counts = numpy.array(bins).T
+            histogram = numpy.zeros(shape=max(int(numpy.max(positions)) + 1, 101 if kind == "gc" else 0), dtype=int)
+            histogram[positions] = counts
+            histograms.append((name, histogram))
+
+        return histograms
+
+    def query(self, sql, parameters=()):
+        return self.connection.execute(sql, parameters).fetchall()
+
+    def close(self):
+        self.connection.close()
+
+
+def _to_value(value):
+    if isinstance(value, (numpy.integer, numpy.bool_)):
+        return int(value)
+    if isinstance(value, numpy.floating):
+        return float(value)
+    if isinstance(value, bool):
+        return int(value)
+    return value
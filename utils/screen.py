@@ -1,19 +1,186 @@
-from re import search
+from functools import lru_cache
+from itertools import accumulate
+from re import compile, escape
 
+import numpy
 
-def check(sequence, max_homopolymer, max_content):
-    if max_homopolymer and not homopolymer(sequence, max_homopolymer):
-        return False
-    if max_content and not gc_content(sequence, max_content):
+_code_nucleotides = numpy.array(["A", "C", "G", "T"])
+
+# number of the checked and rejected candidates, which is read by the instrumentation.
+statistics = {"check": 0, "reject": 0}
+
+
+def check(sequence, max_homopolymer, max_content, constraint=None):
+    statistics["check"] += 1
+    if (max_homopolymer and not homopolymer(sequence, max_homopolymer)) \
+            or (max_content and not gc_content(sequence, max_content)) \
+            or (constraint is not None and not constraint.check(sequence)):
+        statistics["reject"] += 1
         return False
 
     return True
 
 
 def homopolymer(sequence, max_homopolymer):
-    homopolymers = "A{%d,}|C{%d,}|G{%d,}|T{%d,}" % tuple([1 + max_homopolymer] * 4)
-    return False if search(homopolymers, sequence) else True
+    return False if _homopolymer_pattern(max_homopolymer).search(sequence) else True
 
 
 def gc_content(sequence, max_content):
     return (1 - max_content) <= (float(sequence.count("C") + sequence.count("G")) / float(len(sequence))) <= max_content
+
+
+def window_gc_content(sequence, window_size, max_content):
+    if len(sequence) < window_size:
+        return True
+
+    # prefix sums of C and G, each window is checked by one subtraction.
+    prefix_sums = list(accumulate((nucleotide in "CG" for nucleotide in sequence), initial=0))
+    counts = [end - start for start, end in zip(prefix_sums, prefix_sums[window_size:])]
+    return (1 - max_content) <= min(counts) / window_size and max(counts) / window_size <= max_content
+
+
+def motif(sequence, motifs):
+    return False if _motif_pattern(tuple(motifs)).search(sequence) else True
+
+
+class Constraint(object):
+
+    def __init__(self, max_homopolymer=None, max_content=None, window_size=20, window_content=None, motifs=None):
+        """
+        introduction: Biochemical constraints of the synthesis, which can be consulted by the coding schemes.
+
+        :param max_homopolymer: Maximum length of homopolymer.
+
+        :param max_content: Maximum content of C and G in the whole DNA sequence.
+
+        :param window_size: Size of the sliding window for the local content of C and G.
+
+        :param window_content: Maximum content of C and G in each sliding window.
+
+        :param motifs: Forbidden motifs, such as the restriction sites and the primer sequences.
+                       Type: list(string)
+        """
+        self.max_homopolymer = max_homopolymer
+        self.max_content = max_content
+        self.window_size = window_size
+        self.window_content = window_content
+        self.motifs = list(motifs) if motifs else []
+
+        self.__init_check__()
+
+    def __init_check__(self):
+        if self.window_content and self.window_size < 1:
+            raise ValueError("The parameter \"window_size\" needs to be greater than 0!")
+        for motif_sequence in self.motifs:
+            if not motif_sequence or set(motif_sequence) - {"A", "C", "G", "T"}:
+                raise ValueError("The forbidden motif \"" + str(motif_sequence) + "\" is not a DNA sequence!")
+
+    def check(self, sequence):
+        if self.max_homopolymer and not homopolymer(sequence, self.max_homopolymer):
+            return False
+        if self.motifs and not motif(sequence, self.motifs):
+            return False
+        if self.max_content and not gc_content(sequence, self.max_content):
+            return False
+        if self.window_content and not window_gc_content(sequence, self.window_size, self.window_content):
+            return False
+
+        return True
+
+    def batch_check(self, nucleotide_codes):
+        nucleotide_codes = numpy.asarray(nucleotide_codes)
+        mask = batch_check(nucleotide_codes, self.max_homopolymer, self.max_content)
+        if self.window_content:
+            mask &= batch_window_gc_content(nucleotide_codes, self.window_size, self.window_content)
+        if self.motifs:
+            pattern = _motif_pattern(tuple(self.motifs))
+            for index in numpy.flatnonzero(mask):
+                if pattern.search("".join(_code_nucleotides[nucleotide_codes[index]])):
+                    mask[index] = False
+
+        return mask
+
+
+def batch_check(nucleotide_codes, max_homopolymer, max_content):
+    """
+    introduction: Screen a batch of DNA sequences at once.
+
+    :param nucleotide_codes: DNA sequences in the form of nucleotide codes (A: 0, C: 1, G: 2 and T: 3).
+                             Type: two-dimensional numpy.ndarray, the shape is (sequence number, sequence length).
+
+    :param max_homopolymer: Maximum length of homopolymer, 0 or None means no constraint.
+
+    :param max_content: Maximum content of C and G, 0 or None means no constraint.
+
+    :return mask: Whether each DNA sequence passes the screening.
+                  Type: one-dimensional numpy.ndarray(bool)
+    """
+    nucleotide_codes = numpy.asarray(nucleotide_codes)
+    mask = numpy.ones(shape=len(nucleotide_codes), dtype=bool)
+    if max_homopolymer:
+        mask &= batch_homopolymer(nucleotide_codes, max_homopolymer)
+    if max_content:
+        mask &= batch_gc_content(nucleotide_codes, max_content)
+
+    return mask
+
+
+def batch_homopolymer(nucleotide_codes, max_homopolymer):
+    return homopolymer_lengths(nucleotide_codes) <= max_homopolymer
+
+
+def batch_gc_content(nucleotide_codes, max_content):
+    contents = gc_contents(nucleotide_codes)
+    return ((1 - max_content) <= contents) & (contents <= max_content)
+
+
+def batch_window_gc_content(nucleotide_codes, window_size, max_content):
+    nucleotide_codes = numpy.asarray(nucleotide_codes)
+    if nucleotide_codes.shape[1] < window_size:
+        return numpy.ones(shape=len(nucleotide_codes), dtype=bool)
+
+    prefix_sums = numpy.zeros(shape=(len(nucleotide_codes), nucleotide_codes.shape[1] + 1), dtype=int)
+    numpy.cumsum((nucleotide_codes == 1) | (nucleotide_codes == 2), axis=1, out=prefix_sums[:, 1:])
+    counts = prefix_sums[:, window_size:] - prefix_sums[:, :-window_size]
+    return ((1 - max_content) <= numpy.min(counts, axis=1) / window_size) \
+        & (numpy.max(counts, axis=1) / window_size <= max_content)
+
+
+def homopolymer_lengths(nucleotide_codes):
+    """
+    introduction: Obtain the length of the longest homopolymer in each DNA sequence.
+
+    :param nucleotide_codes: DNA sequences in the form of nucleotide codes.
+                             Type: two-dimensional numpy.ndarray
+
+    :return lengths: Length of the longest homopolymer in each DNA sequence.
+                     Type: one-dimensional numpy.ndarray(int)
+    """
+    nucleotide_codes = numpy.asarray(nucleotide_codes)
+    sequence_number, sequence_length = nucleotide_codes.shape
+    if sequence_length == 0:
+        return numpy.zeros(shape=sequence_number, dtype=int)
+
+    # each sequence starts a new homopolymer at its first position.
+    changes = numpy.ones(shape=nucleotide_codes.shape, dtype=bool)
+    changes[:, 1:] = nucleotide_codes[:, 1:] != nucleotide_codes[:, :-1]
+    starts = numpy.flatnonzero(changes)
+    run_lengths = numpy.diff(numpy.append(starts, changes.size))
+
+    return numpy.maximum.reduceat(run_lengths, numpy.flatnonzero(starts % sequence_length == 0))
+
+
+def gc_contents(nucleotide_codes):
+    nucleotide_codes = numpy.asarray(nucleotide_codes)
+    return numpy.count_nonzero((nucleotide_codes == 1) | (nucleotide_codes == 2), axis=1) / nucleotide_codes.shape[1]
+
+
+@lru_cache(maxsize=None)
+def _homopolymer_pattern(max_homopolymer):
+    return compile("A{%d,}|C{%d,}|G{%d,}|T{%d,}" % tuple([1 + max_homopolymer] * 4))
+
+
+@lru_cache(maxsize=None)
+def _motif_pattern(motifs):
+    # the combined pattern finds any of the motifs in a single pass.
+    return compile("|".join(escape(motif_sequence) for motif_sequence in sorted(set(motifs), key=len, reverse=True)))